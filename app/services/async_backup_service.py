@@ -0,0 +1,924 @@
+import os
+import json
+import time
+import asyncio
+import hashlib
+import shutil
+import sqlite3
+import zipfile
+import threading
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from functools import partial
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from app.services.logging_service import get_logger
+from app.services.metrics_service import metrics
+from app.services.pitr_service import DateLike, PitrService
+
+BACKUP_PHASE_SECONDS = metrics.histogram("backup_phase_seconds", "Durée des phases de sauvegarde")
+BACKUP_BYTES = metrics.counter("backup_bytes_written_total", "Octets écrits par les sauvegardes")
+BACKUP_LAST_BYTES = metrics.gauge("backup_last_size_bytes", "Taille de la dernière sauvegarde")
+BACKUP_RUNS = metrics.counter("backup_runs_total", "Sauvegardes par résultat")
+
+HASH_CHUNK_SIZE = 1024 * 1024
+PARTIAL_SUFFIX = ".partial"
+ARCHIVE_SUFFIX = ".zip"
+MANIFEST_VERSION = "1.1.0"
+
+# Nombre maximal d'opérations disque simultanées, toutes sauvegardes confondues
+IO_CONCURRENCY = 4
+# Les fichiers sont copiés ou vérifiés par lots pour borner le nombre de tâches
+BATCH_FILES = 64
+BATCH_BYTES = 8 * 1024 * 1024
+
+_io_executor: Optional[ThreadPoolExecutor] = None
+_io_executor_lock = threading.Lock()
+
+
+def get_io_executor() -> ThreadPoolExecutor:
+    """Retourne le pool d'E/S partagé; sa taille est la limite globale de concurrence"""
+    global _io_executor
+    with _io_executor_lock:
+        if _io_executor is None:
+            _io_executor = ThreadPoolExecutor(max_workers=IO_CONCURRENCY, thread_name_prefix="backup-io")
+        return _io_executor
+
+
+class BackupCancelled(Exception):
+    """Levée lorsqu'une sauvegarde ou une restauration est annulée"""
+
+
+class _IntegrityError(Exception):
+    """Fichier manquant ou corrompu détecté lors d'une vérification"""
+
+
+class CancellationToken:
+    """Jeton d'annulation coopérative, vérifié entre chaque bloc copié.
+
+    Un jeton peut dépendre d'un jeton parent: il est alors annulé avec lui.
+    """
+
+    def __init__(self, parent: Optional["CancellationToken"] = None):
+        self._event = threading.Event()
+        self._parent = parent
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set() or (self._parent is not None and self._parent.cancelled)
+
+    def check(self):
+        if self.cancelled:
+            raise BackupCancelled()
+
+
+class BackupProgress:
+    """Événement de progression d'une sauvegarde ou d'une restauration.
+
+    `bytes_total` est le volume à traiter par l'ensemble des phases (une base
+    SQLite est lue deux fois: copie puis empreinte du fichier copié).
+    """
+
+    def __init__(self, operation: str, phase: str, bytes_done: int, bytes_total: int,
+                 eta: Optional[float]):
+        self.operation = operation
+        self.phase = phase
+        self.bytes_done = bytes_done
+        self.bytes_total = bytes_total
+        self.eta = eta
+
+    @property
+    def fraction(self) -> float:
+        return min(1.0, self.bytes_done / self.bytes_total) if self.bytes_total else 1.0
+
+    def __repr__(self):
+        return (f"BackupProgress({self.operation}, {self.phase}, "
+                f"{self.bytes_done}/{self.bytes_total}, eta={self.eta})")
+
+
+class _ProgressTracker:
+    """Cumule les octets traités, vérifie l'annulation et publie la progression.
+
+    Appelé depuis les threads du pool d'E/S: le rappel de progression est
+    exécuté sous verrou, dans le thread qui a traité le bloc.
+    """
+
+    def __init__(self, operation: str, total: int, callback: Optional[Callable[[BackupProgress], None]],
+                 token: Optional[CancellationToken]):
+        self.operation = operation
+        self.total = total
+        self.callback = callback
+        self.token = token
+        self.done = 0
+        self.phase = None
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def start_phase(self, phase: str):
+        self.phase = phase
+        self.advance(0)
+
+    def advance(self, count: int):
+        if self.token is not None:
+            self.token.check()
+        with self._lock:
+            self.done += count
+            if self.callback is not None:
+                elapsed = time.perf_counter() - self.started
+                eta = None
+                if self.done and self.total:
+                    eta = max(0.0, elapsed / self.done * (self.total - self.done))
+                self.callback(BackupProgress(self.operation, self.phase, self.done, self.total, eta))
+
+
+def _stream_digest(f, tracker: Optional[_ProgressTracker] = None) -> Tuple[str, int]:
+    """Empreinte SHA-256 et taille d'un flux lu par blocs"""
+    digest = hashlib.sha256()
+    size = 0
+    for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+        size += len(chunk)
+        if tracker is not None:
+            tracker.advance(len(chunk))
+    return digest.hexdigest(), size
+
+
+class _BackupReader:
+    """Accès aléatoire aux fichiers d'une sauvegarde.
+
+    `index()` décrit chaque fichier (taille, date de modification, empreinte)
+    à partir du manifeste seul; `open()` ne lit que le fichier demandé.
+    `bytes_read` compte les octets lus pour calculer des empreintes.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.bytes_read = 0
+        self._index = None
+
+    def read_manifest(self) -> Optional[dict]:
+        raise NotImplementedError
+
+    def open(self, name: str):
+        raise NotImplementedError
+
+    def stat(self, name: str) -> Optional[dict]:
+        """Métadonnées d'un fichier absent de l'index (manifestes antérieurs à 1.1.0)"""
+        raise NotImplementedError
+
+    def close(self):
+        pass
+
+    def index(self) -> Dict[str, dict]:
+        if self._index is None:
+            manifest = self.read_manifest()
+            if manifest is None:
+                raise FileNotFoundError(f"Manifeste de sauvegarde manquant: {self.path}")
+            entries = manifest.get("index", {})
+            checksums = manifest.get("checksums", {})
+            self._index = {}
+            for name in manifest.get("files", []):
+                meta = dict(entries.get(name) or self.stat(name) or {})
+                meta["sha256"] = checksums.get(name)
+                self._index[name] = meta
+        return self._index
+
+    def digest(self, name: str) -> str:
+        with self.open(name) as f:
+            digest, size = _stream_digest(f)
+        self.bytes_read += size
+        return digest
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class _DirectoryBackup(_BackupReader):
+    """Sauvegarde sous forme de répertoire: chaque fichier est directement accessible"""
+
+    def read_manifest(self) -> Optional[dict]:
+        manifest_path = self.path / "manifest.json"
+        if not manifest_path.exists():
+            return None
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    def open(self, name: str):
+        return open(self.path / name, "rb")
+
+    def stat(self, name: str) -> Optional[dict]:
+        path = self.path / name
+        if not path.is_file():
+            return None
+        st = path.stat()
+        return {"size": st.st_size, "mtime": st.st_mtime}
+
+
+class _ArchiveBackup(_BackupReader):
+    """Sauvegarde compressée (zip): chaque membre est compressé séparément et
+    le répertoire central de l'archive donne sa position, sans décompresser
+    les autres membres."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self._zip = zipfile.ZipFile(path)
+
+    def read_manifest(self) -> Optional[dict]:
+        try:
+            return json.loads(self._zip.read("manifest.json"))
+        except KeyError:
+            return None
+
+    def open(self, name: str):
+        try:
+            return self._zip.open(name)
+        except KeyError:
+            raise FileNotFoundError(f"Fichier absent de l'archive: {name}")
+
+    def stat(self, name: str) -> Optional[dict]:
+        try:
+            info = self._zip.getinfo(name)
+        except KeyError:
+            return None
+        return {"size": info.file_size, "mtime": datetime(*info.date_time).timestamp()}
+
+    def close(self):
+        self._zip.close()
+
+
+class _LiveData(_BackupReader):
+    """Données en place, présentées sous les mêmes noms que dans une sauvegarde"""
+
+    def __init__(self, db_path: Path, config_dir: Path):
+        super().__init__(db_path.parent)
+        self.db_path = db_path
+        self.config_dir = config_dir
+
+    def resolve(self, name: str) -> Path:
+        if name == "database.db":
+            return self.db_path
+        return self.config_dir / name.split("/", 1)[1]
+
+    def index(self) -> Dict[str, dict]:
+        if self._index is None:
+            names = ["database.db"] if self.db_path.is_file() else []
+            _, files = AsyncBackupService._scan_tree(self.config_dir)
+            names += [f"config/{name}" for _, name, _ in files]
+            self._index = {name: self.stat(name) for name in names}
+        return self._index
+
+    def open(self, name: str):
+        return open(self.resolve(name), "rb")
+
+    def stat(self, name: str) -> Optional[dict]:
+        st = self.resolve(name).stat()
+        return {"size": st.st_size, "mtime": st.st_mtime, "sha256": None}
+
+
+def _open_backup(path: Path) -> _BackupReader:
+    if path.is_file() and path.name.endswith(ARCHIVE_SUFFIX):
+        return _ArchiveBackup(path)
+    if path.is_dir():
+        return _DirectoryBackup(path)
+    raise FileNotFoundError(f"Sauvegarde non trouvée: {path}")
+
+
+def _same_content(name: str, meta_a: dict, meta_b: dict, a: _BackupReader, b: _BackupReader) -> bool:
+    """Compare deux versions d'un fichier sur leurs métadonnées, puis sur leur contenu si elles divergent.
+
+    Tailles différentes ou empreintes connues des deux côtés: aucune lecture.
+    Même taille et même date de modification: fichier considéré inchangé.
+    Sinon seule la version sans empreinte connue est relue.
+    """
+    if meta_a.get("size") != meta_b.get("size"):
+        return False
+    if meta_a.get("sha256") and meta_b.get("sha256"):
+        return meta_a["sha256"] == meta_b["sha256"]
+    if meta_a.get("mtime") is not None and meta_a.get("mtime") == meta_b.get("mtime"):
+        return True
+    return (meta_a.get("sha256") or a.digest(name)) == (meta_b.get("sha256") or b.digest(name))
+
+
+class AsyncBackupService:
+    """Service de sauvegarde asynchrone.
+
+    Les copies et calculs d'empreintes sont répartis par lots sur un pool de
+    threads borné et partagé entre toutes les instances: plusieurs cibles
+    peuvent être sauvegardées en parallèle sans dépasser IO_CONCURRENCY
+    opérations disque simultanées.
+    """
+
+    def __init__(self, data_dir="data", backup_dir=None, executor: Optional[ThreadPoolExecutor] = None):
+        self.data_dir = Path(data_dir)
+        self.db_path = self.data_dir / "database.db"
+        self.config_dir = self.data_dir / "config"
+        self.backup_dir = Path(backup_dir) if backup_dir is not None else self.data_dir / "backups"
+        self.backup_dir.mkdir(parents=True, exist_ok=True)
+        self.executor = executor or get_io_executor()
+        self.logger = get_logger("BackupService", "backup.log")
+
+    # ------------------------------------------------------------------
+    # Exécution sur le pool d'E/S
+    # ------------------------------------------------------------------
+
+    async def _run(self, func, *args):
+        """Exécute une fonction bloquante sur le pool d'E/S"""
+        future = self.executor.submit(func, *args)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            # Ne rend la main qu'une fois l'opération disque terminée
+            concurrent.futures.wait([future])
+            raise
+
+    async def _run_jobs(self, jobs: List[Callable], token: CancellationToken) -> list:
+        """Exécute des lots en parallèle; au premier échec, arrête les autres avant de rendre la main"""
+        futures = [self.executor.submit(job) for job in jobs]
+        try:
+            return await asyncio.gather(*(asyncio.wrap_future(f) for f in futures))
+        except BaseException:
+            # Les lots en cours vérifient le jeton entre deux blocs: l'attente est courte
+            # et garantit qu'aucun thread n'écrit plus dans le répertoire à nettoyer.
+            token.cancel()
+            for future in futures:
+                future.cancel()
+            concurrent.futures.wait(futures)
+            raise
+
+    @staticmethod
+    def _batches(files: List[Tuple[Path, str, int]]) -> Iterable[List[Tuple[Path, str, int]]]:
+        batch, size = [], 0
+        for entry in files:
+            batch.append(entry)
+            size += entry[2]
+            if len(batch) >= BATCH_FILES or size >= BATCH_BYTES:
+                yield batch
+                batch, size = [], 0
+        if batch:
+            yield batch
+
+    # ------------------------------------------------------------------
+    # Création
+    # ------------------------------------------------------------------
+
+    async def create(self, progress: Optional[Callable[[BackupProgress], None]] = None,
+                     cancel_token: Optional[CancellationToken] = None) -> Optional[str]:
+        """Crée une sauvegarde complète. Retourne son chemin, ou None en cas d'échec ou d'annulation.
+
+        La sauvegarde est construite dans un répertoire `.partial` renommé à la
+        fin: une sauvegarde annulée (jeton ou annulation de la tâche) ou en
+        échec ne laisse aucun répertoire.
+        """
+        token = CancellationToken(cancel_token)
+        staging = None
+        try:
+            started = time.perf_counter()
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            backup_path, staging = self._new_backup_path(timestamp)
+
+            dirs, files = await self._run(self._scan_tree, self.config_dir)
+            db_size = self.db_path.stat().st_size if self.db_path.exists() else 0
+            tracker = _ProgressTracker("create", 2 * db_size + sum(f[2] for f in files),
+                                       progress, token)
+
+            # Sauvegarde de la base SQLite
+            with metrics.span(BACKUP_PHASE_SECONDS, phase="sqlite"):
+                tracker.start_phase("sqlite")
+                if db_size:
+                    # La base est en mode WAL: l'API de sauvegarde SQLite inclut les pages
+                    # encore présentes dans le journal, contrairement à une copie de fichier.
+                    await self._run_jobs(
+                        [partial(self._copy_sqlite, self.db_path, staging / "database.db", tracker)], token)
+
+            # Sauvegarde des configurations
+            with metrics.span(BACKUP_PHASE_SECONDS, phase="configs"):
+                tracker.start_phase("configs")
+                checksums: Dict[str, str] = {}
+                if self.config_dir.exists():
+                    checksums.update(await self._copy_files(dirs, files, staging / "config", tracker, token, "config"))
+
+            # Création du manifeste
+            with metrics.span(BACKUP_PHASE_SECONDS, phase="manifest"):
+                tracker.start_phase("manifest")
+                size = (await self._run_jobs(
+                    [partial(self._create_manifest, staging, timestamp, checksums, tracker)], token))[0]
+
+            await self._run(staging.rename, backup_path)
+
+            duration = time.perf_counter() - started
+            BACKUP_PHASE_SECONDS.observe(duration, phase="total")
+            BACKUP_BYTES.inc(size)
+            BACKUP_LAST_BYTES.set(size)
+            BACKUP_RUNS.inc(status="success")
+            self.logger.info(
+                f"Sauvegarde créée avec succès: {backup_path}",
+                extra={"backup_path": str(backup_path), "bytes": size,
+                       "duration_ms": round(duration * 1000, 1)}
+            )
+            return str(backup_path)
+
+        except BackupCancelled:
+            BACKUP_RUNS.inc(status="cancelled")
+            self.logger.warning("Sauvegarde annulée")
+            return None
+        except asyncio.CancelledError:
+            BACKUP_RUNS.inc(status="cancelled")
+            self.logger.warning("Sauvegarde annulée")
+            raise
+        except Exception as e:
+            BACKUP_RUNS.inc(status="error")
+            self.logger.error(f"Erreur lors de la sauvegarde: {str(e)}")
+            return None
+        finally:
+            if staging is not None and staging.exists():
+                shutil.rmtree(staging, ignore_errors=True)
+
+    def _new_backup_path(self, timestamp: str):
+        """Réserve le nom d'une nouvelle sauvegarde (suffixé si le nom existe déjà).
+
+        Retourne le chemin final et le répertoire de travail `.partial` créé.
+        """
+        name = f"backup_{timestamp}"
+        suffix = 0
+        while True:
+            backup_path = self.backup_dir / (name if suffix == 0 else f"{name}_{suffix}")
+            staging = backup_path.with_name(backup_path.name + PARTIAL_SUFFIX)
+            suffix += 1
+            if backup_path.exists():
+                continue
+            try:
+                staging.mkdir()
+                return backup_path, staging
+            except FileExistsError:
+                continue
+
+    @staticmethod
+    def _scan_tree(root: Path):
+        """Retourne les sous-répertoires et les fichiers (chemin, chemin relatif, taille) d'une arborescence"""
+        dirs, files = [], []
+        if not root.exists():
+            return dirs, files
+        for current, subdirs, names in os.walk(root):
+            subdirs.sort()
+            relative = Path(current).relative_to(root)
+            dirs.append(relative.as_posix())
+            for name in sorted(names):
+                path = Path(current) / name
+                files.append((path, (relative / name).as_posix(), path.stat().st_size))
+        return dirs, files
+
+    async def _copy_files(self, dirs, files, destination: Path, tracker: _ProgressTracker,
+                          token: CancellationToken, prefix: Optional[str] = None) -> Dict[str, str]:
+        """Copie des fichiers par lots parallèles. Retourne leurs empreintes"""
+        await self._run(self._make_dirs, destination, dirs)
+        results = await self._run_jobs(
+            [partial(self._copy_batch, batch, destination, tracker) for batch in self._batches(files)], token)
+        checksums = {}
+        for digests in results:
+            for name, digest in digests.items():
+                checksums[f"{prefix}/{name}" if prefix else name] = digest
+        return checksums
+
+    @staticmethod
+    def _make_dirs(destination: Path, dirs: List[str]):
+        for relative in dirs:
+            (destination / relative).mkdir(parents=True, exist_ok=True)
+
+    def _copy_batch(self, batch, destination: Path, tracker: _ProgressTracker) -> Dict[str, str]:
+        return {name: self._copy_file(path, destination / name, tracker) for path, name, _ in batch}
+
+    @staticmethod
+    def _copy_sqlite(source: Path, destination: Path, tracker: Optional[_ProgressTracker] = None):
+        """Copie une base SQLite de façon cohérente via l'API de sauvegarde.
+
+        La copie avance par blocs de pages; une annulation entre deux blocs
+        interrompt la copie et annule la transaction d'écriture de la destination.
+        """
+        src = sqlite3.connect(str(source))
+        dst = sqlite3.connect(str(destination))
+        try:
+            if tracker is None:
+                src.backup(dst)
+                return
+            page_size = src.execute("PRAGMA page_size").fetchone()[0]
+            copied = [0]
+
+            def on_step(status, remaining, total):
+                done = (total - remaining) * page_size
+                tracker.advance(max(0, done - copied[0]))
+                copied[0] = done
+
+            src.backup(dst, pages=max(1, HASH_CHUNK_SIZE // page_size), progress=on_step)
+        finally:
+            dst.close()
+            src.close()
+
+    @staticmethod
+    def _copy_file(source: Path, destination: Path, tracker: Optional[_ProgressTracker]) -> str:
+        """Copie un fichier par blocs et retourne son empreinte SHA-256"""
+        digest = hashlib.sha256()
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                digest.update(chunk)
+                dst.write(chunk)
+                if tracker is not None:
+                    tracker.advance(len(chunk))
+        shutil.copystat(source, destination)
+        return digest.hexdigest()
+
+    def _create_manifest(self, backup_path: Path, timestamp: str,
+                         checksums: Optional[Dict[str, str]] = None,
+                         tracker: Optional[_ProgressTracker] = None) -> int:
+        """Crée un fichier manifeste pour la sauvegarde. Retourne la taille totale en octets"""
+        checksums = checksums if checksums is not None else {}
+        files = [p for p in backup_path.rglob("*") if p.is_file()]
+        names = [p.relative_to(backup_path).as_posix() for p in files]
+        for name, path in zip(names, files):
+            if name not in checksums:
+                checksums[name] = self._file_digest(path, tracker)
+        stats = [p.stat() for p in files]
+        manifest = {
+            "timestamp": timestamp,
+            "version": MANIFEST_VERSION,
+            "files": names,
+            "checksums": {name: checksums[name] for name in names},
+            # Index des fichiers: listes et comparaisons sans lire leur contenu
+            "index": {name: {"size": st.st_size, "mtime": st.st_mtime} for name, st in zip(names, stats)},
+            "size": sum(st.st_size for st in stats)
+        }
+
+        with open(backup_path / "manifest.json", "w") as f:
+            json.dump(manifest, f, indent=4)
+        return manifest["size"] + (backup_path / "manifest.json").stat().st_size
+
+    @staticmethod
+    def _file_digest(path: Path, tracker: Optional[_ProgressTracker] = None) -> str:
+        """Calcule l'empreinte SHA-256 d'un fichier par blocs"""
+        with open(path, "rb") as f:
+            return _stream_digest(f, tracker)[0]
+
+    # ------------------------------------------------------------------
+    # Vérification, restauration, liste et rotation
+    # ------------------------------------------------------------------
+
+    async def verify(self, backup_path: str) -> bool:
+        """Vérifie qu'une sauvegarde est complète et que ses fichiers sont intacts"""
+        token = CancellationToken()
+        try:
+            backup_dir = Path(backup_path)
+            manifest = await self._run(self._read_manifest, backup_dir)
+            if manifest is None:
+                self.logger.error(f"Manifeste de sauvegarde manquant: {backup_path}")
+                return False
+
+            # Les manifestes antérieurs n'ont pas d'empreintes: présence seulement
+            checksums = list((manifest.get("checksums") or dict.fromkeys(manifest.get("files", []))).items())
+            batches = [checksums[i:i + BATCH_FILES] for i in range(0, len(checksums), BATCH_FILES)]
+            # Chaque lot ouvre sa propre vue de la sauvegarde (archive zip lue en parallèle)
+            await self._run_jobs([partial(self._verify_batch, backup_dir, batch, token) for batch in batches], token)
+            return True
+
+        except _IntegrityError as e:
+            self.logger.error(str(e))
+            return False
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la vérification: {str(e)}")
+            return False
+
+    @staticmethod
+    def _verify_batch(backup_path: Path, batch, token: CancellationToken):
+        with _open_backup(backup_path) as reader:
+            for name, expected in batch:
+                token.check()
+                if reader.stat(name) is None:
+                    raise _IntegrityError(f"Fichier manquant dans la sauvegarde: {name}")
+                if expected is not None and reader.digest(name) != expected:
+                    raise _IntegrityError(f"Fichier corrompu dans la sauvegarde: {name}")
+
+    async def restore(self, backup_path: str, progress: Optional[Callable[[BackupProgress], None]] = None,
+                      cancel_token: Optional[CancellationToken] = None, until: Optional[DateLike] = None) -> bool:
+        """Restaure une sauvegarde.
+
+        Les configurations sont copiées à côté des actuelles et la base est
+        restaurée dans une seule transaction: une annulation laisse les
+        données en place inchangées. Avec `until`, les modifications capturées
+        après la sauvegarde (voir PitrService) sont rejouées sur une copie
+        jusqu'à cet instant avant de remplacer la base. Une archive compressée
+        est d'abord décompressée à côté d'elle.
+        """
+        token = CancellationToken(cancel_token)
+        config_staging = self.config_dir.with_name(self.config_dir.name + PARTIAL_SUFFIX)
+        db_staging = self.db_path.with_name(self.db_path.name + PARTIAL_SUFFIX)
+        archive_staging = None
+        pitr = PitrService(self.db_path, self.data_dir / "pitr")
+        try:
+            backup_dir = Path(backup_path)
+            if not backup_dir.exists():
+                self.logger.error(f"Sauvegarde non trouvée: {backup_path}")
+                return False
+            if backup_dir.is_file():
+                archive_staging = backup_dir.with_name(backup_dir.name + PARTIAL_SUFFIX)
+                await self._run(self._extract_archive, backup_dir, archive_staging, token)
+                backup_dir = archive_staging
+
+            # Vérification du manifeste
+            if not (backup_dir / "manifest.json").exists():
+                self.logger.error("Manifeste de sauvegarde manquant")
+                return False
+
+            db_backup = backup_dir / "database.db"
+            config_backup = backup_dir / "config"
+            dirs, files = await self._run(self._scan_tree, config_backup)
+            db_size = db_backup.stat().st_size if db_backup.exists() else 0
+            tracker = _ProgressTracker("restore", db_size + sum(f[2] for f in files), progress, token)
+
+            # Copie des configurations à côté des configurations actuelles
+            if config_backup.exists():
+                tracker.start_phase("configs")
+                await self._run(partial(shutil.rmtree, config_staging, ignore_errors=True))
+                await self._copy_files(dirs, files, config_staging, tracker, token)
+
+            # Restauration de la base SQLite
+            if db_backup.exists():
+                self.db_path.parent.mkdir(parents=True, exist_ok=True)
+                source = db_backup
+                if until is not None:
+                    tracker.start_phase("replay")
+                    await self._run(partial(self._ship_pending, pitr))
+                    await self._run_jobs([partial(self._copy_sqlite, db_backup, db_staging)], token)
+                    await self._run_jobs([partial(pitr.replay, db_staging, until, token)], token)
+                    source = db_staging
+                tracker.start_phase("sqlite")
+                await self._run_jobs([partial(self._copy_sqlite, source, self.db_path, tracker)], token)
+                if until is None:
+                    # Les captures suivantes ne doivent pas prolonger l'historique abandonné
+                    await self._run(partial(pitr.fork_timeline, self.db_path))
+
+            # Bascule des configurations (plus d'annulation possible)
+            if config_backup.exists():
+                await self._run(self._swap_dirs, config_staging, self.config_dir)
+
+            self.logger.info(f"Sauvegarde restaurée avec succès depuis: {backup_path}")
+            return True
+
+        except BackupCancelled:
+            self.logger.warning(f"Restauration annulée: {backup_path}")
+            return False
+        except asyncio.CancelledError:
+            self.logger.warning(f"Restauration annulée: {backup_path}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la restauration: {str(e)}")
+            return False
+        finally:
+            shutil.rmtree(config_staging, ignore_errors=True)
+            if archive_staging is not None:
+                shutil.rmtree(archive_staging, ignore_errors=True)
+            for path in (db_staging, Path(f"{db_staging}-wal"), Path(f"{db_staging}-shm")):
+                if path.exists():
+                    path.unlink()
+
+    def _ship_pending(self, pitr: PitrService):
+        """Expédie les modifications encore dans la base avant de la remplacer"""
+        try:
+            pitr.ship()
+        except sqlite3.Error as e:
+            # Base endommagée: seules les modifications déjà expédiées seront rejouées
+            self.logger.warning(f"Modifications non expédiées avant restauration: {str(e)}")
+
+    @staticmethod
+    def _swap_dirs(staging: Path, target: Path):
+        shutil.rmtree(target, ignore_errors=True)
+        staging.rename(target)
+
+    @staticmethod
+    def _read_manifest(backup_path: Path) -> Optional[dict]:
+        try:
+            with _open_backup(backup_path) as reader:
+                manifest = reader.read_manifest()
+        except (FileNotFoundError, zipfile.BadZipFile):
+            return None
+        if manifest is not None:
+            manifest["path"] = str(backup_path)
+        return manifest
+
+    def _list_backups(self) -> List[Path]:
+        """Sauvegardes terminées, répertoires ou archives (hors sauvegardes en cours)"""
+        return [p for p in self.backup_dir.iterdir()
+                if (p.is_dir() or p.name.endswith(ARCHIVE_SUFFIX)) and not p.name.endswith(PARTIAL_SUFFIX)]
+
+    async def list(self) -> List[dict]:
+        """Retourne la liste des sauvegardes disponibles, la plus récente en premier"""
+        try:
+            # Lecture JSON liée au GIL: un seul lot suffit
+            return await self._run(self._load_backup_list)
+
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la récupération de la liste des sauvegardes: {str(e)}")
+            return []
+
+    def _load_backup_list(self) -> List[dict]:
+        manifests = (self._read_manifest(d) for d in self._list_backups())
+        return sorted((m for m in manifests if m is not None), key=lambda x: x["timestamp"], reverse=True)
+
+    async def rotate(self, max_backups: int = 5, keep: Iterable[str] = ()):
+        """Conserve uniquement les N sauvegardes les plus récentes, ainsi que celles nommées dans `keep`"""
+        try:
+            await self._run(self._rotate, max_backups, frozenset(keep))
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la rotation des sauvegardes: {str(e)}")
+
+    def _rotate(self, max_backups: int, keep: frozenset = frozenset()):
+        backups = sorted(self._list_backups(), key=lambda x: x.stat().st_mtime, reverse=True)
+
+        # Supprime les sauvegardes excédentaires (les plus anciennes)
+        for backup in backups[max_backups:]:
+            if backup.name in keep:
+                # Encore lue par la réplication: supprimée à une rotation ultérieure
+                self.logger.info(f"Sauvegarde conservée jusqu'à sa réplication: {backup}")
+                continue
+            if backup.is_dir():
+                shutil.rmtree(backup)
+            else:
+                backup.unlink()
+            self.logger.info(f"Sauvegarde supprimée: {backup}")
+
+    # ------------------------------------------------------------------
+    # Archives compressées et accès fichier par fichier
+    # ------------------------------------------------------------------
+
+    async def archive(self, backup_path: str, keep_directory: bool = False,
+                      cancel_token: Optional[CancellationToken] = None) -> Optional[str]:
+        """Compresse une sauvegarde en archive zip. Retourne le chemin de l'archive, ou None.
+
+        Chaque fichier est un membre compressé séparément: list_files, diff et
+        restore_file lisent l'archive sans la décompresser entièrement.
+        """
+        token = CancellationToken(cancel_token)
+        source = Path(backup_path)
+        archive_path = source.with_name(source.name + ARCHIVE_SUFFIX)
+        staging = archive_path.with_name(archive_path.name + PARTIAL_SUFFIX)
+        try:
+            if not (source / "manifest.json").exists():
+                self.logger.error(f"Manifeste de sauvegarde manquant: {backup_path}")
+                return None
+            await self._run(self._write_archive, source, staging, token)
+            await self._run(staging.replace, archive_path)
+            if not keep_directory:
+                await self._run(shutil.rmtree, source)
+            self.logger.info(
+                f"Sauvegarde compressée: {archive_path}",
+                extra={"backup_path": str(archive_path), "bytes": archive_path.stat().st_size}
+            )
+            return str(archive_path)
+
+        except BackupCancelled:
+            self.logger.warning(f"Compression annulée: {backup_path}")
+            return None
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la compression de la sauvegarde: {str(e)}")
+            return None
+        finally:
+            if staging.exists():
+                staging.unlink()
+
+    @staticmethod
+    def _write_archive(source: Path, destination: Path, token: CancellationToken):
+        with _DirectoryBackup(source) as reader:
+            names = ["manifest.json"] + list(reader.index())
+        with zipfile.ZipFile(destination, "w", zipfile.ZIP_DEFLATED) as zf:
+            for name in names:
+                info = zipfile.ZipInfo.from_file(source / name, name)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                with open(source / name, "rb") as src, \
+                        zf.open(info, "w", force_zip64=info.file_size > zipfile.ZIP64_LIMIT) as dst:
+                    for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                        token.check()
+                        dst.write(chunk)
+
+    @staticmethod
+    def _extract_archive(archive_path: Path, destination: Path, token: CancellationToken):
+        shutil.rmtree(destination, ignore_errors=True)
+        with zipfile.ZipFile(archive_path) as zf:
+            for info in zf.infolist():
+                token.check()
+                zf.extract(info, destination)
+
+    async def list_files(self, backup_path: str) -> Optional[Dict[str, dict]]:
+        """Retourne l'index d'une sauvegarde: {nom: {size, mtime, sha256}}, sans lire les fichiers"""
+        try:
+            return await self._run(self._read_index, Path(backup_path))
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la lecture de l'index de {backup_path}: {str(e)}")
+            return None
+
+    @staticmethod
+    def _read_index(backup_path: Path) -> Dict[str, dict]:
+        with _open_backup(backup_path) as reader:
+            return reader.index()
+
+    async def diff(self, backup_path: str, other_path: Optional[str] = None) -> Optional[dict]:
+        """Compare une sauvegarde à une autre, ou aux données en place si `other_path` est omis.
+
+        Retourne {"added", "removed", "modified"} (noms de fichiers, `added`
+        étant présent seulement dans la seconde version), le nombre de fichiers
+        inchangés et les octets lus. Les index sont comparés d'abord; le
+        contenu n'est lu que pour les fichiers dont les métadonnées divergent
+        sans empreinte pour trancher (voir _same_content).
+        """
+        try:
+            return await self._run(self._diff, Path(backup_path), other_path)
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la comparaison de {backup_path}: {str(e)}")
+            return None
+
+    def _diff(self, backup_path: Path, other_path: Optional[str]) -> dict:
+        with _open_backup(backup_path) as a:
+            b = _open_backup(Path(other_path)) if other_path else _LiveData(self.db_path, self.config_dir)
+            with b:
+                index_a, index_b = a.index(), b.index()
+                modified, unchanged = [], 0
+                for name in sorted(index_a.keys() & index_b.keys()):
+                    if _same_content(name, index_a[name], index_b[name], a, b):
+                        unchanged += 1
+                    else:
+                        modified.append(name)
+                return {
+                    "added": sorted(index_b.keys() - index_a.keys()),
+                    "removed": sorted(index_a.keys() - index_b.keys()),
+                    "modified": modified,
+                    "unchanged": unchanged,
+                    "bytes_read": a.bytes_read + b.bytes_read
+                }
+
+    async def restore_file(self, backup_path: str, name: str, destination: Optional[str] = None,
+                           cancel_token: Optional[CancellationToken] = None) -> bool:
+        """Restaure un seul fichier de configuration d'une sauvegarde.
+
+        `name` est le nom du fichier dans la sauvegarde (ex. "config/roles.json").
+        Seul ce fichier est lu: le coût dépend de sa taille, pas de celle de la
+        sauvegarde. Le contenu est vérifié contre l'empreinte du manifeste
+        avant de remplacer le fichier en place (ou `destination`). La base
+        se restaure avec restore(), qui gère la capture continue.
+        """
+        token = CancellationToken(cancel_token)
+        try:
+            if destination is None and not name.startswith("config/"):
+                self.logger.error(f"Restauration fichier par fichier limitée aux configurations: {name}")
+                return False
+            target = Path(destination) if destination else _LiveData(self.db_path, self.config_dir).resolve(name)
+            await self._run(self._restore_file, Path(backup_path), name, target, token)
+            self.logger.info(f"Fichier {name} restauré depuis: {backup_path}",
+                             extra={"backup_path": str(backup_path), "file": name})
+            return True
+
+        except BackupCancelled:
+            self.logger.warning(f"Restauration de {name} annulée")
+            return False
+        except _IntegrityError as e:
+            self.logger.error(str(e))
+            return False
+        except Exception as e:
+            self.logger.error(f"Erreur lors de la restauration de {name}: {str(e)}")
+            return False
+
+    @staticmethod
+    def _restore_file(backup_path: Path, name: str, target: Path, token: CancellationToken):
+        staging = target.with_name(target.name + PARTIAL_SUFFIX)
+        with _open_backup(backup_path) as reader:
+            meta = reader.index().get(name)
+            if meta is None:
+                raise _IntegrityError(f"Fichier absent de la sauvegarde: {name}")
+            target.parent.mkdir(parents=True, exist_ok=True)
+            try:
+                digest = hashlib.sha256()
+                with reader.open(name) as src, open(staging, "wb") as dst:
+                    for chunk in iter(lambda: src.read(HASH_CHUNK_SIZE), b""):
+                        token.check()
+                        digest.update(chunk)
+                        dst.write(chunk)
+                if meta.get("sha256") and digest.hexdigest() != meta["sha256"]:
+                    raise _IntegrityError(f"Fichier corrompu dans la sauvegarde: {name}")
+                if meta.get("mtime") is not None:
+                    os.utime(staging, (meta["mtime"], meta["mtime"]))
+                staging.replace(target)
+            finally:
+                if staging.exists():
+                    staging.unlink()
+
+async def create_backups(services: List[AsyncBackupService],
+                         progress: Optional[Callable[[BackupProgress], None]] = None,
+                         cancel_token: Optional[CancellationToken] = None) -> List[Optional[str]]:
+    """Sauvegarde plusieurs cibles en parallèle.
+
+    Les cibles partagent le pool d'E/S: la concurrence disque totale reste
+    bornée par IO_CONCURRENCY quel que soit le nombre de cibles.
+    """
+    return await asyncio.gather(*(service.create(progress, cancel_token) for service in services))
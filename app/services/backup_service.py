@@ -1,145 +1,69 @@
-import os
-import json
-import shutil
-import sqlite3
-from datetime import datetime
-import logging
-from pathlib import Path
-from typing import Optional
+import asyncio
+from typing import Callable, Dict, Iterable, List, Optional
+from app.services.logging_service import get_logger
+from app.services.pitr_service import DateLike
+from app.services.async_backup_service import (
+    AsyncBackupService, BackupCancelled, BackupProgress, CancellationToken,
+    PARTIAL_SUFFIX
+)
+
+__all__ = ["BackupService", "BackupCancelled", "BackupProgress", "CancellationToken", "PARTIAL_SUFFIX"]
 
 class BackupService:
-    """Service de gestion des sauvegardes"""
+    """Service de gestion des sauvegardes.
+    
+    API synchrone au-dessus d'AsyncBackupService: chaque appel exécute la
+    coroutine correspondante dans sa propre boucle. Depuis du code asyncio,
+    utiliser directement `async_service`.
+    """
     
-    def __init__(self):
-        self.backup_dir = Path("data/backups")
-        self.backup_dir.mkdir(parents=True, exist_ok=True)
+    def __init__(self, data_dir="data", backup_dir=None):
+        self.async_service = AsyncBackupService(data_dir, backup_dir)
+        self.data_dir = self.async_service.data_dir
+        self.db_path = self.async_service.db_path
+        self.config_dir = self.async_service.config_dir
+        self.backup_dir = self.async_service.backup_dir
         self.setup_logging()
         
     def setup_logging(self):
         """Configure le système de logs"""
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
+        self.logger = get_logger("BackupService", "backup.log")
+        
+    def create_backup(self, progress: Optional[Callable[[BackupProgress], None]] = None,
+                      cancel_token: Optional[CancellationToken] = None) -> Optional[str]:
+        """Crée une sauvegarde complète (voir AsyncBackupService.create)"""
+        return asyncio.run(self.async_service.create(progress, cancel_token))
+        
+    def verify_backup(self, backup_path: str) -> bool:
+        """Vérifie qu'une sauvegarde est complète et que ses fichiers sont intacts"""
+        return asyncio.run(self.async_service.verify(backup_path))
         
-        logging.basicConfig(
-            filename=log_dir / "backup.log",
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger("BackupService")
+    def restore_backup(self, backup_path: str, progress: Optional[Callable[[BackupProgress], None]] = None,
+                       cancel_token: Optional[CancellationToken] = None, until: Optional[DateLike] = None) -> bool:
+        """Restaure une sauvegarde, éventuellement jusqu'à un instant donné (voir AsyncBackupService.restore)"""
+        return asyncio.run(self.async_service.restore(backup_path, progress, cancel_token, until))
         
-    def create_backup(self) -> Optional[str]:
-        """Crée une sauvegarde complète"""
-        try:
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            backup_path = self.backup_dir / f"backup_{timestamp}"
-            backup_path.mkdir(exist_ok=True)
-            
-            # Sauvegarde de la base SQLite
-            self._backup_sqlite(backup_path)
-            
-            # Sauvegarde des configurations
-            self._backup_configs(backup_path)
-            
-            # Création du manifeste
-            self._create_manifest(backup_path, timestamp)
-            
-            self.logger.info(f"Sauvegarde créée avec succès: {backup_path}")
-            return str(backup_path)
-            
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la sauvegarde: {str(e)}")
-            return None
-            
-    def _backup_sqlite(self, backup_path: Path):
-        """Sauvegarde la base de données SQLite"""
-        db_path = Path("data/database.db")
-        if db_path.exists():
-            shutil.copy2(db_path, backup_path / "database.db")
-            
-    def _backup_configs(self, backup_path: Path):
-        """Sauvegarde les fichiers de configuration"""
-        config_dir = Path("data/config")
-        if config_dir.exists():
-            shutil.copytree(config_dir, backup_path / "config")
-            
-    def _create_manifest(self, backup_path: Path, timestamp: str):
-        """Crée un fichier manifeste pour la sauvegarde"""
-        manifest = {
-            "timestamp": timestamp,
-            "version": "1.0.0",
-            "files": [str(p.relative_to(backup_path)) for p in backup_path.rglob("*") if p.is_file()]
-        }
+    def rotate_backups(self, max_backups: int = 5, keep: Iterable[str] = ()):
+        """Conserve uniquement les N sauvegardes les plus récentes (voir AsyncBackupService.rotate)"""
+        asyncio.run(self.async_service.rotate(max_backups, keep))
         
-        with open(backup_path / "manifest.json", "w") as f:
-            json.dump(manifest, f, indent=4)
-            
-    def restore_backup(self, backup_path: str) -> bool:
-        """Restaure une sauvegarde"""
-        try:
-            backup_dir = Path(backup_path)
-            if not backup_dir.exists():
-                self.logger.error(f"Sauvegarde non trouvée: {backup_path}")
-                return False
-                
-            # Vérification du manifeste
-            manifest_path = backup_dir / "manifest.json"
-            if not manifest_path.exists():
-                self.logger.error("Manifeste de sauvegarde manquant")
-                return False
-                
-            # Restauration de la base SQLite
-            db_backup = backup_dir / "database.db"
-            if db_backup.exists():
-                shutil.copy2(db_backup, "data/database.db")
-                
-            # Restauration des configurations
-            config_backup = backup_dir / "config"
-            if config_backup.exists():
-                shutil.rmtree("data/config", ignore_errors=True)
-                shutil.copytree(config_backup, "data/config")
-                
-            self.logger.info(f"Sauvegarde restaurée avec succès depuis: {backup_path}")
-            return True
-            
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la restauration: {str(e)}")
-            return False
-            
-    def rotate_backups(self, max_backups: int = 5):
-        """Conserve uniquement les N sauvegardes les plus récentes"""
-        try:
-            backups = sorted(
-                self.backup_dir.iterdir(),
-                key=lambda x: x.stat().st_mtime,
-                reverse=True
-            )
-            
-            # Supprime les sauvegardes excédentaires (les plus anciennes)
-            for backup in backups[max_backups:]:
-                if backup.is_dir():
-                    shutil.rmtree(backup)
-                    self.logger.info(f"Sauvegarde supprimée: {backup}")
-                    
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la rotation des sauvegardes: {str(e)}")
-            
-    def get_backup_list(self):
+    def get_backup_list(self) -> List[dict]:
         """Retourne la liste des sauvegardes disponibles"""
-        try:
-            backups = []
-            for backup_dir in self.backup_dir.iterdir():
-                if not backup_dir.is_dir():
-                    continue
-                    
-                manifest_path = backup_dir / "manifest.json"
-                if manifest_path.exists():
-                    with open(manifest_path) as f:
-                        manifest = json.load(f)
-                        manifest["path"] = str(backup_dir)
-                        backups.append(manifest)
-                        
-            return sorted(backups, key=lambda x: x["timestamp"], reverse=True)
-            
-        except Exception as e:
-            self.logger.error(f"Erreur lors de la récupération de la liste des sauvegardes: {str(e)}")
-            return []
+        return asyncio.run(self.async_service.list())
+        
+    def archive_backup(self, backup_path: str, keep_directory: bool = False) -> Optional[str]:
+        """Compresse une sauvegarde en archive zip (voir AsyncBackupService.archive)"""
+        return asyncio.run(self.async_service.archive(backup_path, keep_directory))
+        
+    def list_backup_files(self, backup_path: str) -> Optional[Dict[str, dict]]:
+        """Retourne l'index des fichiers d'une sauvegarde, répertoire ou archive"""
+        return asyncio.run(self.async_service.list_files(backup_path))
+        
+    def diff_backups(self, backup_path: str, other_path: Optional[str] = None) -> Optional[dict]:
+        """Compare deux sauvegardes, ou une sauvegarde aux données en place (voir AsyncBackupService.diff)"""
+        return asyncio.run(self.async_service.diff(backup_path, other_path))
+        
+    def restore_file(self, backup_path: str, name: str, destination: Optional[str] = None,
+                     cancel_token: Optional[CancellationToken] = None) -> bool:
+        """Restaure un seul fichier de configuration d'une sauvegarde (voir AsyncBackupService.restore_file)"""
+        return asyncio.run(self.async_service.restore_file(backup_path, name, destination, cancel_token))
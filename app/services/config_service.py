@@ -28,6 +28,14 @@ class ConfigService:
         """Retourne la liste des modules actifs"""
         return self.config.get('modules', {}).get('active_modules', [])
         
+    def get_roles(self):
+        """Retourne la définition des rôles"""
+        return self.config.get('interface', {}).get('roles', {})
+        
+    def get_role_aliases(self):
+        """Retourne les anciens noms de rôles et le rôle de configuration associé"""
+        return self.config.get('interface', {}).get('role_aliases', {})
+        
     def get_role_permissions(self, role):
         """Retourne les permissions pour un rôle donné"""
         roles = self.config.get('interface', {}).get('roles', {})
@@ -36,3 +44,19 @@ class ConfigService:
     def get_ui_config(self):
         """Retourne la configuration de l'interface utilisateur"""
         return self.config.get('interface', {}).get('ui', {})
+        
+    def get_workflows(self):
+        """Retourne les workflows et leurs étapes ordonnées"""
+        return self.config.get('interface', {}).get('workflows', {})
+        
+    def get_workflow_step_map(self):
+        """Retourne les correspondances {workflow: {ancienne étape: nouvelle ou None}} des étapes supprimées"""
+        return self.config.get('interface', {}).get('workflow_step_map', {})
+
+    def get_validation_rules(self):
+        """Retourne les règles de validation des rapports activées"""
+        return self.config.get('validation', {}).get('rules', [])
+
+    def get_replication_targets(self):
+        """Retourne les destinations secondaires des sauvegardes ({name, path, max_replicas})"""
+        return self.config.get('backup', {}).get('replication_targets', [])
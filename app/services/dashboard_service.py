@@ -0,0 +1,186 @@
+import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from app.services.logging_service import get_logger
+
+
+class DashboardWidget:
+    """Déclaration d'un widget du dashboard: source de données et fréquence de rafraîchissement"""
+
+    def __init__(self, name: str, fetch: Callable[[], Any], refresh_interval: float = 30.0,
+                 ttl: Optional[float] = None):
+        self.name = name
+        self.fetch = fetch
+        self.refresh_interval = refresh_interval
+        self.ttl = ttl if ttl is not None else 3 * refresh_interval
+
+        # État maintenu par le DashboardService
+        self.data = None
+        self.version = 0
+        self.rendered_version = 0
+        # Le rendu initial ("...") tient lieu d'état périmé jusqu'à la première récupération
+        self.rendered_stale = True
+        self.digest = None
+        self.fetched_at: Optional[float] = None
+        self.requested_at: Optional[float] = None
+        self.in_flight = False
+        self.error: Optional[str] = None
+        self.fetch_time: Optional[float] = None
+        self.render_time: Optional[float] = None
+
+
+class DashboardService:
+    """Rafraîchissement incrémental des widgets du dashboard.
+
+    Les sources sont interrogées en parallèle dans un pool de threads, jamais
+    sur le thread de l'interface. Chaque résultat est comparé au précédent par
+    empreinte: la version du widget n'augmente, et le widget n'est redessiné,
+    que si les données ont réellement changé.
+    """
+
+    def __init__(self, max_workers: int = 4, clock: Callable[[], float] = time.monotonic):
+        self.widgets: Dict[str, DashboardWidget] = {}
+        self.clock = clock
+        self.logger = get_logger("DashboardService", "dashboard.log")
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="dashboard")
+
+    def register(self, widget: DashboardWidget):
+        """Ajoute un widget au dashboard"""
+        with self._lock:
+            self.widgets[widget.name] = widget
+
+    def poll(self) -> List:
+        """Lance la récupération des widgets dont l'intervalle est écoulé (non bloquant)"""
+        now = self.clock()
+        futures = []
+        with self._lock:
+            due = [
+                w for w in self.widgets.values()
+                if not w.in_flight and (w.requested_at is None or now - w.requested_at >= w.refresh_interval)
+            ]
+            for widget in due:
+                widget.in_flight = True
+                widget.requested_at = now
+        for widget in due:
+            futures.append(self._executor.submit(self._fetch, widget))
+        return futures
+
+    def _fetch(self, widget: DashboardWidget):
+        started = time.perf_counter()
+        try:
+            data = widget.fetch()
+            digest = hashlib.sha1(json.dumps(data, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+            error = None
+        except Exception as e:
+            self.logger.warning(f"Échec de la source du widget {widget.name}: {str(e)}")
+            data, digest, error = None, None, str(e)
+        elapsed = time.perf_counter() - started
+
+        with self._lock:
+            widget.in_flight = False
+            widget.fetch_time = elapsed
+            widget.error = error
+            if error is not None:
+                return
+            widget.fetched_at = self.clock()
+            if digest != widget.digest:
+                widget.data = data
+                widget.digest = digest
+                widget.version += 1
+
+    def invalidate(self, name: str):
+        """Force la récupération d'un widget au prochain poll (ex. à l'arrivée d'une alerte)"""
+        with self._lock:
+            self.widgets[name].requested_at = None
+
+    def changed(self) -> List[DashboardWidget]:
+        """Retourne les widgets dont les données, ou leur validité, ont changé depuis leur dernier rendu"""
+        now = self.clock()
+        with self._lock:
+            return [w for w in self.widgets.values()
+                    if w.version != w.rendered_version or self._expired(w, now) != w.rendered_stale]
+
+    def mark_rendered(self, widget: DashboardWidget, version: int, render_time: float,
+                      stale: Optional[bool] = None):
+        """Enregistre le rendu d'une version d'un widget (périmée ou non, par défaut l'état courant)"""
+        with self._lock:
+            widget.rendered_version = version
+            widget.rendered_stale = self._expired(widget, self.clock()) if stale is None else stale
+            widget.render_time = render_time
+
+    def _expired(self, widget: DashboardWidget, now: float) -> bool:
+        return widget.fetched_at is None or now - widget.fetched_at > widget.ttl
+
+    def get_data(self, name: str) -> Any:
+        """Retourne les données en cache d'un widget, ou None si elles ont expiré"""
+        data, stale = self.get_state(name)
+        return None if stale else data
+
+    def get_state(self, name: str) -> Tuple[Any, bool]:
+        """Retourne (données, périmées) d'un widget, lus ensemble.
+
+        Les données sont None si elles ont expiré; une source peut aussi
+        légitimement retourner None (ex. météo pas encore publiée) sans que le
+        widget soit périmé.
+        """
+        with self._lock:
+            widget = self.widgets[name]
+            if self._expired(widget, self.clock()):
+                return None, True
+            return widget.data, False
+
+    def is_stale(self, name: str) -> bool:
+        """Indique si les données d'un widget ont dépassé leur durée de validité"""
+        with self._lock:
+            return self._expired(self.widgets[name], self.clock())
+
+    def get_timings(self) -> Dict[str, Dict[str, Any]]:
+        """Retourne les durées de récupération et de rendu par widget"""
+        now = self.clock()
+        with self._lock:
+            return {
+                name: {
+                    "fetch_ms": w.fetch_time * 1000 if w.fetch_time is not None else None,
+                    "render_ms": w.render_time * 1000 if w.render_time is not None else None,
+                    "version": w.version,
+                    "age": now - w.fetched_at if w.fetched_at is not None else None,
+                    "error": w.error,
+                }
+                for name, w in self.widgets.items()
+            }
+
+    def shutdown(self):
+        """Arrête le pool de récupération"""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# ----------------------------------------------------------------------
+# Sources des widgets par défaut (interface.ui.layouts.dashboard)
+# ----------------------------------------------------------------------
+
+def active_flights_source(workflow_service):
+    """Opérations de vol actuellement à l'étape « flight »"""
+    def fetch():
+        return {
+            "count": len(workflow_service.in_step("flight_operation", "flight")),
+            "by_step": workflow_service.count_by_step("flight_operation"),
+        }
+    return fetch
+
+
+def maintenance_alerts_source(due_dates, horizon_days: int = 7):
+    """Interventions de maintenance ouvertes échues ou dues dans les prochains jours (DueDateService)"""
+    def fetch():
+        return due_dates.summary(horizon_days, sources=("maintenance",))
+    return fetch
+
+
+def weather_source(sync_service, path: str = "weather/current"):
+    """Météo publiée dans Firebase, servie par le cache hors-ligne"""
+    def fetch():
+        return sync_service.get(path)
+    return fetch
@@ -0,0 +1,538 @@
+import sqlite3
+import threading
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+from app.services.logging_service import get_logger
+
+DateLike = Union[datetime, str]
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS aircraft (
+    id INTEGER PRIMARY KEY,
+    registration TEXT NOT NULL UNIQUE,
+    model TEXT,
+    status TEXT NOT NULL DEFAULT 'serviceable',
+    total_hours REAL NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS personnel (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL,
+    role TEXT NOT NULL,
+    email TEXT,
+    currency_expires_at TEXT
+);
+
+CREATE TABLE IF NOT EXISTS flights (
+    id INTEGER PRIMARY KEY,
+    aircraft_id INTEGER NOT NULL REFERENCES aircraft(id),
+    pilot_id INTEGER NOT NULL REFERENCES personnel(id),
+    started_at TEXT NOT NULL,
+    ended_at TEXT,
+    duration_min REAL,
+    location TEXT,
+    status TEXT NOT NULL DEFAULT 'completed',
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_flights_aircraft_start ON flights(aircraft_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_flights_pilot_start ON flights(pilot_id, started_at);
+CREATE INDEX IF NOT EXISTS idx_flights_start ON flights(started_at);
+
+CREATE TABLE IF NOT EXISTS maintenance_records (
+    id INTEGER PRIMARY KEY,
+    aircraft_id INTEGER NOT NULL REFERENCES aircraft(id),
+    technician_id INTEGER REFERENCES personnel(id),
+    kind TEXT NOT NULL,
+    performed_at TEXT,
+    due_at TEXT,
+    status TEXT NOT NULL DEFAULT 'open',
+    notes TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_maintenance_aircraft_performed ON maintenance_records(aircraft_id, performed_at);
+CREATE INDEX IF NOT EXISTS idx_maintenance_status_due ON maintenance_records(status, due_at);
+CREATE INDEX IF NOT EXISTS idx_maintenance_aircraft_status_due ON maintenance_records(aircraft_id, status, due_at);
+
+CREATE TABLE IF NOT EXISTS certifications (
+    id INTEGER PRIMARY KEY,
+    personnel_id INTEGER NOT NULL REFERENCES personnel(id),
+    name TEXT NOT NULL,
+    issued_at TEXT,
+    expires_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_certifications_personnel ON certifications(personnel_id);
+
+-- Index des échéances: une ligne par maintenance ouverte, certification ou
+-- validité du personnel ayant une date. Maintenu par les déclencheurs
+-- ci-dessous, trié par date: "échu d'ici N jours" est un parcours d'intervalle.
+CREATE TABLE IF NOT EXISTS due_items (
+    source TEXT NOT NULL,
+    source_id INTEGER NOT NULL,
+    due_at TEXT NOT NULL,
+    subject_type TEXT NOT NULL,
+    subject_id INTEGER NOT NULL,
+    label TEXT,
+    PRIMARY KEY (source, source_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_due_items_due ON due_items(due_at);
+CREATE INDEX IF NOT EXISTS idx_due_items_source_due ON due_items(source, due_at);
+
+CREATE TABLE IF NOT EXISTS reports (
+    id INTEGER PRIMARY KEY,
+    title TEXT NOT NULL,
+    role TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    author_id INTEGER REFERENCES personnel(id),
+    flight_id INTEGER REFERENCES flights(id),
+    workflow TEXT,
+    created_at TEXT NOT NULL,
+    validated_at TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_reports_created ON reports(created_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_status_created ON reports(status, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_role_created ON reports(role, created_at, id);
+CREATE INDEX IF NOT EXISTS idx_reports_role_status_created ON reports(role, status, created_at, id);
+
+CREATE TABLE IF NOT EXISTS report_steps (
+    report_id INTEGER NOT NULL REFERENCES reports(id),
+    step TEXT NOT NULL,
+    completed_at TEXT,
+    PRIMARY KEY (report_id, step)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS workflow_transitions (
+    workflow TEXT NOT NULL,
+    from_step TEXT NOT NULL,
+    to_step TEXT,
+    PRIMARY KEY (workflow, from_step)
+) WITHOUT ROWID;
+
+-- AUTOINCREMENT: l'identifiant d'une instance supprimée n'est jamais
+-- réattribué (il reste référencé par workflow_history).
+CREATE TABLE IF NOT EXISTS workflow_instances (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    workflow TEXT NOT NULL,
+    current_step TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'active',
+    entity_type TEXT,
+    entity_id INTEGER,
+    started_at TEXT NOT NULL,
+    updated_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_workflow_active_step
+    ON workflow_instances(workflow, current_step) WHERE status = 'active';
+CREATE INDEX IF NOT EXISTS idx_workflow_entity ON workflow_instances(entity_type, entity_id);
+
+CREATE TABLE IF NOT EXISTS workflow_history (
+    instance_id INTEGER NOT NULL REFERENCES workflow_instances(id),
+    from_step TEXT NOT NULL,
+    to_step TEXT,
+    changed_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_workflow_history_instance ON workflow_history(instance_id);
+"""
+
+# Déclencheurs de l'index des échéances. L'insertion remplace d'abord toute
+# ligne existante: un INSERT OR REPLACE (rejeu PitrService) ne déclenche pas
+# la suppression de l'ancienne ligne.
+DUE_SOURCES = {
+    "maintenance": ("maintenance_records", "'aircraft', NEW.aircraft_id, NEW.kind",
+                    "NEW.due_at", "NEW.status = 'open' AND NEW.due_at IS NOT NULL"),
+    "certification": ("certifications", "'personnel', NEW.personnel_id, NEW.name",
+                      "NEW.expires_at", "NEW.expires_at IS NOT NULL"),
+    "currency": ("personnel", "'personnel', NEW.id, NEW.name",
+                 "NEW.currency_expires_at", "NEW.currency_expires_at IS NOT NULL"),
+}
+
+
+def _due_triggers() -> str:
+    statements = []
+    for source, (table, subject, due_at, condition) in DUE_SOURCES.items():
+        refresh = (
+            f"DELETE FROM due_items WHERE source = '{source}' AND source_id = NEW.id; "
+            f"INSERT INTO due_items (source, source_id, due_at, subject_type, subject_id, label) "
+            f"SELECT '{source}', NEW.id, {due_at}, {subject} WHERE {condition};"
+        )
+        statements += [
+            f"CREATE TRIGGER IF NOT EXISTS trg_due_{source}_ins AFTER INSERT ON {table} BEGIN {refresh} END;",
+            f"CREATE TRIGGER IF NOT EXISTS trg_due_{source}_upd AFTER UPDATE ON {table} BEGIN {refresh} END;",
+            f"CREATE TRIGGER IF NOT EXISTS trg_due_{source}_del AFTER DELETE ON {table} BEGIN "
+            f"DELETE FROM due_items WHERE source = '{source}' AND source_id = OLD.id; END;",
+        ]
+    return "\n".join(statements)
+
+
+def _due_backfill() -> List[str]:
+    """Remplit l'index des échéances à partir des tables existantes (migration)"""
+    def columns(sql: str) -> str:
+        return sql.replace("NEW.", "")
+
+    return [
+        f"INSERT OR REPLACE INTO due_items (source, source_id, due_at, subject_type, subject_id, label) "
+        f"SELECT '{source}', id, {columns(due_at)}, {columns(subject)} FROM {table} WHERE {columns(condition)}"
+        for source, (table, subject, due_at, condition) in DUE_SOURCES.items()
+    ]
+
+
+# Les requêtes sont des constantes: le module sqlite3 garde les instructions
+# préparées en cache par texte SQL, chaque appel réutilise donc le même plan.
+INSERT_AIRCRAFT = (
+    "INSERT INTO aircraft (registration, model, status, total_hours) "
+    "VALUES (:registration, :model, :status, :total_hours)"
+)
+INSERT_PERSONNEL = (
+    "INSERT INTO personnel (name, role, email, currency_expires_at) "
+    "VALUES (:name, :role, :email, :currency_expires_at)"
+)
+INSERT_FLIGHT = (
+    "INSERT INTO flights (aircraft_id, pilot_id, started_at, ended_at, duration_min, location, status, notes) "
+    "VALUES (:aircraft_id, :pilot_id, :started_at, :ended_at, :duration_min, :location, :status, :notes)"
+)
+INSERT_MAINTENANCE = (
+    "INSERT INTO maintenance_records (aircraft_id, technician_id, kind, performed_at, due_at, status, notes) "
+    "VALUES (:aircraft_id, :technician_id, :kind, :performed_at, :due_at, :status, :notes)"
+)
+SELECT_FLIGHTS_BY_AIRCRAFT = (
+    "SELECT * FROM flights WHERE aircraft_id = ? AND started_at >= ? AND started_at < ? "
+    "ORDER BY started_at DESC LIMIT ?"
+)
+SELECT_FLIGHTS_BY_PILOT = (
+    "SELECT * FROM flights WHERE pilot_id = ? AND started_at >= ? AND started_at < ? "
+    "ORDER BY started_at DESC LIMIT ?"
+)
+SELECT_FLIGHTS_BETWEEN = (
+    "SELECT * FROM flights WHERE started_at >= ? AND started_at < ? "
+    "ORDER BY started_at DESC LIMIT ?"
+)
+SELECT_MAINTENANCE_BY_AIRCRAFT = (
+    "SELECT * FROM maintenance_records WHERE aircraft_id = ? ORDER BY performed_at DESC LIMIT ?"
+)
+SELECT_OPEN_MAINTENANCE_DUE = (
+    "SELECT * FROM maintenance_records WHERE status = 'open' AND due_at < ? ORDER BY due_at"
+)
+INSERT_CERTIFICATION = (
+    "INSERT INTO certifications (personnel_id, name, issued_at, expires_at) "
+    "VALUES (:personnel_id, :name, :issued_at, :expires_at)"
+)
+SELECT_DUE_ITEMS = "SELECT * FROM due_items WHERE due_at > ? AND due_at <= ? ORDER BY due_at LIMIT ?"
+SELECT_NEXT_DUE = "SELECT * FROM due_items WHERE due_at > ? ORDER BY due_at LIMIT 1"
+COUNT_DUE_BY_SOURCE = (
+    "SELECT source, COUNT(*) AS count, COALESCE(SUM(due_at < ?), 0) AS overdue "
+    "FROM due_items WHERE due_at <= ? GROUP BY source"
+)
+
+INSERT_REPORT = (
+    "INSERT INTO reports (title, role, status, author_id, flight_id, workflow, created_at) "
+    "VALUES (:title, :role, :status, :author_id, :flight_id, :workflow, :created_at)"
+)
+INSERT_REPORT_STEP = (
+    "INSERT OR REPLACE INTO report_steps (report_id, step, completed_at) "
+    "VALUES (:report_id, :step, :completed_at)"
+)
+
+FLIGHT_DEFAULTS = {"ended_at": None, "duration_min": None, "location": None, "status": "completed", "notes": None}
+MAINTENANCE_DEFAULTS = {"technician_id": None, "performed_at": None, "due_at": None, "status": "open", "notes": None}
+REPORT_DEFAULTS = {"status": "pending", "author_id": None, "flight_id": None, "workflow": None}
+REPORT_STEP_DEFAULTS = {"completed_at": None}
+CERTIFICATION_DEFAULTS = {"issued_at": None, "expires_at": None}
+
+MIN_DATE = "0000-01-01T00:00:00"
+MAX_DATE = "9999-12-31T23:59:59"
+
+
+class DatabaseService:
+    """Accès à la base opérationnelle locale (vols, aéronefs, personnel, maintenance)"""
+
+    def __init__(self, db_path="data/database.db", batch_size: int = 10000):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self.logger = get_logger("DatabaseService", "database.log")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._due_listeners: List[Callable[[], None]] = []
+        self._init_schema()
+
+    def connect(self) -> sqlite3.Connection:
+        """Retourne la connexion du thread courant (une connexion par thread)"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Utilisée par un seul thread, mais fermée par close() depuis un autre
+            conn = sqlite3.connect(str(self.db_path), cached_statements=256, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute("PRAGMA foreign_keys=ON")
+            conn.execute("PRAGMA temp_store=MEMORY")
+            conn.execute("PRAGMA cache_size=-16000")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def close(self):
+        """Ferme toutes les connexions ouvertes"""
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _init_schema(self):
+        """Crée les tables et index s'ils n'existent pas"""
+        conn = self.connect()
+        migrate = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'due_items'").fetchone() is None
+        self._migrate_workflow_ids(conn)
+        conn.executescript(SCHEMA)
+        conn.executescript(_due_triggers())
+        if migrate:
+            with conn:
+                for sql in _due_backfill():
+                    conn.execute(sql)
+        conn.commit()
+
+    @staticmethod
+    def _migrate_workflow_ids(conn: sqlite3.Connection):
+        """Reconstruit workflow_instances en AUTOINCREMENT pour une base antérieure.
+
+        Sans AUTOINCREMENT, SQLite réattribue l'identifiant le plus élevé après
+        sa suppression: une nouvelle instance hériterait de l'historique de
+        l'ancienne. Les index sont recréés ensuite par SCHEMA.
+        """
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'workflow_instances'"
+        ).fetchone()
+        if row is None or "AUTOINCREMENT" in row[0].upper():
+            return
+        create = (row[0].replace("workflow_instances", "_workflow_instances_new", 1)
+                  .replace("id INTEGER PRIMARY KEY", "id INTEGER PRIMARY KEY AUTOINCREMENT", 1))
+        # Clés étrangères désactivées hors transaction: workflow_history référence la table remplacée
+        conn.execute("PRAGMA foreign_keys=OFF")
+        try:
+            with conn:
+                conn.execute(create)
+                conn.execute("INSERT INTO _workflow_instances_new SELECT * FROM workflow_instances")
+                conn.execute("DROP TABLE workflow_instances")
+                conn.execute("ALTER TABLE _workflow_instances_new RENAME TO workflow_instances")
+                # Les identifiants déjà supprimés mais présents dans l'historique ne sont pas réattribués
+                conn.execute("DELETE FROM sqlite_sequence WHERE name = 'workflow_instances'")
+                conn.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) SELECT 'workflow_instances', MAX("
+                    "(SELECT COALESCE(MAX(id), 0) FROM workflow_instances), "
+                    "(SELECT COALESCE(MAX(instance_id), 0) FROM workflow_history))"
+                )
+        finally:
+            conn.execute("PRAGMA foreign_keys=ON")
+
+    def add_due_listener(self, callback: Callable[[], None]):
+        """Appelle `callback()` après chaque écriture pouvant modifier l'index des échéances"""
+        self._due_listeners.append(callback)
+
+    def _notify_due(self):
+        for callback in self._due_listeners:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.warning(f"Erreur d'un abonné aux échéances: {str(e)}")
+
+    # ------------------------------------------------------------------
+    # Insertions par lots
+    # ------------------------------------------------------------------
+
+    def _insert_many(self, sql: str, rows: Iterable[Dict[str, Any]], defaults: Optional[Dict[str, Any]] = None) -> int:
+        """Insère les lignes par paquets dans une seule transaction"""
+        conn = self.connect()
+        rows = iter(rows)
+        count = 0
+        with conn:
+            while True:
+                chunk = list(islice(rows, self.batch_size))
+                if not chunk:
+                    break
+                if defaults:
+                    chunk = [{**defaults, **row} for row in chunk]
+                conn.executemany(sql, chunk)
+                count += len(chunk)
+        return count
+
+    def add_aircraft(self, registration: str, model: Optional[str] = None,
+                     status: str = "serviceable", total_hours: float = 0.0) -> int:
+        """Ajoute un aéronef et retourne son identifiant"""
+        conn = self.connect()
+        with conn:
+            cursor = conn.execute(INSERT_AIRCRAFT, {
+                "registration": registration, "model": model,
+                "status": status, "total_hours": total_hours
+            })
+        return cursor.lastrowid
+
+    def add_personnel(self, name: str, role: str, email: Optional[str] = None,
+                      currency_expires_at: Optional[DateLike] = None) -> int:
+        """Ajoute un membre du personnel et retourne son identifiant"""
+        conn = self.connect()
+        with conn:
+            cursor = conn.execute(INSERT_PERSONNEL, {
+                "name": name, "role": role, "email": email,
+                "currency_expires_at": _to_iso(currency_expires_at)
+            })
+        if currency_expires_at is not None:
+            self._notify_due()
+        return cursor.lastrowid
+
+    def add_flights(self, flights: Iterable[Dict[str, Any]]) -> int:
+        """Ajoute des entrées au carnet de vol par lots"""
+        return self._insert_many(INSERT_FLIGHT, (_iso_fields(f, ("started_at", "ended_at")) for f in flights),
+                                 FLIGHT_DEFAULTS)
+
+    def add_maintenance_records(self, records: Iterable[Dict[str, Any]]) -> int:
+        """Ajoute des enregistrements de maintenance par lots"""
+        count = self._insert_many(INSERT_MAINTENANCE, (_iso_fields(r, ("performed_at", "due_at")) for r in records),
+                                  MAINTENANCE_DEFAULTS)
+        self._notify_due()
+        return count
+
+    def add_certifications(self, certifications: Iterable[Dict[str, Any]]) -> int:
+        """Ajoute des certifications du personnel (qualifications, formations) par lots"""
+        count = self._insert_many(INSERT_CERTIFICATION,
+                                  (_iso_fields(c, ("issued_at", "expires_at")) for c in certifications),
+                                  CERTIFICATION_DEFAULTS)
+        self._notify_due()
+        return count
+
+    def add_reports(self, reports: Iterable[Dict[str, Any]]) -> int:
+        """Ajoute des rapports par lots"""
+        return self._insert_many(INSERT_REPORT, (_iso_fields(r, ("created_at",)) for r in reports),
+                                 REPORT_DEFAULTS)
+
+    def add_report_steps(self, steps: Iterable[Dict[str, Any]]) -> int:
+        """Enregistre les étapes de checklist complétées pour des rapports"""
+        return self._insert_many(INSERT_REPORT_STEP, (_iso_fields(r, ("completed_at",)) for r in steps),
+                                 REPORT_STEP_DEFAULTS)
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def get_flights_by_aircraft(self, aircraft_id: int, start: Optional[DateLike] = None,
+                                end: Optional[DateLike] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Retourne les vols d'un aéronef dans l'intervalle [start, end)"""
+        return self._fetch(SELECT_FLIGHTS_BY_AIRCRAFT, (aircraft_id, *_range(start, end), limit))
+
+    def get_flights_by_pilot(self, pilot_id: int, start: Optional[DateLike] = None,
+                             end: Optional[DateLike] = None, limit: int = 1000) -> List[Dict[str, Any]]:
+        """Retourne les vols d'un pilote dans l'intervalle [start, end)"""
+        return self._fetch(SELECT_FLIGHTS_BY_PILOT, (pilot_id, *_range(start, end), limit))
+
+    def get_flights_between(self, start: Optional[DateLike] = None, end: Optional[DateLike] = None,
+                            limit: int = 1000) -> List[Dict[str, Any]]:
+        """Retourne les vols débutant dans l'intervalle [start, end)"""
+        return self._fetch(SELECT_FLIGHTS_BETWEEN, (*_range(start, end), limit))
+
+    def get_maintenance_by_aircraft(self, aircraft_id: int, limit: int = 100) -> List[Dict[str, Any]]:
+        """Retourne l'historique de maintenance d'un aéronef"""
+        return self._fetch(SELECT_MAINTENANCE_BY_AIRCRAFT, (aircraft_id, limit))
+
+    def get_open_maintenance_due(self, before: DateLike) -> List[Dict[str, Any]]:
+        """Retourne les interventions ouvertes échues avant la date donnée"""
+        return self._fetch(SELECT_OPEN_MAINTENANCE_DUE, (_to_iso(before),))
+
+    def get_due_items(self, until: DateLike, after: Optional[DateLike] = None,
+                      sources: Optional[Sequence[str]] = None, limit: int = 10000) -> List[Dict[str, Any]]:
+        """Retourne les échéances comprises dans ]after, until], les plus proches en premier.
+
+        Sans `after`, les échéances déjà dépassées sont incluses. `sources`
+        restreint aux types d'échéances ("maintenance", "certification",
+        "currency"). Parcours de l'index par date: O(log n + k).
+        """
+        params = (_to_iso(after) if after is not None else MIN_DATE, _to_iso(until), limit)
+        if not sources:
+            return self._fetch(SELECT_DUE_ITEMS, params)
+        sql = SELECT_DUE_ITEMS.replace("WHERE", f"WHERE source IN ({', '.join('?' * len(sources))}) AND", 1)
+        return self._fetch(sql, (*sources, *params))
+
+    def get_next_due(self, after: DateLike) -> Optional[Dict[str, Any]]:
+        """Retourne la première échéance strictement postérieure à `after`, ou None"""
+        rows = self._fetch(SELECT_NEXT_DUE, (_to_iso(after),))
+        return rows[0] if rows else None
+
+    def count_due_items(self, until: DateLike, overdue_before: DateLike) -> Dict[str, Dict[str, int]]:
+        """Retourne par type le nombre d'échéances jusqu'à `until`, dont celles antérieures à `overdue_before`"""
+        rows = self._fetch(COUNT_DUE_BY_SOURCE, (_to_iso(overdue_before), _to_iso(until)))
+        return {row["source"]: {"count": row["count"], "overdue": row["overdue"]} for row in rows}
+
+    def data_version(self) -> int:
+        """Retourne le compteur de modifications de la base vu par la connexion du thread courant.
+
+        Il change dès qu'une autre connexion, d'un autre processus compris,
+        valide une écriture: un simple PRAGMA permet de détecter ces écritures.
+        """
+        return self.connect().execute("PRAGMA data_version").fetchone()[0]
+
+    def get_reports_page(self, role: Optional[str] = None, status: Optional[str] = None,
+                         date_from: Optional[DateLike] = None, date_to: Optional[DateLike] = None,
+                         after: Optional[Tuple[str, int]] = None, before: Optional[Tuple[str, int]] = None,
+                         limit: int = 50) -> List[Dict[str, Any]]:
+        """Retourne une page de rapports, du plus récent au plus ancien.
+
+        La pagination se fait par clé (created_at, id): `after` donne la page
+        suivante à partir de la dernière ligne affichée, `before` la page
+        précédente à partir de la première. Les filtres sont évalués par SQLite
+        sur les index de la table et non en Python. `date_to` est exclue
+        (created_at < date_to): pour un jour entier, passer le lendemain.
+        """
+        clauses, params = [], []
+        if role:
+            clauses.append("role = ?")
+            params.append(role)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        # La clé de pagination provient d'une ligne déjà filtrée: elle borne plus
+        # étroitement que la date du même côté, qui est alors omise pour que
+        # SQLite parte directement de la clé dans l'index.
+        if date_from and before is None:
+            clauses.append("created_at >= ?")
+            params.append(_to_iso(date_from))
+        if date_to and after is None:
+            clauses.append("created_at < ?")
+            params.append(_to_iso(date_to))
+
+        order = "DESC"
+        if after is not None:
+            clauses.append("(created_at, id) < (?, ?)")
+            params.extend(after)
+        elif before is not None:
+            clauses.append("(created_at, id) > (?, ?)")
+            params.extend(before)
+            order = "ASC"
+
+        where = f"WHERE {' AND '.join(clauses)} " if clauses else ""
+        sql = (f"SELECT id, title, role, status, author_id, flight_id, created_at FROM reports {where}"
+               f"ORDER BY created_at {order}, id {order} LIMIT ?")
+        rows = self._fetch(sql, (*params, limit))
+        if order == "ASC":
+            rows.reverse()
+        return rows
+
+    def _fetch(self, sql: str, params: Sequence[Any]) -> List[Dict[str, Any]]:
+        return [dict(row) for row in self.connect().execute(sql, params)]
+
+
+def _to_iso(value: Optional[DateLike]) -> Optional[str]:
+    """Normalise une date en texte ISO 8601 (tri lexicographique = tri chronologique)"""
+    if isinstance(value, datetime):
+        return value.isoformat(timespec="seconds")
+    return value
+
+
+def _iso_fields(row: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    for field in fields:
+        if isinstance(row.get(field), datetime):
+            row = {**row, field: _to_iso(row[field])}
+    return row
+
+
+def _range(start: Optional[DateLike], end: Optional[DateLike]):
+    return _to_iso(start) or MIN_DATE, _to_iso(end) or MAX_DATE
@@ -0,0 +1,387 @@
+import io
+import os
+import re
+import json
+import time
+import sqlite3
+import hashlib
+import zipfile
+import threading
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+from xml.etree import ElementTree
+from app.services.logging_service import get_logger
+from app.services.metrics_service import metrics
+
+SEARCH_SECONDS = metrics.histogram("documentation_search_seconds", "Durée des recherches dans la documentation")
+INDEXED_DOCUMENTS = metrics.counter("documentation_indexed_total", "Documents (ré)indexés par résultat")
+INDEX_SIZE = metrics.gauge("documentation_index_documents", "Documents présents dans l'index")
+
+# Les documents sont indexés par lots: chaque lot est une transaction courte,
+# les recherches (connexion séparée, mode WAL) ne sont jamais bloquées.
+BATCH_DOCUMENTS = 100
+TITLE_MAX_CHARS = 200
+# Poids du titre et du corps dans le classement bm25
+RANK_WEIGHTS = (10.0, 1.0)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS documents (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE,
+    mtime REAL NOT NULL,
+    size INTEGER NOT NULL,
+    sha256 TEXT NOT NULL,
+    title TEXT,
+    indexed_at REAL NOT NULL
+);
+-- Index de préfixes: une recherche au fil de la frappe ne parcourt pas tout le vocabulaire
+CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+    title, body, tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3 4'
+);
+"""
+
+
+class _HTMLText(HTMLParser):
+    """Texte visible d'une page HTML (hors scripts et styles)"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts: List[str] = []
+        self._skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in ("script", "style"):
+            self._skip += 1
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self._skip:
+            self._skip -= 1
+
+    def handle_data(self, data):
+        if not self._skip:
+            self.parts.append(data)
+
+
+def _decode(data: bytes) -> str:
+    try:
+        return data.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        # Documents produits sous Windows
+        return data.decode("cp1252", errors="replace")
+
+
+def _json_strings(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [s for key, item in value.items() for s in [str(key)] + _json_strings(item)]
+    if isinstance(value, list):
+        return [s for item in value for s in _json_strings(item)]
+    return []
+
+
+def _html_text(data: bytes) -> str:
+    parser = _HTMLText()
+    parser.feed(_decode(data))
+    return " ".join(parser.parts)
+
+
+def _json_text(data: bytes) -> str:
+    return "\n".join(_json_strings(json.loads(_decode(data))))
+
+
+def _docx_text(data: bytes) -> str:
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        root = ElementTree.fromstring(zf.read("word/document.xml"))
+    ns = "{http://schemas.openxmlformats.org/wordprocessingml/2006/main}"
+    return "\n".join("".join(t.text or "" for t in p.iter(f"{ns}t")) for p in root.iter(f"{ns}p"))
+
+
+def _pdf_text(data: bytes) -> str:
+    # Dépendance optionnelle: sans pypdf, les PDF sont ignorés (voir _extract)
+    from pypdf import PdfReader
+    return "\n".join(page.extract_text() or "" for page in PdfReader(io.BytesIO(data)).pages)
+
+
+EXTRACTORS = {
+    ".txt": _decode, ".md": _decode, ".rst": _decode, ".csv": _decode,
+    ".html": _html_text, ".htm": _html_text,
+    ".json": _json_text,
+    ".docx": _docx_text,
+    ".pdf": _pdf_text,
+}
+
+
+def _title(path: Path, text: str) -> str:
+    """Premier titre ou première ligne non vide, sinon le nom du fichier"""
+    for line in text.splitlines():
+        line = line.strip().lstrip("#").strip()
+        if line:
+            return line[:TITLE_MAX_CHARS]
+    return path.stem
+
+
+def to_match_query(query: str) -> Optional[str]:
+    """Convertit une saisie libre en requête FTS5.
+
+    Chaque mot est cité (la syntaxe FTS5 saisie par erreur ne provoque pas
+    d'erreur). Le dernier mot, s'il n'est pas suivi d'une espace, est
+    recherché par préfixe pour une recherche au fil de la frappe. Tous les
+    mots doivent être présents.
+    """
+    terms = re.findall(r"\w+", query)
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    if not query[-1].isspace():
+        quoted[-1] += "*"
+    return " ".join(quoted)
+
+
+class DocumentationService:
+    """Index plein texte (SQLite FTS5) des documents du module documentation.
+
+    Les manuels, procédures et listes de vérification placés sous `docs_dir`
+    sont extraits en texte et indexés dans `index_path`. L'indexation est
+    incrémentale: un fichier dont la taille et la date de modification sont
+    inchangées n'est pas relu, un fichier relu dont l'empreinte est inchangée
+    n'est pas réindexé. Elle s'exécute dans un thread d'arrière-plan
+    (start/refresh); search() interroge l'index sans attendre la fin d'une
+    indexation en cours.
+    """
+
+    def __init__(self, docs_dir="data/documentation", index_path="data/documentation_index.db",
+                 scan_interval: float = 300.0):
+        self.docs_dir = Path(docs_dir)
+        self.index_path = Path(index_path)
+        self.scan_interval = scan_interval
+        self.logger = get_logger("DocumentationService", "documentation.log")
+        self._local = threading.local()
+        self._connections: List[sqlite3.Connection] = []
+        self._connections_lock = threading.Lock()
+        self._index_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop_flag = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._pdf_warned = False
+        self._stats: Dict[str, Any] = {"last_run": None, "last_duration": None, "last_error": None}
+
+        self.index_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = self._connect()
+        with conn:
+            conn.executescript(SCHEMA)
+            conn.execute("INSERT INTO documents_fts(documents_fts, rank) VALUES ('rank', ?)",
+                         (f"bm25({RANK_WEIGHTS[0]}, {RANK_WEIGHTS[1]})",))
+
+    def _connect(self) -> sqlite3.Connection:
+        """Connexion du thread courant: le thread d'indexation écrit pendant que l'interface lit"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            # Utilisée par un seul thread; close() la ferme depuis un autre
+            conn = sqlite3.connect(str(self.index_path), check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    # ------------------------------------------------------------------
+    # Indexation
+    # ------------------------------------------------------------------
+
+    def index(self) -> Optional[Dict[str, int]]:
+        """Met l'index à jour. Retourne le nombre de documents par résultat, ou None en cas d'échec"""
+        with self._index_lock:
+            started = time.perf_counter()
+            try:
+                counts = self._index()
+                self._stats["last_error"] = None
+            except Exception as e:
+                self._stats["last_error"] = str(e)
+                self.logger.error(f"Erreur lors de l'indexation de la documentation: {str(e)}")
+                return None
+            duration = time.perf_counter() - started
+            self._stats.update(last_run=time.time(), last_duration=duration)
+            for status, count in counts.items():
+                if count and status != "unchanged":
+                    INDEXED_DOCUMENTS.inc(count, status=status)
+            INDEX_SIZE.set(self.count())
+            if any(counts[k] for k in ("added", "updated", "removed")):
+                self.logger.info("Documentation indexée",
+                                 extra={**counts, "duration_ms": round(duration * 1000, 1)})
+            return counts
+
+    def _index(self) -> Dict[str, int]:
+        conn = self._connect()
+        known = {path: (doc_id, mtime, size, sha)
+                 for doc_id, path, mtime, size, sha in conn.execute(
+                     "SELECT id, path, mtime, size, sha256 FROM documents")}
+        counts = {"added": 0, "updated": 0, "touched": 0, "unchanged": 0, "removed": 0, "skipped": 0}
+        pending = 0
+        conn.execute("BEGIN")
+        try:
+            for path in self._scan():
+                if self._stop_flag.is_set():
+                    break
+                name = path.relative_to(self.docs_dir).as_posix()
+                status = self._index_file(conn, path, name, known.pop(name, None))
+                counts[status] += 1
+                if status != "unchanged":
+                    pending += 1
+                if pending >= BATCH_DOCUMENTS:
+                    conn.execute("COMMIT")
+                    conn.execute("BEGIN")
+                    pending = 0
+            else:
+                # Documents disparus (seulement après un parcours complet)
+                for doc_id, *_ in known.values():
+                    conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+                    conn.execute("DELETE FROM documents WHERE id = ?", (doc_id,))
+                    counts["removed"] += 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return counts
+
+    def _scan(self):
+        if not self.docs_dir.exists():
+            return
+        for current, subdirs, names in os.walk(self.docs_dir):
+            subdirs.sort()
+            for name in sorted(names):
+                path = Path(current) / name
+                if path.suffix.lower() in EXTRACTORS:
+                    yield path
+
+    def _index_file(self, conn: sqlite3.Connection, path: Path, name: str, known) -> str:
+        st = path.stat()
+        if known is not None and known[1] == st.st_mtime and known[2] == st.st_size:
+            return "unchanged"
+        data = path.read_bytes()
+        sha = hashlib.sha256(data).hexdigest()
+        if known is not None and known[3] == sha:
+            # Fichier copié ou touché sans modification: contenu déjà indexé
+            conn.execute("UPDATE documents SET mtime = ?, size = ? WHERE id = ?", (st.st_mtime, st.st_size, known[0]))
+            return "touched"
+        text = self._extract(path, data)
+        if text is None:
+            if known is not None:
+                conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (known[0],))
+                conn.execute("DELETE FROM documents WHERE id = ?", (known[0],))
+            return "skipped"
+        title = _title(path, text)
+        if known is None:
+            doc_id = conn.execute(
+                "INSERT INTO documents (path, mtime, size, sha256, title, indexed_at) VALUES (?, ?, ?, ?, ?, ?)",
+                (name, st.st_mtime, st.st_size, sha, title, time.time())
+            ).lastrowid
+        else:
+            doc_id = known[0]
+            conn.execute(
+                "UPDATE documents SET mtime = ?, size = ?, sha256 = ?, title = ?, indexed_at = ? WHERE id = ?",
+                (st.st_mtime, st.st_size, sha, title, time.time(), doc_id)
+            )
+            conn.execute("DELETE FROM documents_fts WHERE rowid = ?", (doc_id,))
+        conn.execute("INSERT INTO documents_fts (rowid, title, body) VALUES (?, ?, ?)", (doc_id, title, text))
+        # Laisse la main au thread de l'interface entre deux documents
+        time.sleep(0)
+        return "added" if known is None else "updated"
+
+    def _extract(self, path: Path, data: bytes) -> Optional[str]:
+        try:
+            return EXTRACTORS[path.suffix.lower()](data)
+        except ImportError:
+            if not self._pdf_warned:
+                self._pdf_warned = True
+                self.logger.warning("pypdf non installé: les documents PDF ne sont pas indexés")
+        except Exception as e:
+            self.logger.warning(f"Extraction du texte impossible pour {path.name}: {str(e)}")
+        return None
+
+    # ------------------------------------------------------------------
+    # Indexation en arrière-plan
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Démarre le thread d'indexation (indexation immédiate puis périodique)"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop_flag.clear()
+        self._wake.set()
+        self._thread = threading.Thread(target=self._run_indexer, name="documentation-index", daemon=True)
+        self._thread.start()
+        self.logger.info("Indexation de la documentation démarrée")
+
+    def refresh(self):
+        """Demande une mise à jour de l'index sans attendre (ex. après l'ajout d'un document)"""
+        self._wake.set()
+
+    def stop(self):
+        """Arrête le thread d'indexation; un lot en cours est validé avant l'arrêt"""
+        if self._thread and self._thread.is_alive():
+            self._stop_flag.set()
+            self._wake.set()
+            self._thread.join()
+        self.logger.info("Indexation de la documentation arrêtée")
+
+    def close(self):
+        """Arrête l'indexation et ferme les connexions à l'index"""
+        self.stop()
+        with self._connections_lock:
+            for conn in self._connections:
+                conn.close()
+            self._connections.clear()
+        self._local = threading.local()
+
+    def _run_indexer(self):
+        while not self._stop_flag.is_set():
+            self._wake.wait(self.scan_interval)
+            self._wake.clear()
+            if self._stop_flag.is_set():
+                break
+            self.index()
+
+    # ------------------------------------------------------------------
+    # Recherche
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, limit: int = 20, offset: int = 0) -> List[Dict[str, Any]]:
+        """Recherche plein texte, les documents les plus pertinents en premier.
+
+        Retourne [{path, title, snippet, score}], l'extrait encadrant les
+        termes trouvés par [ ]. Une requête vide ou invalide ne retourne rien.
+        """
+        match = to_match_query(query)
+        if match is None:
+            return []
+        try:
+            with metrics.span(SEARCH_SECONDS):
+                rows = self._connect().execute(
+                    """
+                    SELECT d.path, d.title,
+                           snippet(documents_fts, 1, '[', ']', '…', 16), documents_fts.rank
+                    FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+                    WHERE documents_fts MATCH ?
+                    ORDER BY documents_fts.rank LIMIT ? OFFSET ?
+                    """,
+                    (match, limit, offset)
+                ).fetchall()
+        except sqlite3.Error as e:
+            self.logger.error(f"Erreur lors de la recherche '{query}': {str(e)}")
+            return []
+        return [{"path": path, "title": title, "snippet": snippet, "score": -rank}
+                for path, title, snippet, rank in rows]
+
+    def count(self) -> int:
+        """Retourne le nombre de documents indexés"""
+        return self._connect().execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne la taille de l'index et l'état de la dernière indexation"""
+        stats = dict(self._stats)
+        stats["documents"] = self.count()
+        stats["indexing"] = self._index_lock.locked()
+        return stats
@@ -0,0 +1,148 @@
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence
+from app.services.logging_service import get_logger
+from app.services.metrics_service import metrics
+
+DUE_ALERTS = metrics.counter("due_alerts_total", "Échéances signalées par type")
+DUE_ALERT_LAG = metrics.histogram("due_alert_lag_seconds", "Retard des alertes d'échéance sur l'heure prévue")
+
+AlertCallback = Callable[[List[Dict[str, Any]], timedelta], None]
+
+
+class DueDateService:
+    """Échéances de maintenance, certifications et validité du personnel.
+
+    S'appuie sur l'index `due_items` de DatabaseService, trié par date et
+    tenu à jour par des déclencheurs: "dû d'ici N jours" est un parcours
+    d'intervalle (O(log n + k)), sans parcourir aéronefs et personnel.
+
+    Une fois démarré, un thread attend jusqu'à l'heure exacte de la prochaine
+    échéance (moins chaque délai de prévenance de `lead_days`) puis appelle
+    `on_alert(échéances, délai)`. Les écritures faites par DatabaseService le
+    réveillent; celles d'un autre processus (l'application lorsque le thread
+    tourne dans le service de sauvegarde) sont détectées par PRAGMA
+    data_version, vérifié toutes les `poll_interval` secondes.
+    """
+
+    def __init__(self, database, lead_days: Sequence[float] = (0,), poll_interval: float = 5.0,
+                 clock: Callable[[], datetime] = datetime.now):
+        self.database = database
+        self.leads = sorted({timedelta(days=days) for days in lead_days})
+        self.poll_interval = poll_interval
+        self.clock = clock
+        self.logger = get_logger("DueDateService", "due_dates.log")
+        self._on_alert: Optional[AlertCallback] = None
+        self._cursors: Dict[timedelta, datetime] = {}
+        self._wake = threading.Event()
+        self._stop_flag = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        database.add_due_listener(self.notify_changed)
+
+    # ------------------------------------------------------------------
+    # Requêtes
+    # ------------------------------------------------------------------
+
+    def due_within(self, days: float, sources: Optional[Sequence[str]] = None,
+                   include_overdue: bool = True) -> List[Dict[str, Any]]:
+        """Retourne les échéances des N prochains jours (et celles dépassées), les plus proches en premier"""
+        now = self.clock()
+        return self.database.get_due_items(now + timedelta(days=days),
+                                           after=None if include_overdue else now, sources=sources)
+
+    def summary(self, days: float, sources: Optional[Sequence[str]] = None) -> Dict[str, int]:
+        """Nombre d'échéances des N prochains jours, dont celles déjà dépassées (agrégat, sans limite)"""
+        now = self.clock()
+        counts = self.database.count_due_items(now + timedelta(days=days), now)
+        selected = [c for source, c in counts.items() if not sources or source in sources]
+        return {"count": sum(c["count"] for c in selected), "overdue": sum(c["overdue"] for c in selected)}
+
+    def next_alert_at(self) -> Optional[datetime]:
+        """Heure de la prochaine alerte, tous délais de prévenance confondus"""
+        upcoming = []
+        for lead, cursor in self._cursors.items():
+            item = self.database.get_next_due(cursor + lead)
+            if item is not None:
+                upcoming.append(datetime.fromisoformat(item["due_at"]) - lead)
+        return min(upcoming) if upcoming else None
+
+    # ------------------------------------------------------------------
+    # Alertes
+    # ------------------------------------------------------------------
+
+    def start(self, on_alert: AlertCallback):
+        """Démarre l'envoi des alertes; seules les échéances à venir sont signalées"""
+        if self._thread and self._thread.is_alive():
+            return
+        self._on_alert = on_alert
+        now = self.clock()
+        self._cursors = {lead: now for lead in self.leads}
+        self._stop_flag.clear()
+        self._thread = threading.Thread(target=self._run, name="due-dates", daemon=True)
+        self._thread.start()
+        self.logger.info("Alertes d'échéance démarrées")
+
+    def notify_changed(self):
+        """Signale une modification des échéances: la prochaine alerte est recalculée"""
+        self._wake.set()
+
+    def stop(self):
+        """Arrête l'envoi des alertes"""
+        if self._thread and self._thread.is_alive():
+            self._stop_flag.set()
+            self._wake.set()
+            self._thread.join()
+        self.logger.info("Alertes d'échéance arrêtées")
+
+    def _run(self):
+        at, version, changed = None, None, True
+        while not self._stop_flag.is_set():
+            try:
+                if changed:
+                    version = self.database.data_version()
+                    at = self.next_alert_at()
+                    changed = False
+                elif self.database.data_version() != version:
+                    # Écriture d'un autre processus: recalcul de l'heure de réveil
+                    changed = True
+                    continue
+            except Exception as e:
+                self.logger.error(f"Erreur lors du calcul de la prochaine échéance: {str(e)}")
+                at, changed = None, True
+
+            now = self.clock()
+            if at is not None and now >= at:
+                self.fire_due()
+                changed = True
+                continue
+            timeout = self.poll_interval
+            if at is not None:
+                timeout = min(timeout, (at - now).total_seconds())
+            if self._wake.wait(timeout):
+                # Échéances modifiées dans ce processus
+                self._wake.clear()
+                changed = True
+
+    def fire_due(self) -> int:
+        """Signale les échéances atteintes depuis le dernier appel. Retourne leur nombre"""
+        now = self.clock()
+        fired = 0
+        for lead, cursor in list(self._cursors.items()):
+            try:
+                # Sans limite: le curseur avance, une échéance tronquée ne serait jamais signalée
+                items = self.database.get_due_items(now + lead, after=cursor + lead, limit=-1)
+            except Exception as e:
+                self.logger.error(f"Erreur lors de la lecture des échéances: {str(e)}")
+                continue
+            self._cursors[lead] = now
+            if not items:
+                continue
+            fired += len(items)
+            for item in items:
+                DUE_ALERTS.inc(source=item["source"])
+            DUE_ALERT_LAG.observe((now - (datetime.fromisoformat(items[0]["due_at"]) - lead)).total_seconds())
+            try:
+                self._on_alert(items, lead)
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'envoi des alertes d'échéance: {str(e)}")
+        return fired
@@ -1,6 +1,10 @@
 import os
-import pyrebase
 from dotenv import load_dotenv
+from app.services.offline_sync_service import OfflineSyncService
+from app.services.metrics_service import metrics
+
+FIREBASE_CALL_SECONDS = metrics.histogram("firebase_call_seconds", "Latence des appels Firebase")
+FIREBASE_CALL_ERRORS = metrics.counter("firebase_call_errors_total", "Appels Firebase en erreur")
 
 class FirebaseService:
     def __init__(self):
@@ -19,33 +23,74 @@ class FirebaseService:
             "measurementId": os.getenv('FIREBASE_MEASUREMENT_ID')
         }
         
-        # Initialise Firebase
-        self.firebase = pyrebase.initialize_app(self.config)
-        self.auth = self.firebase.auth()
-        self.db = self.firebase.database()
+        # Firebase est initialisé au premier appel: l'import de pyrebase
+        # (requests, oauth2client, gcloud...) pèse plus d'une demi-seconde
+        self.firebase = None
+        self._auth = None
+        self._db = None
+        self.id_token = None
+        self._sync_service = None
+        
+    def initialize_firebase(self):
+        """Initialise l'application pyrebase si ce n'est pas déjà fait"""
+        if self.firebase is None:
+            import pyrebase
+            self.firebase = pyrebase.initialize_app(self.config)
+        return self.firebase
+        
+    @property
+    def auth(self):
+        """Client d'authentification Firebase"""
+        if self._auth is None:
+            self._auth = self.initialize_firebase().auth()
+        return self._auth
+        
+    @property
+    def db(self):
+        """Client Realtime Database Firebase"""
+        if self._db is None:
+            self._db = self.initialize_firebase().database()
+        return self._db
+        
+    def get_sync_service(self):
+        """Retourne le service de synchronisation hors-ligne (démarré à la première demande)"""
+        if self._sync_service is None:
+            self._sync_service = OfflineSyncService(
+                self.db,
+                token_provider=lambda: self.id_token
+            )
+            self._sync_service.start()
+        return self._sync_service
         
     def sign_in_with_email_password(self, email, password):
         """Connecte un utilisateur avec email/mot de passe"""
         try:
-            user = self.auth.sign_in_with_email_and_password(email, password)
+            with metrics.span(FIREBASE_CALL_SECONDS, call="sign_in"):
+                user = self.auth.sign_in_with_email_and_password(email, password)
+            self.id_token = user.get('idToken')
             return user
         except Exception as e:
+            FIREBASE_CALL_ERRORS.inc(call="sign_in")
             print(f"Erreur de connexion : {str(e)}")
             raise
             
     def create_user_with_email_password(self, email, password):
         """Crée un nouvel utilisateur avec email/mot de passe"""
         try:
-            user = self.auth.create_user_with_email_and_password(email, password)
+            with metrics.span(FIREBASE_CALL_SECONDS, call="create_user"):
+                user = self.auth.create_user_with_email_and_password(email, password)
             return user
         except Exception as e:
+            FIREBASE_CALL_ERRORS.inc(call="create_user")
             print(f"Erreur de création d'utilisateur : {str(e)}")
             raise
             
     def send_password_reset_email(self, email):
         """Envoie un email de réinitialisation de mot de passe"""
         try:
-            self.auth.send_password_reset_email(email)
+            with metrics.span(FIREBASE_CALL_SECONDS, call="password_reset"):
+                self.auth.send_password_reset_email(email)
         except Exception as e:
+            FIREBASE_CALL_ERRORS.inc(call="password_reset")
             print(f"Erreur d'envoi d'email : {str(e)}")
             raise
@@ -0,0 +1,156 @@
+import os
+import json
+import queue
+import atexit
+import logging
+import threading
+import logging.handlers
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+CONSOLE_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+# Attributs présents sur tout LogRecord: le reste provient de `extra=` et
+# est recopié tel quel dans la ligne JSON.
+_STANDARD_ATTRS = set(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formate un enregistrement en une ligne JSON"""
+
+    def format(self, record):
+        entry = {
+            "ts": datetime.fromtimestamp(record.created).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "thread": record.threadName,
+        }
+        for key, value in vars(record).items():
+            if key not in _STANDARD_ATTRS:
+                entry[key] = value
+        if record.exc_text:
+            entry["exception"] = record.exc_text
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Handler côté appelant: fige le message et place l'enregistrement dans la file"""
+
+    def prepare(self, record):
+        # Le logger n'a que ce handler et ne propage pas: pas besoin de copier
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class _RoutingHandler(logging.Handler):
+    """Handler du thread d'écriture: envoie chaque enregistrement aux fichiers de son composant"""
+
+    def __init__(self):
+        super().__init__()
+        self.routes: Dict[str, List[logging.Handler]] = {}
+
+    def handle(self, record):
+        for handler in self.routes.get(record.name, ()):
+            if record.levelno >= handler.level:
+                handler.handle(record)
+        return True
+
+    def flush(self):
+        for handlers in list(self.routes.values()):
+            for handler in handlers:
+                handler.flush()
+
+
+class _LoggingPipeline:
+    """File commune et thread d'écriture partagés par tous les composants"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.queue: queue.Queue = queue.Queue()
+        self.router = _RoutingHandler()
+        self.file_handlers: Dict[Path, logging.Handler] = {}
+        self.console_handler: Optional[logging.Handler] = None
+        self.listener: Optional[logging.handlers.QueueListener] = None
+
+    def start(self):
+        if self.listener is None:
+            self.listener = logging.handlers.QueueListener(self.queue, self.router)
+            self.listener.start()
+            atexit.register(shutdown_logging)
+
+    def file_handler(self, path: Path, max_bytes: int, backup_count: int, when: Optional[str]):
+        handler = self.file_handlers.get(path)
+        if handler is None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            if when:
+                handler = logging.handlers.TimedRotatingFileHandler(
+                    path, when=when, backupCount=backup_count, encoding="utf-8")
+            else:
+                handler = logging.handlers.RotatingFileHandler(
+                    path, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+            handler.setFormatter(JsonFormatter())
+            self.file_handlers[path] = handler
+        return handler
+
+    def console(self):
+        if self.console_handler is None:
+            self.console_handler = logging.StreamHandler()
+            self.console_handler.setFormatter(logging.Formatter(CONSOLE_FORMAT))
+        return self.console_handler
+
+
+_pipeline = _LoggingPipeline()
+
+
+def get_logger(name: str, filename: str = "app.log", log_dir=None, level: int = logging.INFO,
+               console: bool = False, max_bytes: int = DEFAULT_MAX_BYTES,
+               backup_count: int = DEFAULT_BACKUP_COUNT, when: Optional[str] = None) -> logging.Logger:
+    """Retourne un logger dont les enregistrements sont écrits par le thread de journalisation.
+
+    L'appel de log ne fait que placer l'enregistrement dans une file: les
+    écritures disque (JSON lines, rotation par taille ou, avec `when`, par
+    période) se font dans un thread dédié. Chaque composant a son fichier,
+    dans `log_dir` ou à défaut HC_LOG_DIR (par défaut `logs`).
+    """
+    path = Path(log_dir or os.getenv("HC_LOG_DIR", "logs")).resolve() / filename
+    with _pipeline.lock:
+        _pipeline.start()
+        handlers = [_pipeline.file_handler(path, max_bytes, backup_count, when)]
+        if console:
+            handlers.append(_pipeline.console())
+        _pipeline.router.routes[name] = handlers
+
+        logger = logging.getLogger(name)
+        logger.setLevel(level)
+        if not any(isinstance(h, _QueueHandler) for h in logger.handlers):
+            logger.addHandler(_QueueHandler(_pipeline.queue))
+        # Le composant ne remonte pas au logger racine (configuré par Kivy)
+        logger.propagate = False
+    return logger
+
+
+def flush_logging():
+    """Attend que tous les enregistrements en file soient écrits"""
+    if _pipeline.listener is not None:
+        _pipeline.queue.join()
+        _pipeline.router.flush()
+
+
+def shutdown_logging():
+    """Vide la file, arrête le thread d'écriture et ferme les fichiers"""
+    with _pipeline.lock:
+        if _pipeline.listener is not None:
+            _pipeline.listener.stop()
+            _pipeline.listener = None
+        for handler in _pipeline.file_handlers.values():
+            handler.close()
+        _pipeline.file_handlers.clear()
+        _pipeline.router.routes.clear()
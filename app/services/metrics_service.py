@@ -0,0 +1,261 @@
+import os
+import time
+import atexit
+import bisect
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+# Bornes (en secondes) adaptées à la fois aux appels réseau et aux sauvegardes
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 300.0)
+
+
+def _label_key(labels: Dict[str, str]) -> Tuple:
+    return tuple(sorted(labels.items())) if labels else ()
+
+
+def _escape(value) -> str:
+    """Échappe une valeur d'étiquette selon le format texte de Prometheus"""
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(key: Tuple, extra: Tuple = ()) -> str:
+    pairs = key + extra
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{k}="{_escape(v)}"' for k, v in pairs) + "}"
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, registry, name: str, help: str):
+        self.registry = registry
+        self.name = name
+        self.help = help
+        self._lock = threading.Lock()
+        self._values: Dict[Tuple, object] = {}
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for key, value in items:
+            lines.extend(self._render_value(key, value))
+        return lines
+
+    def _render_value(self, key, value):
+        return [f"{self.name}{_format_labels(key)} {value:g}"]
+
+
+class Counter(_Metric):
+    """Compteur monotone"""
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    """Valeur instantanée"""
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        with self._lock:
+            self._values[_label_key(labels)] = value
+
+
+class Histogram(_Metric):
+    """Distribution cumulée par seaux (compte, somme, seaux)"""
+    kind = "histogram"
+
+    def __init__(self, registry, name: str, help: str, buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        if not self.registry.enabled:
+            return
+        key = _label_key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            state[0][index] += 1
+            state[1] += value
+            state[2] += 1
+
+    def _render_value(self, key, value):
+        counts, total, count = value
+        lines = []
+        cumulative = 0
+        for bound, bucket_count in zip(self.buckets, counts):
+            cumulative += bucket_count
+            lines.append(f"{self.name}_bucket{_format_labels(key, (('le', f'{bound:g}'),))} {cumulative}")
+        lines.append(f"{self.name}_bucket{_format_labels(key, (('le', '+Inf'),))} {count}")
+        lines.append(f"{self.name}_sum{_format_labels(key)} {total:g}")
+        lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+
+class _Span:
+    __slots__ = ("histogram", "labels", "started")
+
+    def __init__(self, histogram: Histogram, labels):
+        self.histogram = histogram
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.histogram.observe(time.perf_counter() - self.started, **self.labels)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class MetricsRegistry:
+    """Registre des métriques d'un processus.
+
+    Désactivé, chaque appel d'instrumentation se limite au test d'un booléen
+    (et `span` retourne un contexte partagé qui ne mesure rien).
+    """
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _get(self, cls, name, help, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(self, name, help, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"La métrique '{name}' existe déjà avec un autre type")
+            return metric
+
+    def counter(self, name: str, help: str = "") -> Counter:
+        return self._get(Counter, name, help)
+
+    def gauge(self, name: str, help: str = "") -> Gauge:
+        return self._get(Gauge, name, help)
+
+    def histogram(self, name: str, help: str = "", buckets=DEFAULT_BUCKETS) -> Histogram:
+        return self._get(Histogram, name, help, buckets=buckets)
+
+    def span(self, histogram: Histogram, **labels):
+        """Mesure la durée d'un bloc `with` dans un histogramme (en secondes)"""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(histogram, labels)
+
+    def export_text(self) -> str:
+        """Retourne toutes les métriques au format texte de Prometheus"""
+        with self._lock:
+            metrics = sorted(self._metrics.values(), key=lambda m: m.name)
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        """Efface toutes les valeurs enregistrées"""
+        with self._lock:
+            for metric in self._metrics.values():
+                with metric._lock:
+                    metric._values.clear()
+
+    def write_textfile(self, path) -> bool:
+        """Écrit les métriques dans un fichier .prom (remplacement atomique)"""
+        if not self.enabled:
+            return False
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_suffix(path.suffix + ".tmp")
+        tmp.write_text(self.export_text(), encoding="utf-8")
+        os.replace(tmp, path)
+        return True
+
+    def start_textfile_exporter(self, path, interval: float = 15.0) -> threading.Event:
+        """Réécrit périodiquement le fichier de métriques. Retourne l'événement d'arrêt"""
+        stop = threading.Event()
+
+        def run():
+            while True:
+                self.write_textfile(path)
+                if stop.wait(interval):
+                    break
+            self.write_textfile(path)
+
+        threading.Thread(target=run, name="MetricsExporter", daemon=True).start()
+        # Dernière écriture à la sortie du processus (le thread est un démon)
+        atexit.register(self.write_textfile, path)
+        return stop
+
+    def start_http_server(self, port: int, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+        """Expose les métriques sur http://host:port/metrics"""
+        registry = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.rstrip("/") not in ("", "/metrics"):
+                    self.send_error(404)
+                    return
+                body = registry.export_text().encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass
+
+        server = ThreadingHTTPServer((host, port), Handler)
+        threading.Thread(target=server.serve_forever, name="MetricsHTTP", daemon=True).start()
+        return server
+
+
+# Registre du processus; HC_METRICS=0 désactive l'instrumentation
+metrics = MetricsRegistry(enabled=os.getenv("HC_METRICS", "1") != "0")
+
+METRICS_DIR = Path(os.getenv("HC_LOG_DIR", "logs")) / "metrics"
+
+
+def start_exporters(component: str, metrics_dir=None, interval: float = 15.0) -> Optional[threading.Event]:
+    """Démarre l'export des métriques d'un processus.
+
+    Les métriques sont réécrites dans `<metrics_dir>/<component>.prom`
+    (par défaut `<HC_LOG_DIR>/metrics`); si HC_METRICS_PORT est défini,
+    elles sont aussi servies en HTTP.
+    """
+    if not metrics.enabled:
+        return None
+    port = os.getenv("HC_METRICS_PORT")
+    if port:
+        metrics.start_http_server(int(port))
+    if metrics_dir is None:
+        metrics_dir = Path(os.getenv("HC_LOG_DIR", "logs")) / "metrics"
+    return metrics.start_textfile_exporter(Path(metrics_dir) / f"{component}.prom", interval)
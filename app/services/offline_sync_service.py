@@ -0,0 +1,366 @@
+import json
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+from app.services.logging_service import get_logger
+from app.services.metrics_service import metrics
+
+FIREBASE_CALL_SECONDS = metrics.histogram("firebase_call_seconds", "Latence des appels Firebase")
+FIREBASE_CALL_ERRORS = metrics.counter("firebase_call_errors_total", "Appels Firebase en erreur")
+
+
+class OfflineSyncService:
+    """File d'écriture hors-ligne et cache de lecture au-dessus de Firebase Realtime Database.
+
+    Les écritures sont enregistrées dans une outbox SQLite locale puis envoyées
+    par lots en arrière-plan (une seule requête PATCH multi-chemins par lot).
+    Les écritures répétées sur un même chemin sont fusionnées dans l'outbox.
+    Les lectures sont servies depuis un cache local avec durée de validité.
+    """
+
+    def __init__(self, db, store_path="data/offline_store.db", cache_ttl: float = 300.0,
+                 flush_interval: float = 5.0, batch_size: int = 500,
+                 token_provider: Optional[Callable[[], Optional[str]]] = None):
+        self.db = db
+        self.store_path = Path(store_path)
+        self.cache_ttl = cache_ttl
+        self.flush_interval = flush_interval
+        self.batch_size = batch_size
+        self.token_provider = token_provider
+        self.logger = get_logger("OfflineSyncService", "offline_sync.log")
+
+        # L'objet Database de pyrebase conserve le chemin courant entre deux appels:
+        # il ne doit donc être utilisé que par un seul thread à la fois.
+        self._db_lock = threading.Lock()
+        self._store_lock = threading.RLock()
+        self._wake = threading.Event()
+        self._stop_flag = threading.Event()
+        self._flush_thread: Optional[threading.Thread] = None
+
+        self._stats = {
+            "flushed_writes": 0,
+            "flush_count": 0,
+            "flush_failures": 0,
+            "last_flush_latency": None,
+            "last_flush_at": None,
+            "last_error": None,
+        }
+
+        self.store_path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.store_path), check_same_thread=False)
+        self._init_store()
+
+    def _init_store(self):
+        """Crée les tables de l'outbox et du cache"""
+        with self._store_lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript("""
+                CREATE TABLE IF NOT EXISTS outbox (
+                    path TEXT PRIMARY KEY,
+                    value TEXT,
+                    seq INTEGER NOT NULL,
+                    queued_at REAL NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS idx_outbox_seq ON outbox(seq);
+                CREATE TABLE IF NOT EXISTS cache (
+                    path TEXT PRIMARY KEY,
+                    value TEXT,
+                    fetched_at REAL NOT NULL
+                );
+            """)
+            self._conn.commit()
+            row = self._conn.execute("SELECT COALESCE(MAX(seq), 0) FROM outbox").fetchone()
+            self._seq = row[0]
+            self._writes_since_flush = 0
+
+    # ------------------------------------------------------------------
+    # Écritures
+    # ------------------------------------------------------------------
+
+    def set(self, path: str, value: Any):
+        """Remplace la valeur stockée à `path` (acquittée localement)"""
+        self._enqueue(self._normalize(path), value)
+
+    def update(self, path: str, fields: Dict[str, Any]):
+        """Met à jour les enfants de `path` listés dans `fields`"""
+        base = self._normalize(path)
+        with self._store_lock:
+            for key, value in fields.items():
+                self._enqueue(self._join(base, key), value, commit=False)
+            self._conn.commit()
+        self._maybe_wake()
+
+    def remove(self, path: str):
+        """Supprime la valeur stockée à `path`"""
+        self._enqueue(self._normalize(path), None)
+
+    def push(self, path: str, value: Any) -> str:
+        """Ajoute un enfant avec une clé chronologique générée localement"""
+        with self._db_lock:
+            key = self.db.generate_key()
+        self._enqueue(self._join(self._normalize(path), key), value)
+        return key
+
+    def _enqueue(self, path: str, value: Any, commit: bool = True):
+        """Ajoute une écriture à l'outbox en fusionnant avec les écritures en attente"""
+        if not path:
+            raise ValueError("Le chemin racine ne peut pas être écrit directement")
+        value = self._to_plain(value)
+
+        with self._store_lock:
+            ancestor = self._find_pending_ancestor(path)
+            if ancestor is not None:
+                # Une écriture en attente couvre déjà ce chemin: on fusionne dedans
+                # pour qu'un lot ne contienne jamais un chemin et son descendant.
+                anc_path, anc_value = ancestor
+                merged = self._assign(anc_value, path[len(anc_path) + 1:].split("/"), value)
+                self._store_pending(anc_path, merged)
+            else:
+                # Cette écriture écrase toutes les écritures en attente plus profondes
+                self._conn.execute(
+                    "DELETE FROM outbox WHERE path > ? AND path < ?",
+                    (path + "/", path + "0")
+                )
+                self._store_pending(path, value)
+            if commit:
+                self._conn.commit()
+
+        if commit:
+            self._maybe_wake()
+
+    def _store_pending(self, path: str, value: Any):
+        self._seq += 1
+        self._conn.execute(
+            "INSERT OR REPLACE INTO outbox (path, value, seq, queued_at) VALUES (?, ?, ?, ?)",
+            (path, json.dumps(value), self._seq, time.time())
+        )
+
+    def _find_pending_ancestor(self, path: str):
+        """Retourne (chemin, valeur) de l'écriture en attente couvrant `path`, s'il y en a une"""
+        parts = path.split("/")
+        for i in range(1, len(parts)):
+            prefix = "/".join(parts[:i])
+            row = self._conn.execute("SELECT value FROM outbox WHERE path = ?", (prefix,)).fetchone()
+            if row is not None:
+                return prefix, json.loads(row[0])
+        return None
+
+    def _maybe_wake(self):
+        """Réveille le thread d'envoi lorsqu'un lot complet est disponible"""
+        self._writes_since_flush += 1
+        if self._writes_since_flush >= self.batch_size:
+            self._wake.set()
+
+    # ------------------------------------------------------------------
+    # Lectures
+    # ------------------------------------------------------------------
+
+    def get(self, path: str, max_age: Optional[float] = None) -> Any:
+        """Lit la valeur à `path` depuis le cache, le serveur, puis les écritures en attente"""
+        path = self._normalize(path)
+        max_age = self.cache_ttl if max_age is None else max_age
+
+        with self._store_lock:
+            for i in range(1, len(path.split("/")) + 1):
+                prefix = "/".join(path.split("/")[:i])
+                row = self._conn.execute("SELECT value FROM outbox WHERE path = ?", (prefix,)).fetchone()
+                if row is not None:
+                    # Lecture de ses propres écritures: la valeur locale fait foi
+                    return self._lookup(json.loads(row[0]), path[len(prefix) + 1:])
+
+        value = self._read_through(path, max_age)
+
+        with self._store_lock:
+            pending = self._conn.execute(
+                "SELECT path, value FROM outbox WHERE path > ? AND path < ? ORDER BY seq",
+                (path + "/", path + "0")
+            ).fetchall()
+        for child_path, child_value in pending:
+            value = self._assign(value, child_path[len(path) + 1:].split("/"), json.loads(child_value))
+        return value
+
+    def _read_through(self, path: str, max_age: float) -> Any:
+        """Sert la lecture depuis le cache s'il est frais, sinon depuis le serveur"""
+        with self._store_lock:
+            row = self._conn.execute(
+                "SELECT value, fetched_at FROM cache WHERE path = ?", (path,)
+            ).fetchone()
+        if row is not None and time.time() - row[1] < max_age:
+            return json.loads(row[0])
+
+        try:
+            with self._db_lock, metrics.span(FIREBASE_CALL_SECONDS, call="get"):
+                value = self.db.child(path).get(self._token()).val()
+            value = self._to_plain(value)
+        except Exception as e:
+            FIREBASE_CALL_ERRORS.inc(call="get")
+            self.logger.warning(f"Lecture hors-ligne de {path}: {str(e)}")
+            return json.loads(row[0]) if row is not None else None
+
+        with self._store_lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (path, value, fetched_at) VALUES (?, ?, ?)",
+                (path, json.dumps(value), time.time())
+            )
+            self._conn.commit()
+        return value
+
+    # ------------------------------------------------------------------
+    # Envoi en arrière-plan
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Démarre le thread d'envoi des écritures"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            return
+        self._stop_flag.clear()
+        self._flush_thread = threading.Thread(target=self._run_flusher, daemon=True)
+        self._flush_thread.start()
+        self.logger.info("Synchronisation hors-ligne démarrée")
+
+    def stop(self, flush: bool = True):
+        """Arrête le thread d'envoi, en tentant un dernier envoi si demandé"""
+        if self._flush_thread and self._flush_thread.is_alive():
+            self._stop_flag.set()
+            self._wake.set()
+            self._flush_thread.join()
+        if flush:
+            self.flush()
+        self.logger.info("Synchronisation hors-ligne arrêtée")
+
+    def close(self):
+        """Arrête la synchronisation et ferme la base locale"""
+        self.stop()
+        with self._store_lock:
+            self._conn.close()
+
+    def _run_flusher(self):
+        """Boucle d'envoi avec attente exponentielle en cas d'échec réseau"""
+        delay = self.flush_interval
+        while not self._stop_flag.is_set():
+            self._wake.wait(delay)
+            self._wake.clear()
+            if self._stop_flag.is_set():
+                break
+            ok = True
+            while ok and self.queue_depth() > 0 and not self._stop_flag.is_set():
+                ok = self.flush() is not None
+            delay = self.flush_interval if ok else min(delay * 2, 300.0)
+
+    def flush(self) -> Optional[int]:
+        """Envoie un lot d'écritures en attente. Retourne le nombre envoyé ou None en cas d'échec"""
+        with self._store_lock:
+            rows = self._conn.execute(
+                "SELECT path, value, seq FROM outbox ORDER BY seq LIMIT ?", (self.batch_size,)
+            ).fetchall()
+        self._writes_since_flush = 0
+        if not rows:
+            return 0
+
+        batch = {path: json.loads(value) for path, value, _ in rows}
+        started = time.perf_counter()
+        try:
+            with self._db_lock, metrics.span(FIREBASE_CALL_SECONDS, call="update"):
+                self.db.update(batch, self._token())
+        except Exception as e:
+            FIREBASE_CALL_ERRORS.inc(call="update")
+            self._stats["flush_failures"] += 1
+            self._stats["last_error"] = str(e)
+            self.logger.warning(f"Envoi différé de {len(rows)} écritures: {str(e)}")
+            return None
+
+        latency = time.perf_counter() - started
+        now = time.time()
+        with self._store_lock:
+            # Une écriture plus récente a pu remplacer la ligne pendant l'envoi:
+            # on ne supprime que les versions réellement envoyées.
+            self._conn.executemany(
+                "DELETE FROM outbox WHERE path = ? AND seq = ?",
+                [(path, seq) for path, _, seq in rows]
+            )
+            for path, value, _ in rows:
+                self._conn.execute(
+                    "DELETE FROM cache WHERE path > ? AND path < ?", (path + "/", path + "0")
+                )
+                parts = path.split("/")
+                self._conn.executemany(
+                    "DELETE FROM cache WHERE path = ?",
+                    [("/".join(parts[:i]),) for i in range(1, len(parts))]
+                )
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO cache (path, value, fetched_at) VALUES (?, ?, ?)",
+                    (path, value, now)
+                )
+            self._conn.commit()
+
+        self._stats["flushed_writes"] += len(rows)
+        self._stats["flush_count"] += 1
+        self._stats["last_flush_latency"] = latency
+        self._stats["last_flush_at"] = now
+        self._stats["last_error"] = None
+        self.logger.info(f"{len(rows)} écritures synchronisées en {latency * 1000:.1f} ms")
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Observabilité
+    # ------------------------------------------------------------------
+
+    def queue_depth(self) -> int:
+        """Retourne le nombre d'écritures en attente d'envoi"""
+        with self._store_lock:
+            return self._conn.execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Retourne la profondeur de la file et les statistiques d'envoi"""
+        with self._store_lock:
+            oldest = self._conn.execute("SELECT MIN(queued_at) FROM outbox").fetchone()[0]
+        stats = dict(self._stats)
+        stats["queue_depth"] = self.queue_depth()
+        stats["oldest_pending_age"] = time.time() - oldest if oldest else 0.0
+        return stats
+
+    # ------------------------------------------------------------------
+    # Utilitaires
+    # ------------------------------------------------------------------
+
+    def _token(self) -> Optional[str]:
+        return self.token_provider() if self.token_provider else None
+
+    @staticmethod
+    def _normalize(path: str) -> str:
+        return "/".join(part for part in str(path).split("/") if part)
+
+    @staticmethod
+    def _join(base: str, key: str) -> str:
+        key = OfflineSyncService._normalize(key)
+        return f"{base}/{key}" if base else key
+
+    @staticmethod
+    def _to_plain(value: Any) -> Any:
+        """Convertit les OrderedDict de pyrebase et valide la sérialisation JSON"""
+        return json.loads(json.dumps(value))
+
+    @staticmethod
+    def _lookup(value: Any, subpath: str) -> Any:
+        for part in (p for p in subpath.split("/") if p):
+            if not isinstance(value, dict):
+                return None
+            value = value.get(part)
+        return value
+
+    @staticmethod
+    def _assign(root: Any, parts: List[str], value: Any) -> Any:
+        """Écrit `value` sous `parts` dans `root` (None supprime) et retourne la nouvelle racine"""
+        if not parts:
+            return value
+        node = dict(root) if isinstance(root, dict) else {}
+        head, rest = parts[0], parts[1:]
+        child = OfflineSyncService._assign(node.get(head), rest, value)
+        if child is None or child == {}:
+            node.pop(head, None)
+        else:
+            node[head] = child
+        return node or None
@@ -0,0 +1,398 @@
+import os
+import json
+import uuid
+import zlib
+import base64
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple, Union
+from app.services.logging_service import get_logger
+from app.services.metrics_service import metrics
+
+SHADOW_PREFIX = "_pitr_log_"
+META_TABLE = "_pitr_meta"
+SEGMENT_SUFFIX = ".seg"
+# Horodatage local à la milliseconde, comparable aux dates ISO 8601 de l'application
+TIMESTAMP_SQL = "strftime('%Y-%m-%dT%H:%M:%f', 'now', 'localtime')"
+
+SHIP_SECONDS = metrics.histogram("pitr_ship_seconds", "Durée d'expédition d'un segment de modifications")
+CAPTURED_CHANGES = metrics.counter("pitr_changes_total", "Modifications capturées expédiées dans des segments")
+
+SELECT_USER_TABLES = (
+    "SELECT name, sql FROM sqlite_master WHERE type = 'table' "
+    "AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\' AND name NOT LIKE '\\_pitr\\_%' ESCAPE '\\'"
+)
+SELECT_SHADOW_TABLES = (
+    "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '\\_pitr\\_log\\_%' ESCAPE '\\'"
+)
+SELECT_CAPTURE_TRIGGERS = (
+    "SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE '\\_pitr\\_%' ESCAPE '\\'"
+)
+SELECT_HIGH_WATER = (
+    "SELECT name, seq FROM sqlite_sequence WHERE name LIKE '\\_pitr\\_log\\_%' ESCAPE '\\'"
+)
+CREATE_META = f"CREATE TABLE IF NOT EXISTS {META_TABLE} (key TEXT PRIMARY KEY, value TEXT)"
+SELECT_TIMELINE = f"SELECT value FROM {META_TABLE} WHERE key = 'timeline'"
+INSERT_TIMELINE = f"INSERT OR IGNORE INTO {META_TABLE} (key, value) VALUES ('timeline', ?)"
+UPDATE_TIMELINE = f"UPDATE {META_TABLE} SET value = ? WHERE key = 'timeline'"
+
+DateLike = Union[datetime, str]
+
+
+def _q(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _to_timestamp(value: DateLike) -> str:
+    """Normalise une date au format des horodatages capturés (milliseconde)"""
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    return value.isoformat(timespec="milliseconds")
+
+
+def _encode_bytes(value):
+    if isinstance(value, bytes):
+        return {"$b": base64.b64encode(value).decode("ascii")}
+    raise TypeError(f"Valeur non sérialisable: {type(value).__name__}")
+
+
+def _decode_bytes(obj):
+    if len(obj) == 1 and "$b" in obj:
+        return base64.b64decode(obj["$b"])
+    return obj
+
+
+class _Table:
+    """Colonnes et clé d'une table capturée"""
+
+    def __init__(self, conn: sqlite3.Connection, name: str, sql: Optional[str] = None):
+        self.name = name
+        info = conn.execute(f"PRAGMA table_info({_q(name)})").fetchall()
+        self.columns = [row[1] for row in info]
+        self.key = [row[1] for row in sorted((r for r in info if r[5]), key=lambda r: r[5])]
+        if sql is None:
+            row = conn.execute("SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)).fetchone()
+            sql = row[0] if row else ""
+        self.rowid = "WITHOUT ROWID" not in " ".join(sql.upper().split())
+
+    @property
+    def shadow(self) -> str:
+        return SHADOW_PREFIX + self.name
+
+
+class PitrService:
+    """Capture continue des modifications de la base entre deux sauvegardes.
+
+    Des déclencheurs recopient chaque ligne insérée, modifiée ou supprimée
+    dans une table `_pitr_log_<table>`, dans la transaction même de la
+    modification. Un thread expédie régulièrement ces lignes dans des
+    segments compressés (`data/pitr/*.seg`) puis les retire de la base.
+
+    Une sauvegarde contient les compteurs de ces tables: la restauration sait
+    donc exactement quelles modifications rejouer par-dessus. Chaque
+    restauration ouvre une nouvelle lignée (`timeline`) pour que les
+    modifications postérieures ne se mélangent pas à l'historique abandonné.
+    Les changements de schéma ne sont pas capturés: faire une sauvegarde
+    après une migration.
+    """
+
+    def __init__(self, db_path="data/database.db", segment_dir=None, interval: float = 5.0,
+                 retention_days: float = 7):
+        self.db_path = Path(db_path)
+        self.segment_dir = Path(segment_dir) if segment_dir else self.db_path.parent / "pitr"
+        self.interval = interval
+        self.retention_days = retention_days
+        self._stop_flag = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.logger = get_logger("PitrService", "pitr.log")
+
+    def _connect(self, db_path=None) -> sqlite3.Connection:
+        return sqlite3.connect(str(db_path or self.db_path), timeout=30)
+
+    # ------------------------------------------------------------------
+    # Installation de la capture
+    # ------------------------------------------------------------------
+
+    def install(self, db_path=None) -> List[str]:
+        """Installe (ou met à jour) la capture sur toutes les tables. Retourne les tables capturées"""
+        conn = self._connect(db_path)
+        try:
+            with conn:
+                conn.execute(CREATE_META)
+                conn.execute(INSERT_TIMELINE, (uuid.uuid4().hex,))
+                self._drop_triggers(conn)
+                tables = [_Table(conn, name, sql) for name, sql in conn.execute(SELECT_USER_TABLES).fetchall()]
+                for table in tables:
+                    self._create_shadow(conn, table)
+                    for statement in self._trigger_sql(table):
+                        conn.execute(statement)
+            return [t.name for t in tables]
+        finally:
+            conn.close()
+
+    def uninstall(self, db_path=None):
+        """Retire les déclencheurs de capture (les tables fantômes sont conservées)"""
+        conn = self._connect(db_path)
+        try:
+            with conn:
+                self._drop_triggers(conn)
+        finally:
+            conn.close()
+
+    @staticmethod
+    def _drop_triggers(conn: sqlite3.Connection):
+        for (name,) in conn.execute(SELECT_CAPTURE_TRIGGERS).fetchall():
+            conn.execute(f"DROP TRIGGER IF EXISTS {_q(name)}")
+
+    @staticmethod
+    def _create_shadow(conn: sqlite3.Connection, table: _Table):
+        existing = [row[1] for row in conn.execute(f"PRAGMA table_info({_q(table.shadow)})")]
+        if not existing:
+            columns = "".join(f", {_q(c)}" for c in table.columns)
+            # AUTOINCREMENT: les numéros ne sont jamais réutilisés après expédition
+            conn.execute(f"CREATE TABLE {_q(table.shadow)} (seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                         f"ts TEXT NOT NULL, op TEXT NOT NULL, rid INTEGER{columns})")
+            return
+        for column in table.columns:
+            if column not in existing:
+                conn.execute(f"ALTER TABLE {_q(table.shadow)} ADD COLUMN {_q(column)}")
+
+    @staticmethod
+    def _trigger_sql(table: _Table) -> List[str]:
+        shadow, name = _q(table.shadow), _q(table.name)
+        columns = ", ".join(_q(c) for c in table.columns)
+        new_values = ", ".join(f"NEW.{_q(c)}" for c in table.columns)
+        if table.rowid:
+            new_rid, old_rid, key_columns, old_key = "NEW.rowid", "OLD.rowid", "", ""
+            key_changed = "OLD.rowid IS NOT NEW.rowid"
+        else:
+            new_rid = old_rid = "NULL"
+            key_columns = "".join(f", {_q(c)}" for c in table.key)
+            old_key = "".join(f", OLD.{_q(c)}" for c in table.key)
+            key_changed = " OR ".join(f"OLD.{_q(c)} IS NOT NEW.{_q(c)}" for c in table.key)
+        def insert(op: str) -> str:
+            return (f"INSERT INTO {shadow} (ts, op, rid, {columns}) "
+                    f"VALUES ({TIMESTAMP_SQL}, '{op}', {new_rid}, {new_values});")
+
+        delete = f"INSERT INTO {shadow} (ts, op, rid{key_columns}) SELECT {TIMESTAMP_SQL}, 'D', {old_rid}{old_key}"
+        trigger = f"_pitr_trg_{table.name}"
+        return [
+            f"CREATE TRIGGER {_q(trigger + '_ins')} AFTER INSERT ON {name} BEGIN {insert('I')} END",
+            f"CREATE TRIGGER {_q(trigger + '_upd')} AFTER UPDATE ON {name} BEGIN "
+            f"{delete} WHERE {key_changed}; {insert('U')} END",
+            f"CREATE TRIGGER {_q(trigger + '_del')} AFTER DELETE ON {name} BEGIN {delete}; END",
+        ]
+
+    # ------------------------------------------------------------------
+    # Expédition des segments
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Installe la capture et démarre l'expédition périodique des segments"""
+        if self._thread and self._thread.is_alive():
+            return
+        tables = self.install()
+        self._stop_flag.clear()
+        self._thread = threading.Thread(target=self._run, name="PitrShipper", daemon=True)
+        self._thread.start()
+        self.logger.info(f"Capture des modifications démarrée sur {len(tables)} table(s)")
+
+    def stop(self, timeout: float = 10.0):
+        """Arrête l'expédition après un dernier segment"""
+        if not self._thread:
+            return
+        self._stop_flag.set()
+        self._thread.join(timeout)
+        self._thread = None
+        self.ship()
+
+    def _run(self):
+        while not self._stop_flag.wait(self.interval):
+            try:
+                self.ship()
+                self.prune()
+            except Exception as e:
+                self.logger.error(f"Erreur lors de l'expédition des modifications: {str(e)}")
+
+    def ship(self) -> Optional[Path]:
+        """Déplace les modifications capturées vers un segment compressé. Retourne son chemin"""
+        if not self.db_path.exists():
+            return None
+        conn = self._connect()
+        try:
+            with metrics.span(SHIP_SECONDS):
+                timeline = self._timeline(conn)
+                if timeline is None:
+                    return None
+                tables, high_water, count = {}, {}, 0
+                for (shadow,) in conn.execute(SELECT_SHADOW_TABLES).fetchall():
+                    cursor = conn.execute(f"SELECT * FROM {_q(shadow)} ORDER BY seq")
+                    rows = cursor.fetchall()
+                    if not rows:
+                        continue
+                    tables[shadow[len(SHADOW_PREFIX):]] = {
+                        "columns": [d[0] for d in cursor.description[4:]],
+                        "rows": [list(row) for row in rows],
+                    }
+                    high_water[shadow] = rows[-1][0]
+                    count += len(rows)
+                if not tables:
+                    return None
+
+                timestamps = [row[1] for table in tables.values() for row in table["rows"]]
+                segment = {"version": 1, "timeline": timeline, "start": min(timestamps),
+                           "end": max(timestamps), "tables": tables}
+                path = self._write_segment(segment)
+
+                # Les lignes capturées entre-temps ont un numéro plus grand et restent en place
+                with conn:
+                    for shadow, seq in high_water.items():
+                        conn.execute(f"DELETE FROM {_q(shadow)} WHERE seq <= ?", (seq,))
+            CAPTURED_CHANGES.inc(count)
+            return path
+        finally:
+            conn.close()
+
+    def _write_segment(self, segment: dict) -> Path:
+        self.segment_dir.mkdir(parents=True, exist_ok=True)
+        name = f"{datetime.now().strftime('%Y%m%dT%H%M%S%f')}_{segment['timeline'][:8]}{SEGMENT_SUFFIX}"
+        path = self.segment_dir / name
+        data = json.dumps(segment, default=_encode_bytes, separators=(",", ":")).encode("utf-8")
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            f.write(zlib.compress(data, 6))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+        return path
+
+    def prune(self):
+        """Supprime les segments plus anciens que la durée de rétention"""
+        if not self.segment_dir.exists():
+            return
+        limit = time.time() - self.retention_days * 86400
+        for path in self.segment_dir.glob("*" + SEGMENT_SUFFIX):
+            if path.stat().st_mtime < limit:
+                path.unlink()
+
+    @staticmethod
+    def read_segment(path: Path) -> dict:
+        with open(path, "rb") as f:
+            return json.loads(zlib.decompress(f.read()).decode("utf-8"), object_hook=_decode_bytes)
+
+    @staticmethod
+    def _timeline(conn: sqlite3.Connection) -> Optional[str]:
+        try:
+            row = conn.execute(SELECT_TIMELINE).fetchone()
+        except sqlite3.OperationalError:
+            return None
+        return row[0] if row else None
+
+    # ------------------------------------------------------------------
+    # Restauration à un instant donné
+    # ------------------------------------------------------------------
+
+    def replay(self, db_path, until: Optional[DateLike] = None, cancel_token=None) -> int:
+        """Rejoue sur une copie de sauvegarde les modifications capturées après elle.
+
+        Seules les modifications de la lignée de la sauvegarde et postérieures
+        à ses compteurs sont appliquées, table par table dans leur ordre de
+        capture, jusqu'à la dernière dont l'horodatage est <= `until`.
+        Retourne le nombre de modifications rejouées.
+        """
+        limit = _to_timestamp(until) if until is not None else None
+        conn = self._connect(db_path)
+        try:
+            timeline = self._timeline(conn)
+            if timeline is None:
+                self.logger.warning(f"Capture absente de la sauvegarde, aucune modification rejouée: {db_path}")
+                return 0
+            high_water = {name[len(SHADOW_PREFIX):]: seq for name, seq in conn.execute(SELECT_HIGH_WATER)}
+            changes = self._collect(timeline, high_water, limit, cancel_token)
+
+            count = 0
+            with conn:
+                self._drop_triggers(conn)
+                for table_name, rows in changes.items():
+                    if cancel_token is not None:
+                        cancel_token.check()
+                    count += self._apply(conn, table_name, rows)
+        finally:
+            conn.close()
+
+        self.fork_timeline(db_path)
+        self.install(db_path)
+        self.logger.info(f"{count} modification(s) rejouée(s) jusqu'à {limit or 'la dernière capture'}")
+        return count
+
+    def _collect(self, timeline: str, high_water: Dict[str, int], limit: Optional[str],
+                 cancel_token=None) -> Dict[str, List[Tuple[List[str], list]]]:
+        """Lit les segments de la lignée et retourne par table les lignes à rejouer, dans l'ordre"""
+        by_table: Dict[str, Dict[int, Tuple[List[str], list]]] = {}
+        paths = sorted(self.segment_dir.glob("*" + SEGMENT_SUFFIX)) if self.segment_dir.exists() else []
+        for path in paths:
+            if cancel_token is not None:
+                cancel_token.check()
+            segment = self.read_segment(path)
+            if segment["timeline"] != timeline or (limit is not None and segment["start"] > limit):
+                continue
+            for table_name, data in segment["tables"].items():
+                start = high_water.get(table_name, 0)
+                rows = by_table.setdefault(table_name, {})
+                for row in data["rows"]:
+                    # Un segment réexpédié après un arrêt brutal peut répéter des lignes
+                    if row[0] > start:
+                        rows[row[0]] = (data["columns"], row)
+
+        changes = {}
+        for table_name, rows in by_table.items():
+            ordered = []
+            for seq in sorted(rows):
+                if limit is not None and rows[seq][1][1] > limit:
+                    break
+                ordered.append(rows[seq])
+            if ordered:
+                changes[table_name] = ordered
+        return changes
+
+    def _apply(self, conn: sqlite3.Connection, table_name: str, rows: List[Tuple[List[str], list]]) -> int:
+        table = _Table(conn, table_name)
+        if not table.columns:
+            self.logger.warning(f"Table absente de la sauvegarde, modifications ignorées: {table_name}")
+            return 0
+        name = _q(table.name)
+        statements = {}
+        for columns, row in rows:
+            op, rid, values = row[2], row[3], dict(zip(columns, row[4:]))
+            if op == "D":
+                if table.rowid:
+                    conn.execute(f"DELETE FROM {name} WHERE rowid = ?", (rid,))
+                else:
+                    where = " AND ".join(f"{_q(c)} = ?" for c in table.key)
+                    conn.execute(f"DELETE FROM {name} WHERE {where}", [values[c] for c in table.key])
+                continue
+            present = tuple(c for c in columns if c in table.columns)
+            sql = statements.get(present)
+            if sql is None:
+                targets = (["rowid"] if table.rowid else []) + [_q(c) for c in present]
+                sql = statements[present] = (f"INSERT OR REPLACE INTO {name} ({', '.join(targets)}) "
+                                             f"VALUES ({', '.join('?' * len(targets))})")
+            params = ([rid] if table.rowid else []) + [values[c] for c in present]
+            conn.execute(sql, params)
+        return len(rows)
+
+    def fork_timeline(self, db_path=None):
+        """Ouvre une nouvelle lignée après une restauration et vide les captures déjà incluses"""
+        conn = self._connect(db_path)
+        try:
+            if self._timeline(conn) is None:
+                return
+            with conn:
+                conn.execute(UPDATE_TIMELINE, (uuid.uuid4().hex,))
+                for (shadow,) in conn.execute(SELECT_SHADOW_TABLES).fetchall():
+                    conn.execute(f"DELETE FROM {_q(shadow)}")
+        finally:
+            conn.close()
@@ -0,0 +1,538 @@
+import os
+import json
+import time
+import queue
+import shutil
+import hashlib
+import threading
+from collections import Counter, OrderedDict, deque
+from pathlib import Path
+from typing import Dict, List, Optional, Set
+from app.services.logging_service import get_logger
+from app.services.metrics_service import metrics
+from app.services.async_backup_service import PARTIAL_SUFFIX
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+REPLICATION_LAG = metrics.gauge("replication_lag_seconds", "Âge de la plus ancienne sauvegarde non répliquée")
+REPLICATION_BYTES = metrics.counter("replication_bytes_total",
+                                    "Octets envoyés aux cibles, ou évités par clonage de la réplique précédente")
+REPLICATION_RUNS = metrics.counter("replication_runs_total", "Réplications par cible et par résultat")
+
+CHUNK_SIZE = 1024 * 1024
+# Empreintes des blocs de chaque fichier d'une réplique (sert de base aux réplications suivantes)
+REPLICA_INDEX = ".replica.json"
+# ioctl Linux de clonage de fichier par partage de blocs (Btrfs, XFS)
+FICLONE = 0x40049409
+
+
+def _chunk_digest(data: bytes) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    """Clone `source` en `destination` sans copier les données. Retourne False si non supporté.
+
+    Une copie classique relirait et réécrirait chaque octet sur la cible,
+    plus coûteux qu'un envoi direct: dans ce cas, pas de clonage.
+    """
+    if fcntl is None:
+        return False
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+        return True
+    except OSError:
+        return False
+
+
+class ReplicationTarget:
+    """Destination secondaire (second disque, partage monté) recevant une copie des sauvegardes"""
+
+    def __init__(self, name: str, path, max_replicas: int = 5, queue_size: int = 16):
+        self.name = name
+        self.path = Path(path)
+        self.max_replicas = max_replicas
+        # File bornée: un bloc partagé en mémoire par cible au plus `queue_size` fois
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.lock = threading.Lock()
+        self.pending: "OrderedDict[str, float]" = OrderedDict()
+        self.resync: deque = deque()
+        self.catching_up = False
+        self.writer: Optional["_ReplicaWriter"] = None
+        self.stats = {
+            "replicated": 0, "failed": 0, "bytes_sent": 0, "bytes_reused": 0, "files_linked": 0,
+            "last_replicated": None, "last_duration": None, "last_error": None,
+        }
+
+    def replicas(self) -> List[Path]:
+        """Répliques terminées, de la plus ancienne à la plus récente"""
+        if not self.path.exists():
+            return []
+        dirs = [p for p in self.path.iterdir() if p.is_dir() and not p.name.endswith(PARTIAL_SUFFIX)]
+        return sorted(dirs, key=lambda p: (p.stat().st_mtime, p.name))
+
+    def file_index(self):
+        """Retourne (empreinte -> (chemin, blocs) pour toute la cible, fichiers de la dernière réplique)"""
+        by_hash, latest = {}, {}
+        for replica in self.replicas():
+            index_path = replica / REPLICA_INDEX
+            if not index_path.exists():
+                continue
+            with open(index_path, encoding="utf-8") as f:
+                files = json.load(f)
+            for rel, info in files.items():
+                by_hash[info["sha256"]] = (replica / rel, info["chunks"])
+            latest = {rel: (replica / rel, info["chunks"]) for rel, info in files.items()}
+        return by_hash, latest
+
+    def lag(self, now: Optional[float] = None) -> float:
+        """Âge en secondes de la plus ancienne sauvegarde pas encore répliquée sur cette cible"""
+        with self.lock:
+            if not self.pending:
+                return 0.0
+            oldest = next(iter(self.pending.values()))
+        return max(0.0, (now or time.time()) - oldest)
+
+
+class _ReplicaWriter:
+    """Construit une réplique dans `<cible>/<nom>.partial`.
+
+    Un fichier déjà présent sur la cible (même empreinte) est lié sans copie.
+    Un fichier modifié est cloné depuis la réplique précédente lorsque le
+    système de fichiers de la cible le permet, puis seuls les blocs
+    différents y sont écrits; sinon il est écrit en entier.
+    """
+
+    def __init__(self, target: ReplicationTarget, backup: Path, manifest_text: str, index):
+        self.target = target
+        self.backup = backup
+        self.name = backup.name
+        self.started = time.perf_counter()
+        self.manifest_text = manifest_text
+        self.by_hash, self.latest = index
+        self.staging = target.path / (self.name + PARTIAL_SUFFIX)
+        shutil.rmtree(self.staging, ignore_errors=True)
+        self.staging.mkdir(parents=True)
+        self.files: Dict[str, dict] = {}
+        self.sent = 0
+        self.reused = 0
+        self.linked = 0
+        self._out = None
+        self._size = 0
+        self._base_chunks: List[str] = []
+        self._chunks: List[str] = []
+        self._rel = None
+        self._sha = None
+
+    def link(self, rel: str, sha: str) -> bool:
+        """Lie un fichier identique déjà présent sur la cible. Retourne False s'il a disparu"""
+        source, chunks = self.by_hash[sha]
+        destination = self.staging / rel
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        try:
+            os.link(source, destination)
+        except FileNotFoundError:
+            return False
+        except OSError:
+            # Système de fichiers sans liens physiques (partage réseau): copie locale à la cible
+            try:
+                shutil.copy2(source, destination)
+            except FileNotFoundError:
+                return False
+        self.files[rel] = {"sha256": sha, "chunks": chunks}
+        self.linked += 1
+        return True
+
+    def open_file(self, rel: str, sha: str):
+        destination = self.staging / rel
+        destination.parent.mkdir(parents=True, exist_ok=True)
+        self._rel, self._sha, self._chunks, self._size = rel, sha, [], 0
+        base = self.latest.get(rel)
+        if base is not None and _reflink(base[0], destination):
+            # Clone de la version précédente: les blocs inchangés ne sont ni lus ni écrits
+            self._out = open(destination, "r+b")
+            self._base_chunks = base[1]
+        else:
+            self._out = open(destination, "wb")
+            self._base_chunks = []
+
+    def write_chunk(self, index: int, digest: str, data: bytes):
+        offset = index * CHUNK_SIZE
+        self._size = offset + len(data)
+        self._chunks.append(digest)
+        if index < len(self._base_chunks) and self._base_chunks[index] == digest:
+            self.reused += len(data)
+            return
+        self._out.seek(offset)
+        self._out.write(data)
+        self.sent += len(data)
+
+    def close_file(self):
+        # Fichier raccourci depuis la version clonée
+        self._out.truncate(self._size)
+        self._out.close()
+        self._out = None
+        self.files[self._rel] = {"sha256": self._sha, "chunks": self._chunks}
+
+    def commit(self) -> Path:
+        with open(self.staging / REPLICA_INDEX, "w", encoding="utf-8") as f:
+            json.dump(self.files, f)
+        with open(self.staging / "manifest.json", "w") as f:
+            f.write(self.manifest_text)
+        replica = self.target.path / self.name
+        shutil.rmtree(replica, ignore_errors=True)
+        self.staging.rename(replica)
+        return replica
+
+    def abort(self):
+        if self._out is not None:
+            self._out.close()
+            self._out = None
+        shutil.rmtree(self.staging, ignore_errors=True)
+
+
+class ReplicationService:
+    """Réplication des sauvegardes terminées vers des destinations secondaires.
+
+    Un thread de diffusion lit chaque sauvegarde une seule fois et distribue
+    les blocs aux cibles, chacune écrite par son propre thread. `replicate`
+    ne bloque jamais: la sauvegarde principale n'attend aucune cible. Une
+    cible trop lente (file pleine plus de `stall_timeout` s) est détachée du
+    flux commun et rattrape son retard seule, en relisant la source.
+    """
+
+    def __init__(self, targets: List[ReplicationTarget], stall_timeout: float = 2.0,
+                 retry_interval: float = 60.0):
+        self.targets = targets
+        self.stall_timeout = stall_timeout
+        self.retry_interval = retry_interval
+        self._jobs: queue.Queue = queue.Queue()
+        self._stop_flag = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # Sauvegardes programmées que le thread de diffusion n'a pas encore prises en charge
+        self._scheduled: Counter = Counter()
+        self._dispatch_lock = threading.Lock()
+        self.logger = get_logger("ReplicationService", "replication.log")
+
+    @classmethod
+    def from_config(cls, entries: List[dict]) -> Optional["ReplicationService"]:
+        """Crée le service à partir de la section `backup.replication_targets`, None si vide"""
+        if not entries:
+            return None
+        return cls([ReplicationTarget(**entry) for entry in entries])
+
+    # ------------------------------------------------------------------
+    # Cycle de vie
+    # ------------------------------------------------------------------
+
+    def start(self):
+        """Démarre le thread de diffusion et un thread d'écriture par cible"""
+        if self._threads:
+            return
+        self._stop_flag.clear()
+        for target in self.targets:
+            target.path.mkdir(parents=True, exist_ok=True)
+            # Répliques interrompues lors d'une exécution précédente
+            for leftover in target.path.glob("*" + PARTIAL_SUFFIX):
+                shutil.rmtree(leftover, ignore_errors=True)
+            self._threads.append(threading.Thread(
+                target=self._run_target, args=(target,), name=f"Replication-{target.name}", daemon=True))
+        self._threads.append(threading.Thread(target=self._run_dispatcher, name="ReplicationDispatcher",
+                                              daemon=True))
+        for thread in self._threads:
+            thread.start()
+        self.logger.info(f"Réplication démarrée vers {len(self.targets)} cible(s)")
+
+    def stop(self, timeout: float = 10.0) -> bool:
+        """Arrête la réplication; les répliques en cours sont abandonnées et reprises au prochain démarrage"""
+        self._stop_flag.set()
+        self._jobs.put(None)
+        deadline = time.monotonic() + timeout
+        for thread in self._threads:
+            thread.join(max(0.0, deadline - time.monotonic()))
+        stopped = not any(t.is_alive() for t in self._threads)
+        self._threads = []
+        self.logger.info("Réplication arrêtée")
+        return stopped
+
+    def replicate(self, backup_path: str):
+        """Programme la réplication d'une sauvegarde terminée (non bloquant)"""
+        backup = Path(backup_path)
+        with self._dispatch_lock:
+            self._scheduled[backup.name] += 1
+        self._jobs.put((backup, time.time()))
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Attend que toutes les sauvegardes programmées soient répliquées sur toutes les cibles"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            with self._dispatch_lock:
+                busy = bool(self._scheduled)
+            if not busy and all(not t.pending for t in self.targets):
+                return True
+            if deadline is not None and time.monotonic() > deadline:
+                return False
+            time.sleep(0.02)
+
+    def pending_backups(self) -> Set[str]:
+        """Noms des sauvegardes programmées ou pas encore répliquées sur au moins une cible"""
+        with self._dispatch_lock:
+            names = set(self._scheduled)
+        for target in self.targets:
+            with target.lock:
+                names.update(target.pending)
+        return names
+
+    def get_status(self) -> Dict[str, dict]:
+        """Retourne l'état de chaque cible (retard, sauvegardes en attente, octets)"""
+        now = time.time()
+        status = {}
+        for target in self.targets:
+            lag = target.lag(now)
+            REPLICATION_LAG.set(lag, target=target.name)
+            with target.lock:
+                status[target.name] = dict(target.stats, lag_seconds=lag, pending=list(target.pending),
+                                           catching_up=target.catching_up)
+        return status
+
+    # ------------------------------------------------------------------
+    # Diffusion: lecture unique de la source
+    # ------------------------------------------------------------------
+
+    def _run_dispatcher(self):
+        while not self._stop_flag.is_set():
+            job = self._jobs.get()
+            if job is None:
+                break
+            try:
+                self._dispatch(*job)
+            except Exception as e:
+                self.logger.error(f"Erreur de diffusion de {job[0]}: {str(e)}")
+            finally:
+                with self._dispatch_lock:
+                    self._scheduled[job[0].name] -= 1
+                    if self._scheduled[job[0].name] <= 0:
+                        del self._scheduled[job[0].name]
+
+    def _dispatch(self, backup: Path, finished_at: float):
+        name = backup.name
+        manifest_text = (backup / "manifest.json").read_text()
+        streaming = []
+        for target in self.targets:
+            with target.lock:
+                target.pending[name] = finished_at
+                if target.catching_up:
+                    target.resync.append((backup, 0.0))
+                    continue
+            streaming.append(target)
+        if not streaming:
+            return
+        try:
+            self._stream(backup, manifest_text, streaming)
+        except Exception:
+            # Source illisible en cours de diffusion: chaque cible retentera seule
+            for target in streaming:
+                if not target.catching_up:
+                    self._detach(target, backup, time.time() + self.retry_interval)
+            raise
+
+    def _stream(self, backup: Path, manifest_text: str, streaming: List[ReplicationTarget]):
+        checksums = self._checksums(backup, json.loads(manifest_text))
+        indexes = {t.name: t.file_index() for t in streaming}
+        attached = [t for t in streaming if self._send(t, backup, ("begin", backup, manifest_text, indexes[t.name]))]
+
+        for rel, sha in checksums.items():
+            receivers = []
+            for target in attached:
+                if sha not in indexes[target.name][0]:
+                    receivers.append(target)
+                elif not self._send(target, backup, ("link", rel, sha)):
+                    continue
+            attached = [t for t in attached if not t.catching_up]
+            receivers = [t for t in receivers if t in attached]
+            if not receivers:
+                continue
+
+            # Lecture unique: le même bloc est remis à toutes les cibles qui en ont besoin
+            receivers = [t for t in receivers if self._send(t, backup, ("file", rel, sha))]
+            with open(backup / rel, "rb") as f:
+                for index, data in enumerate(iter(lambda: f.read(CHUNK_SIZE), b"")):
+                    message = ("chunk", index, _chunk_digest(data), data)
+                    receivers = [t for t in receivers if self._send(t, backup, message)]
+                    if not receivers or self._stop_flag.is_set():
+                        break
+            for target in receivers:
+                self._send(target, backup, ("close",))
+            if self._stop_flag.is_set():
+                return
+
+        for target in attached:
+            if not target.catching_up:
+                self._send(target, backup, ("end", backup.name))
+
+    @staticmethod
+    def _checksums(backup: Path, manifest: dict) -> Dict[str, str]:
+        checksums = manifest.get("checksums")
+        if checksums:
+            return checksums
+        # Manifestes antérieurs sans empreintes: calculées à la lecture
+        result = {}
+        for rel in manifest.get("files", []):
+            digest = hashlib.sha256()
+            with open(backup / rel, "rb") as f:
+                for chunk in iter(lambda: f.read(CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            result[rel] = digest.hexdigest()
+        return result
+
+    def _send(self, target: ReplicationTarget, backup: Path, message) -> bool:
+        """Remet un message à une cible; la détache si sa file reste pleine"""
+        if target.catching_up:
+            return False
+        try:
+            target.queue.put(message, timeout=self.stall_timeout)
+            return True
+        except queue.Full:
+            self._detach(target, backup)
+            self.logger.warning(f"Cible {target.name} trop lente: détachée du flux pour {backup.name}")
+            return False
+
+    @staticmethod
+    def _detach(target: ReplicationTarget, backup: Path, not_before: float = 0.0):
+        """Retire la cible du flux commun; elle répliquera `backup` seule, en relisant la source"""
+        with target.lock:
+            target.catching_up = True
+            target.resync.append((backup, not_before))
+
+    # ------------------------------------------------------------------
+    # Écriture sur chaque cible
+    # ------------------------------------------------------------------
+
+    def _run_target(self, target: ReplicationTarget):
+        while not self._stop_flag.is_set():
+            try:
+                message = target.queue.get(timeout=0.1)
+            except queue.Empty:
+                self._catch_up(target)
+                REPLICATION_LAG.set(target.lag(), target=target.name)
+                continue
+            try:
+                self._handle(target, message)
+            except Exception as e:
+                self._fail(target, target.writer.backup if target.writer else None, e)
+        if target.writer is not None:
+            target.writer.abort()
+            target.writer = None
+
+    def _handle(self, target: ReplicationTarget, message):
+        kind = message[0]
+        if kind == "begin":
+            if target.writer is not None:
+                target.writer.abort()
+            _, backup, manifest_text, index = message
+            target.writer = _ReplicaWriter(target, backup, manifest_text, index)
+            return
+        writer = target.writer
+        if writer is None:
+            return
+        if kind == "link":
+            if not writer.link(message[1], message[2]):
+                raise FileNotFoundError(f"Fichier de base disparu de la cible: {message[1]}")
+        elif kind == "file":
+            writer.open_file(message[1], message[2])
+        elif kind == "chunk":
+            writer.write_chunk(message[1], message[2], message[3])
+        elif kind == "close":
+            writer.close_file()
+        elif kind == "end":
+            self._commit(target, writer)
+            target.writer = None
+
+    def _catch_up(self, target: ReplicationTarget):
+        """Réplique seule, en relisant la source, les sauvegardes pour lesquelles la cible a été détachée"""
+        with target.lock:
+            if not target.resync:
+                target.catching_up = False
+                return
+            backup, not_before = target.resync[0]
+            if not_before > time.time():
+                return
+            target.resync.popleft()
+        if target.writer is not None and target.writer.name == backup.name:
+            target.writer.abort()
+            target.writer = None
+        try:
+            self._replicate_direct(target, backup)
+        except Exception as e:
+            self._fail(target, backup, e)
+
+    def _replicate_direct(self, target: ReplicationTarget, backup: Path):
+        if not (backup / "manifest.json").exists():
+            with target.lock:
+                target.pending.pop(backup.name, None)
+            self.logger.error(f"Sauvegarde source disparue avant sa réplication sur {target.name}: {backup}")
+            return
+        manifest_text = (backup / "manifest.json").read_text()
+        checksums = self._checksums(backup, json.loads(manifest_text))
+        writer = _ReplicaWriter(target, backup, manifest_text, target.file_index())
+        try:
+            for rel, sha in checksums.items():
+                if self._stop_flag.is_set():
+                    raise InterruptedError("Arrêt de la réplication")
+                if sha in writer.by_hash and writer.link(rel, sha):
+                    continue
+                writer.open_file(rel, sha)
+                with open(backup / rel, "rb") as f:
+                    for index, data in enumerate(iter(lambda: f.read(CHUNK_SIZE), b"")):
+                        writer.write_chunk(index, _chunk_digest(data), data)
+                writer.close_file()
+        except BaseException:
+            writer.abort()
+            raise
+        self._commit(target, writer)
+
+    def _commit(self, target: ReplicationTarget, writer: _ReplicaWriter):
+        replica = writer.commit()
+        duration = time.perf_counter() - writer.started
+        self._rotate(target)
+        with target.lock:
+            target.pending.pop(writer.name, None)
+            target.stats["replicated"] += 1
+            target.stats["bytes_sent"] += writer.sent
+            target.stats["bytes_reused"] += writer.reused
+            target.stats["files_linked"] += writer.linked
+            target.stats["last_replicated"] = writer.name
+            target.stats["last_duration"] = duration
+            target.stats["last_error"] = None
+        REPLICATION_BYTES.inc(writer.sent, target=target.name, kind="sent")
+        REPLICATION_BYTES.inc(writer.reused, target=target.name, kind="reused")
+        REPLICATION_RUNS.inc(target=target.name, status="success")
+        REPLICATION_LAG.set(target.lag(), target=target.name)
+        self.logger.info(
+            f"Sauvegarde répliquée sur {target.name}: {replica}",
+            extra={"target": target.name, "bytes_sent": writer.sent, "bytes_reused": writer.reused,
+                   "files_linked": writer.linked, "duration_ms": round(duration * 1000, 1)}
+        )
+
+    def _fail(self, target: ReplicationTarget, backup: Optional[Path], error: Exception):
+        if target.writer is not None:
+            target.writer.abort()
+            target.writer = None
+        REPLICATION_RUNS.inc(target=target.name, status="error")
+        with target.lock:
+            target.stats["failed"] += 1
+            target.stats["last_error"] = str(error)
+        # Nouvelle tentative différée, par lecture directe de la source
+        if backup is not None and not self._stop_flag.is_set():
+            self._detach(target, backup, time.time() + self.retry_interval)
+        self.logger.error(f"Erreur de réplication sur {target.name}: {str(error)}")
+
+    @staticmethod
+    def _rotate(target: ReplicationTarget):
+        replicas = target.replicas()
+        for replica in replicas[:max(0, len(replicas) - target.max_replicas)]:
+            shutil.rmtree(replica, ignore_errors=True)
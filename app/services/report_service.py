@@ -0,0 +1,147 @@
+import threading
+from collections import deque
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+REPORT_STATUSES = {
+    "pending": "En attente",
+    "approved": "Validé",
+    "rejected": "Rejeté",
+}
+
+
+def parse_day_range(date_from: str, date_to: str) -> Tuple[Optional[datetime], Optional[datetime]]:
+    """Convertit des jours saisis (AAAA-MM-JJ, bornes incluses) en bornes de requête.
+
+    La borne de fin des requêtes est exclusive: le jour de fin saisi devient
+    le lendemain à minuit pour inclure tous les rapports de ce jour.
+    Lève ValueError si une date est invalide.
+    """
+    start = datetime.strptime(date_from.strip(), "%Y-%m-%d") if date_from.strip() else None
+    end = datetime.strptime(date_to.strip(), "%Y-%m-%d") + timedelta(days=1) if date_to.strip() else None
+    return start, end
+
+
+class ReportPager:
+    """Fenêtre glissante de pages de rapports pour une liste virtualisée.
+
+    Seules `max_pages` pages sont gardées en mémoire: charger une page en bas
+    évince la plus ancienne en haut, et inversement. La mémoire reste donc
+    constante quelle que soit la taille de l'historique parcouru.
+
+    Les méthodes `fetch_*` n'exécutent que la requête et peuvent tourner dans un
+    thread de préchargement; les méthodes `apply_*` modifient la fenêtre et
+    doivent être appelées depuis le thread de l'interface.
+    """
+
+    def __init__(self, database, page_size: int = 50, max_pages: int = 6,
+                 prefetch_margin: float = 0.25):
+        self.database = database
+        self.page_size = page_size
+        self.max_pages = max_pages
+        self.prefetch_margin = prefetch_margin
+        self.filters: Dict[str, Any] = {}
+        self.pages: deque = deque()
+        self.has_next = True
+        self.has_previous = False
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        """Lignes actuellement chargées, dans l'ordre d'affichage"""
+        return [row for page in self.pages for row in page]
+
+    def __len__(self):
+        return sum(len(page) for page in self.pages)
+
+    def set_filters(self, role: Optional[str] = None, status: Optional[str] = None,
+                    date_from=None, date_to=None) -> List[Dict[str, Any]]:
+        """Réinitialise la fenêtre avec de nouveaux filtres et charge la première page"""
+        with self._lock:
+            self.filters = {"role": role, "status": status, "date_from": date_from, "date_to": date_to}
+            self.pages.clear()
+            self.has_next = True
+            self.has_previous = False
+            self._generation += 1
+        self.apply_next(self.fetch_next())
+        return self.rows
+
+    # ------------------------------------------------------------------
+    # Requêtes (tout thread)
+    # ------------------------------------------------------------------
+
+    def fetch_next(self):
+        """Récupère la page suivant la dernière ligne chargée"""
+        with self._lock:
+            generation = self._generation
+            after = self._key(self.pages[-1][-1]) if self.pages else None
+        rows = self.database.get_reports_page(after=after, limit=self.page_size, **self.filters)
+        return generation, after, rows
+
+    def fetch_previous(self):
+        """Récupère la page précédant la première ligne chargée"""
+        with self._lock:
+            generation = self._generation
+            before = self._key(self.pages[0][0]) if self.pages else None
+        if before is None:
+            return generation, None, []
+        rows = self.database.get_reports_page(before=before, limit=self.page_size, **self.filters)
+        return generation, before, rows
+
+    # ------------------------------------------------------------------
+    # Mise à jour de la fenêtre (thread de l'interface)
+    # ------------------------------------------------------------------
+
+    def apply_next(self, fetched) -> int:
+        """Ajoute la page en bas de la fenêtre. Retourne le nombre de lignes évincées en haut"""
+        generation, after, rows = fetched
+        with self._lock:
+            current = self._key(self.pages[-1][-1]) if self.pages else None
+            if generation != self._generation or after != current:
+                return 0  # résultat périmé (filtres changés ou page déjà appliquée)
+            self.has_next = len(rows) == self.page_size
+            if not rows:
+                return 0
+            self.pages.append(rows)
+            evicted = 0
+            if len(self.pages) > self.max_pages:
+                evicted = len(self.pages.popleft())
+                self.has_previous = True
+            return evicted
+
+    def apply_previous(self, fetched) -> int:
+        """Ajoute la page en haut de la fenêtre. Retourne le nombre de lignes ajoutées"""
+        generation, before, rows = fetched
+        with self._lock:
+            current = self._key(self.pages[0][0]) if self.pages else None
+            if generation != self._generation or before is None or before != current:
+                return 0
+            self.has_previous = len(rows) == self.page_size
+            if not rows:
+                return 0
+            self.pages.appendleft(rows)
+            if len(self.pages) > self.max_pages:
+                self.pages.pop()
+                self.has_next = True
+            return len(rows)
+
+    def load_next(self) -> int:
+        """Récupère et applique la page suivante de façon synchrone"""
+        return self.apply_next(self.fetch_next())
+
+    def load_previous(self) -> int:
+        """Récupère et applique la page précédente de façon synchrone"""
+        return self.apply_previous(self.fetch_previous())
+
+    def wants(self, position: float) -> Optional[str]:
+        """Indique la page à précharger pour une position de défilement (0 = haut, 1 = bas)"""
+        if position >= 1 - self.prefetch_margin and self.has_next:
+            return "next"
+        if position <= self.prefetch_margin and self.has_previous:
+            return "previous"
+        return None
+
+    @staticmethod
+    def _key(row: Dict[str, Any]):
+        return (row["created_at"], row["id"])
@@ -0,0 +1,68 @@
+from typing import Dict, FrozenSet, List, Optional
+
+# Permission requise par élément d'interface (None = visible par tous)
+UI_PERMISSIONS = {
+    # Actions rapides
+    "create_report": "operations.edit",
+    "view_reports": "operations.view",
+    "validate_reports": "reports.validate",
+    # Cartes des modules
+    "operations_card": "operations.view",
+    "personnel_card": "personnel.view",
+    "maintenance_card": "maintenance.view",
+    # Widgets du dashboard
+    "active_flights": "operations.view",
+    "maintenance_alerts": "maintenance.view",
+    "weather": None,
+}
+
+
+class RoleService:
+    """Résolution des rôles et éléments d'interface visibles par rôle.
+
+    Les éléments visibles sont calculés une seule fois par rôle à partir des
+    permissions de la configuration; un changement de rôle n'est plus qu'une
+    consultation de dictionnaire.
+    """
+
+    def __init__(self, roles: Dict[str, Dict], aliases: Optional[Dict[str, str]] = None,
+                 ui_permissions: Optional[Dict[str, Optional[str]]] = None):
+        self.roles = roles
+        self.ui_permissions = ui_permissions if ui_permissions is not None else UI_PERMISSIONS
+
+        self._lookup = {}
+        for key, role in roles.items():
+            self._lookup[key.casefold()] = key
+            self._lookup[role.get("name", key).casefold()] = key
+        for alias, key in (aliases or {}).items():
+            if key not in roles:
+                raise ValueError(f"L'alias '{alias}' désigne un rôle inconnu: {key}")
+            self._lookup[alias.casefold()] = key
+
+        self.visible: Dict[str, FrozenSet[str]] = {
+            key: frozenset(
+                element for element, required in self.ui_permissions.items()
+                if self._grants(role.get("permissions", []), required)
+            )
+            for key, role in roles.items()
+        }
+
+    @staticmethod
+    def _grants(permissions: List[str], required: Optional[str]) -> bool:
+        return required is None or "all" in permissions or required in permissions
+
+    def resolve(self, name: str) -> Optional[str]:
+        """Retourne la clé de rôle de la configuration pour une clé, un nom ou un alias"""
+        return self._lookup.get(str(name).strip().casefold())
+
+    def get_display_name(self, role: str) -> str:
+        """Retourne le nom affiché d'un rôle"""
+        return self.roles.get(role, {}).get("name", role)
+
+    def get_visible(self, role: Optional[str]) -> FrozenSet[str]:
+        """Retourne les éléments d'interface visibles pour un rôle"""
+        return self.visible.get(role, frozenset())
+
+    def is_allowed(self, role: Optional[str], element: str) -> bool:
+        """Indique si un rôle peut voir ou utiliser un élément d'interface"""
+        return element in self.get_visible(role)
@@ -1,10 +1,13 @@
 import schedule
-import time
 import threading
-import logging
-from pathlib import Path
 from typing import Optional
 from datetime import datetime
+from app.services.logging_service import get_logger
+from app.services.backup_service import CancellationToken
+from app.services.metrics_service import metrics
+
+JOB_LAG_SECONDS = metrics.histogram("scheduler_job_lag_seconds", "Retard des tâches planifiées sur leur heure prévue")
+JOB_RUNS = metrics.counter("scheduler_job_runs_total", "Tâches planifiées exécutées par résultat")
 
 class SchedulerService:
     """Service de planification des tâches automatiques"""
@@ -13,28 +16,32 @@ class SchedulerService:
         self.setup_logging()
         self._scheduler_thread: Optional[threading.Thread] = None
         self._stop_flag = threading.Event()
+        self._cancel_token = CancellationToken()
         self._backup_service = None
+        self._replication = None
+        self._due_dates = None
         
     def setup_logging(self):
         """Configure le système de logs"""
-        log_dir = Path("logs")
-        log_dir.mkdir(exist_ok=True)
-        
-        logging.basicConfig(
-            filename=log_dir / "scheduler.log",
-            level=logging.INFO,
-            format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        self.logger = logging.getLogger("SchedulerService")
+        self.logger = get_logger("SchedulerService", "scheduler.log")
     
-    def start(self, backup_service):
-        """Démarre le planificateur en arrière-plan"""
+    def start(self, backup_service, replication=None, due_dates=None):
+        """Démarre le planificateur en arrière-plan.
+        
+        Si `replication` est fourni, chaque sauvegarde réussie lui est transmise
+        pour être copiée vers les destinations secondaires. Si `due_dates`
+        (DueDateService) est fourni, les échéances sont signalées à leur heure
+        exacte, hors de la boucle à la minute des sauvegardes.
+        """
         if self._scheduler_thread and self._scheduler_thread.is_alive():
             self.logger.warning("Le planificateur est déjà en cours d'exécution")
             return
             
         self._stop_flag.clear()
+        self._cancel_token = CancellationToken()
         self._backup_service = backup_service
+        self._replication = replication
+        self._due_dates = due_dates
         
         # Planifie une sauvegarde quotidienne à 3h du matin
         schedule.every().day.at("03:00").do(self._run_backup, backup_service)
@@ -46,36 +53,83 @@ class SchedulerService:
         self._scheduler_thread.daemon = True  # Le thread s'arrêtera quand le programme principal s'arrête
         self._scheduler_thread.start()
         
+        if due_dates is not None:
+            due_dates.start(self._on_due_alert)
+        
         self.logger.info("Planificateur démarré")
         
-    def stop(self):
-        """Arrête le planificateur"""
+    def stop(self, timeout: Optional[float] = 30.0) -> bool:
+        """Arrête le planificateur en annulant la sauvegarde en cours.
+        
+        Retourne False si le thread ne s'est pas arrêté dans le délai imparti.
+        """
         if not self._scheduler_thread or not self._scheduler_thread.is_alive():
-            return
+            return True
             
         self._stop_flag.set()
-        self._scheduler_thread.join()
+        self._cancel_token.cancel()
+        if self._due_dates is not None:
+            self._due_dates.stop()
+        self._scheduler_thread.join(timeout)
         schedule.clear()
+        if self._scheduler_thread.is_alive():
+            self.logger.warning(f"Le planificateur ne s'est pas arrêté en {timeout} s")
+            return False
         self.logger.info("Planificateur arrêté")
+        return True
         
     def _run_scheduler(self):
         """Boucle principale du planificateur"""
         while not self._stop_flag.is_set():
+            self._record_lag()
             schedule.run_pending()
-            time.sleep(60)  # Vérifie toutes les minutes
+            self._stop_flag.wait(60)  # Vérifie toutes les minutes
+            
+    def _record_lag(self):
+        """Mesure le retard des tâches sur le point d'être exécutées"""
+        if not metrics.enabled:
+            return
+        now = datetime.now()
+        for job in schedule.jobs:
+            if job.should_run:
+                JOB_LAG_SECONDS.observe((now - job.next_run).total_seconds())
             
     def _run_backup(self, backup_service):
         """Exécute une sauvegarde et gère les erreurs"""
         try:
             self.logger.info("Démarrage de la sauvegarde planifiée")
-            backup_path = backup_service.create_backup()
+            backup_path = backup_service.create_backup(cancel_token=self._cancel_token)
             
             if backup_path:
+                JOB_RUNS.inc(job="backup", status="success")
                 self.logger.info(f"Sauvegarde planifiée réussie: {backup_path}")
-                # Rotation des sauvegardes pour garder les 5 plus récentes
-                backup_service.rotate_backups(max_backups=5)
+                keep = set()
+                if self._replication:
+                    # Non bloquant: les cibles lentes ne retardent pas la sauvegarde principale
+                    self._replication.replicate(backup_path)
+                    keep = self._replication.pending_backups()
+                # Rotation des sauvegardes pour garder les 5 plus récentes, sans
+                # supprimer une source que la réplication n'a pas encore copiée
+                backup_service.rotate_backups(max_backups=5, keep=keep)
+            elif self._cancel_token.cancelled:
+                JOB_RUNS.inc(job="backup", status="cancelled")
+                self.logger.info("Sauvegarde planifiée annulée par l'arrêt du planificateur")
             else:
+                JOB_RUNS.inc(job="backup", status="error")
                 self.logger.error("Échec de la sauvegarde planifiée")
                 
         except Exception as e:
+            JOB_RUNS.inc(job="backup", status="error")
             self.logger.error(f"Erreur lors de la sauvegarde planifiée: {str(e)}")
+            
+    def _on_due_alert(self, items, lead):
+        """Journalise les échéances atteintes (ou à `lead` de l'être)"""
+        JOB_RUNS.inc(job="due_alert", status="success")
+        lead_days = lead.total_seconds() / 86400
+        when = "atteinte" if not lead_days else f"dans {lead_days:g} jours"
+        for item in items:
+            self.logger.warning(
+                f"Échéance {when}: {item['source']} {item['label']} ({item['subject_type']} {item['subject_id']})",
+                extra={"source": item["source"], "source_id": item["source_id"],
+                       "due_at": item["due_at"], "lead_days": lead_days}
+            )
@@ -0,0 +1,143 @@
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional
+from app.services.logging_service import get_logger
+
+# Chaque règle est une seule requête ensembliste sur la table temporaire
+# _pending (tous les rapports à valider). Elle retourne (report_id, détail)
+# pour chaque rapport en échec: aucun aller-retour par rapport.
+RULES = {
+    "checklist": (
+        """
+        SELECT p.id, rs.step
+        FROM _pending p
+        JOIN reports r ON r.id = p.id
+        JOIN _required_steps rs ON rs.workflow = r.workflow
+        LEFT JOIN report_steps s ON s.report_id = r.id AND s.step = rs.step
+        WHERE s.report_id IS NULL
+        """,
+        "Étape de checklist manquante: {}",
+    ),
+    "flight_reference": (
+        """
+        SELECT p.id, r.workflow
+        FROM _pending p
+        JOIN reports r ON r.id = p.id
+        WHERE r.workflow = 'flight_operation'
+          AND (r.flight_id IS NULL OR NOT EXISTS (SELECT 1 FROM flights f WHERE f.id = r.flight_id))
+        """,
+        "Aucun vol associé au rapport ({})",
+    ),
+    "pilot_currency": (
+        """
+        SELECT p.id, pe.name
+        FROM _pending p
+        JOIN reports r ON r.id = p.id
+        JOIN flights f ON f.id = r.flight_id
+        JOIN personnel pe ON pe.id = f.pilot_id
+        WHERE pe.currency_expires_at IS NULL OR pe.currency_expires_at < f.started_at
+        """,
+        "Qualification du pilote expirée au moment du vol: {}",
+    ),
+    "aircraft_status": (
+        """
+        SELECT p.id, a.registration
+        FROM _pending p
+        JOIN reports r ON r.id = p.id
+        JOIN flights f ON f.id = r.flight_id
+        JOIN aircraft a ON a.id = f.aircraft_id
+        WHERE a.status != 'serviceable'
+           OR EXISTS (
+               SELECT 1 FROM maintenance_records m
+               WHERE m.aircraft_id = a.id AND m.status = 'open' AND m.due_at < f.started_at
+           )
+        """,
+        "Aéronef non navigable ou maintenance échue: {}",
+    ),
+}
+
+
+class ValidationService:
+    """Validation en lot des rapports en attente"""
+
+    def __init__(self, database, workflows: Optional[Dict[str, List[str]]] = None,
+                 rules: Optional[Iterable[str]] = None):
+        self.database = database
+        self.workflows = workflows or {}
+        # Aucune règle configurée: toutes les règles, jamais d'approbation sans vérification
+        self.rules = list(rules) if rules else list(RULES)
+        self.logger = get_logger("ValidationService", "validation.log")
+
+        unknown = [name for name in self.rules if name not in RULES]
+        if unknown:
+            raise ValueError(f"Règles de validation inconnues: {', '.join(unknown)}")
+
+    def validate_pending(self, approve: bool = True, role: Optional[str] = None) -> Dict[str, Any]:
+        """Vérifie tous les rapports en attente et approuve ceux qui passent toutes les règles.
+
+        Les vérifications et les approbations sont faites dans une même
+        transaction: un rapport modifié entre-temps ne peut pas être approuvé
+        sur la base d'une vérification périmée.
+        """
+        started = time.perf_counter()
+        conn = self.database.connect()
+        failures: Dict[int, List[str]] = defaultdict(list)
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._prepare(conn, role)
+            checked = conn.execute("SELECT COUNT(*) FROM _pending").fetchone()[0]
+
+            for name in self.rules:
+                sql, message = RULES[name]
+                for report_id, detail in conn.execute(sql):
+                    failures[report_id].append(message.format(detail))
+
+            approved = 0
+            if approve:
+                conn.executemany("INSERT OR IGNORE INTO _failed (id) VALUES (?)",
+                                 ((report_id,) for report_id in failures))
+                approved = conn.execute(
+                    "UPDATE reports SET status = 'approved', validated_at = ? "
+                    "WHERE id IN (SELECT id FROM _pending EXCEPT SELECT id FROM _failed)",
+                    (datetime.now().isoformat(timespec="seconds"),)
+                ).rowcount
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self.logger.error(f"Erreur lors de la validation des rapports: {str(e)}")
+            raise
+
+        duration = time.perf_counter() - started
+        self.logger.info(
+            f"Validation: {checked} rapports vérifiés, {approved} approuvés, "
+            f"{len(failures)} en échec en {duration * 1000:.0f} ms"
+        )
+        return {
+            "checked": checked,
+            "approved": approved,
+            "failed": dict(failures),
+            "duration": duration,
+        }
+
+    def _prepare(self, conn, role: Optional[str]):
+        """Remplit les tables temporaires des rapports à vérifier et des étapes requises"""
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _pending (id INTEGER PRIMARY KEY)")
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _failed (id INTEGER PRIMARY KEY)")
+        conn.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS _required_steps ("
+            "workflow TEXT NOT NULL, step TEXT NOT NULL, PRIMARY KEY (workflow, step))"
+        )
+        for table in ("_pending", "_failed", "_required_steps"):
+            conn.execute(f"DELETE FROM temp.{table}")
+
+        if role:
+            conn.execute("INSERT INTO _pending SELECT id FROM reports WHERE status = 'pending' AND role = ?",
+                         (role,))
+        else:
+            conn.execute("INSERT INTO _pending SELECT id FROM reports WHERE status = 'pending'")
+        conn.executemany(
+            "INSERT OR IGNORE INTO _required_steps (workflow, step) VALUES (?, ?)",
+            ((workflow, step) for workflow, steps in self.workflows.items() for step in steps)
+        )
@@ -0,0 +1,248 @@
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from app.services.logging_service import get_logger
+
+ADVANCE_HISTORY = """
+INSERT INTO workflow_history (instance_id, from_step, to_step, changed_at)
+SELECT i.id, i.current_step, t.to_step, :now
+FROM _advance a
+JOIN workflow_instances i ON i.id = a.id
+JOIN workflow_transitions t ON t.workflow = i.workflow AND t.from_step = i.current_step
+WHERE i.status = 'active' AND (:from_step IS NULL OR i.current_step = :from_step)
+"""
+
+# La table de transitions compilée donne l'étape suivante; une étape finale
+# (to_step NULL) fait passer l'instance au statut 'completed'.
+ADVANCE_INSTANCES = """
+UPDATE workflow_instances
+SET current_step = COALESCE(
+        (SELECT t.to_step FROM workflow_transitions t
+         WHERE t.workflow = workflow_instances.workflow AND t.from_step = workflow_instances.current_step),
+        current_step),
+    status = CASE WHEN (SELECT t.to_step FROM workflow_transitions t
+                        WHERE t.workflow = workflow_instances.workflow
+                          AND t.from_step = workflow_instances.current_step) IS NULL
+                  THEN 'completed' ELSE 'active' END,
+    updated_at = :now
+WHERE status = 'active'
+  AND id IN (SELECT id FROM _advance)
+  AND (:from_step IS NULL OR current_step = :from_step)
+  AND EXISTS (SELECT 1 FROM workflow_transitions t
+              WHERE t.workflow = workflow_instances.workflow AND t.from_step = workflow_instances.current_step)
+"""
+
+# Instances actives dont l'étape courante n'existe plus dans la table compilée
+ORPHANED_INSTANCES = """
+SELECT i.workflow, i.current_step, COUNT(*)
+FROM workflow_instances i
+WHERE i.status = 'active'
+  AND NOT EXISTS (SELECT 1 FROM workflow_transitions t
+                  WHERE t.workflow = i.workflow AND t.from_step = i.current_step)
+GROUP BY i.workflow, i.current_step
+"""
+
+# Prochain identifiant: AUTOINCREMENT ne réattribue jamais un identifiant supprimé
+NEXT_INSTANCE_ID = (
+    "SELECT COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'workflow_instances'), 0) + 1"
+)
+
+
+def compile_workflows(definitions: Dict[str, List[str]]) -> Dict[str, Dict[str, Optional[str]]]:
+    """Compile les définitions {workflow: [étapes]} en tables {workflow: {étape: suivante}}"""
+    transitions = {}
+    for workflow, steps in definitions.items():
+        if not steps:
+            raise ValueError(f"Le workflow '{workflow}' ne contient aucune étape")
+        if len(set(steps)) != len(steps):
+            raise ValueError(f"Le workflow '{workflow}' contient des étapes en double")
+        transitions[workflow] = {step: nxt for step, nxt in zip(steps, list(steps[1:]) + [None])}
+    return transitions
+
+
+class WorkflowService:
+    """Moteur de workflows (opérations de vol, maintenance, formation).
+
+    Les définitions de la configuration sont compilées une fois en table de
+    transitions, copiée en base pour que les avancements se fassent en une
+    seule requête pour tout un lot d'instances.
+    """
+
+    def __init__(self, database, workflows: Dict[str, List[str]],
+                 step_map: Optional[Dict[str, Dict[str, Optional[str]]]] = None, strict: bool = True):
+        self.database = database
+        self.transitions = compile_workflows(workflows)
+        self.first_steps = {workflow: steps[0] for workflow, steps in workflows.items()}
+        self.logger = get_logger("WorkflowService", "workflow.log")
+        self._store_transitions(step_map or {}, strict)
+
+    def _store_transitions(self, step_map: Dict[str, Dict[str, Optional[str]]], strict: bool):
+        """Remplace la table de transitions en base par la version compilée.
+
+        Les instances actives à une étape, ou d'un workflow, supprimés de la
+        configuration sont déplacées selon `step_map` ({workflow: {ancienne:
+        nouvelle}}); une nouvelle étape None clôt l'instance (statut
+        'cancelled'). Chaque cas ajoute une ligne d'historique. Les instances
+        restantes sans correspondance font refuser la modification
+        (ValueError, ancienne table conservée) si `strict`; sinon elles sont
+        signalées et laissées telles quelles, aucun avancement ne les touchant.
+        """
+        for workflow, mapping in step_map.items():
+            for new_step in mapping.values():
+                if new_step is not None:
+                    self._check_step(workflow, new_step)
+
+        conn = self.database.connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM workflow_transitions")
+            conn.executemany(
+                "INSERT INTO workflow_transitions (workflow, from_step, to_step) VALUES (?, ?, ?)",
+                [(workflow, step, nxt)
+                 for workflow, table in self.transitions.items()
+                 for step, nxt in table.items()]
+            )
+            now = _now()
+            unmapped = []
+            for workflow, step, count in conn.execute(ORPHANED_INSTANCES).fetchall():
+                mapping = step_map.get(workflow, {})
+                if step not in mapping:
+                    unmapped.append(f"{workflow}.{step} ({count})")
+                    continue
+                new_step = mapping[step]
+                conn.execute(
+                    "INSERT INTO workflow_history (instance_id, from_step, to_step, changed_at) "
+                    "SELECT id, current_step, ?, ? FROM workflow_instances "
+                    "WHERE workflow = ? AND current_step = ? AND status = 'active'",
+                    (new_step, now, workflow, step)
+                )
+                conn.execute(
+                    "UPDATE workflow_instances SET current_step = COALESCE(?, current_step), "
+                    "status = CASE WHEN ? IS NULL THEN 'cancelled' ELSE status END, updated_at = ? "
+                    "WHERE workflow = ? AND current_step = ? AND status = 'active'",
+                    (new_step, new_step, now, workflow, step)
+                )
+                if new_step is None:
+                    self.logger.info(f"{count} instances de '{workflow}' à l'étape supprimée '{step}' clôturées")
+                else:
+                    self.logger.info(f"{count} instances de '{workflow}' déplacées de '{step}' vers '{new_step}'")
+            if unmapped:
+                message = "Étapes supprimées avec des instances actives, sans correspondance: " + ", ".join(unmapped)
+                if strict:
+                    raise ValueError(message)
+                self.logger.warning(f"{message}; instances laissées en attente")
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+    def _check_step(self, workflow: str, step: Optional[str] = None):
+        if workflow not in self.transitions:
+            raise ValueError(f"Workflow inconnu: {workflow}")
+        if step is not None and step not in self.transitions[workflow]:
+            raise ValueError(f"Étape inconnue pour le workflow '{workflow}': {step}")
+
+    # ------------------------------------------------------------------
+    # Démarrage et transitions
+    # ------------------------------------------------------------------
+
+    def start(self, workflow: str, entity_type: Optional[str] = None,
+              entity_id: Optional[int] = None) -> int:
+        """Démarre une instance de workflow à sa première étape et retourne son identifiant"""
+        return self.start_many([(workflow, entity_type, entity_id)])[0]
+
+    def start_many(self, items: Iterable[Tuple[str, Optional[str], Optional[int]]]) -> List[int]:
+        """Démarre plusieurs instances dans une seule transaction"""
+        now = _now()
+        rows = []
+        for workflow, entity_type, entity_id in items:
+            self._check_step(workflow)
+            rows.append((workflow, self.first_steps[workflow], entity_type, entity_id, now, now))
+
+        conn = self.database.connect()
+        # Verrou d'écriture pris avant de lire la séquence: les identifiants du
+        # lot sont contigus et connus sans relire les lignes insérées.
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            first = conn.execute(NEXT_INSTANCE_ID).fetchone()[0]
+            conn.executemany(
+                "INSERT INTO workflow_instances "
+                "(id, workflow, current_step, entity_type, entity_id, started_at, updated_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(first + offset, *row) for offset, row in enumerate(rows)]
+            )
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        return list(range(first, first + len(rows)))
+
+    def advance(self, instance_ids: Iterable[int], from_step: Optional[str] = None) -> int:
+        """Fait passer un lot d'instances à leur étape suivante, en une transaction.
+
+        Si `from_step` est donné, seules les instances actuellement à cette
+        étape avancent (protection contre un double avancement). Retourne le
+        nombre d'instances effectivement avancées.
+        """
+        conn = self.database.connect()
+        params = {"now": _now(), "from_step": from_step}
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("CREATE TEMP TABLE IF NOT EXISTS _advance (id INTEGER PRIMARY KEY)")
+            conn.execute("DELETE FROM temp._advance")
+            conn.executemany("INSERT OR IGNORE INTO _advance (id) VALUES (?)",
+                             ((instance_id,) for instance_id in instance_ids))
+            conn.execute(ADVANCE_HISTORY, params)
+            advanced = conn.execute(ADVANCE_INSTANCES, params).rowcount
+            conn.commit()
+        except Exception as e:
+            conn.rollback()
+            self.logger.error(f"Erreur lors de l'avancement des workflows: {str(e)}")
+            raise
+        return advanced
+
+    def advance_step(self, workflow: str, step: str) -> int:
+        """Fait avancer toutes les instances actives d'une étape donnée"""
+        return self.advance(self.in_step(workflow, step), from_step=step)
+
+    # ------------------------------------------------------------------
+    # Requêtes (servies par l'index partiel des instances actives)
+    # ------------------------------------------------------------------
+
+    def in_step(self, workflow: str, step: str, limit: int = -1) -> List[int]:
+        """Retourne les instances actives actuellement à l'étape donnée"""
+        self._check_step(workflow, step)
+        rows = self.database.connect().execute(
+            "SELECT id FROM workflow_instances "
+            "WHERE workflow = ? AND current_step = ? AND status = 'active' LIMIT ?",
+            (workflow, step, limit)
+        )
+        return [row[0] for row in rows]
+
+    def count_by_step(self, workflow: str) -> Dict[str, int]:
+        """Retourne le nombre d'instances actives par étape, dans l'ordre du workflow"""
+        self._check_step(workflow)
+        counts = dict(self.database.connect().execute(
+            "SELECT current_step, COUNT(*) FROM workflow_instances "
+            "WHERE workflow = ? AND status = 'active' GROUP BY current_step",
+            (workflow,)
+        ).fetchall())
+        return {step: counts.get(step, 0) for step in self.transitions[workflow]}
+
+    def get(self, instance_id: int) -> Optional[Dict[str, Any]]:
+        """Retourne l'état d'une instance"""
+        row = self.database.connect().execute(
+            "SELECT * FROM workflow_instances WHERE id = ?", (instance_id,)
+        ).fetchone()
+        return dict(row) if row else None
+
+    def history(self, instance_id: int) -> List[Dict[str, Any]]:
+        """Retourne l'historique des transitions d'une instance"""
+        rows = self.database.connect().execute(
+            "SELECT from_step, to_step, changed_at FROM workflow_history "
+            "WHERE instance_id = ? ORDER BY rowid", (instance_id,)
+        )
+        return [dict(row) for row in rows]
+
+
+def _now() -> str:
+    return datetime.now().isoformat(timespec="seconds")
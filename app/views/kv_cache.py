@@ -0,0 +1,119 @@
+import sys
+import types
+import pickle
+import marshal
+import hashlib
+import copyreg
+from functools import partial
+from pathlib import Path
+from typing import Optional
+import kivy
+from kivy.factory import Factory
+from kivy.lang import Builder
+from kivy.lang.parser import Parser
+from kivy.logger import Logger
+
+KV_CACHE_DIR = Path("data/cache/kv")
+
+# La fusion des règles (_merge) reprend celle de BuilderBase.load_string, qui
+# n'accepte pas d'analyse déjà faite: elle n'est validée que pour la version
+# de Kivy fixée dans requirements.txt. Sinon, les fichiers sont chargés sans cache.
+SUPPORTED_KIVY = "2.3"
+CACHE_SUPPORTED = (
+    kivy.__version__.startswith(SUPPORTED_KIVY + ".")
+    and all(hasattr(Builder, name) for name in ("rules", "templates", "files", "template",
+                                                "_clear_matchcache", "_apply_rule"))
+)
+if not CACHE_SUPPORTED:
+    Logger.warning(f"KVCache: Kivy {kivy.__version__} non pris en charge (attendu {SUPPORTED_KIVY}.x), "
+                   "cache des fichiers KV désactivé")
+
+
+def _reduce_code(code: types.CodeType):
+    return marshal.loads, (marshal.dumps(code),)
+
+
+class _ParserPickler(pickle.Pickler):
+    """Sérialise les règles analysées, y compris les expressions compilées"""
+    dispatch_table = {**copyreg.dispatch_table, types.CodeType: _reduce_code}
+
+
+def _cache_key(content: str) -> str:
+    # Le bytecode dépend de la version de Python, la structure des règles de celle de Kivy
+    header = f"{sys.version_info[0]}.{sys.version_info[1]}|{kivy.__version__}|".encode("utf8")
+    return hashlib.sha256(header + content.encode("utf8")).hexdigest()[:16]
+
+
+def _read_cached(path: Path) -> Optional[Parser]:
+    try:
+        with open(path, "rb") as f:
+            parser = pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        Logger.warning(f"KVCache: cache illisible {path.name}, nouvelle analyse ({e})")
+        return None
+    # Les directives (#:import, #:set) agissent sur l'état global de Kivy
+    parser.execute_directives()
+    return parser
+
+
+def _write_cached(path: Path, parser: Parser):
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        for stale in path.parent.glob(f"{path.name.rsplit('-', 1)[0]}-*.pickle"):
+            stale.unlink()
+        tmp = path.with_suffix(".tmp")
+        with open(tmp, "wb") as f:
+            _ParserPickler(f, protocol=pickle.HIGHEST_PROTOCOL).dump(parser)
+        tmp.replace(path)
+    except Exception as e:
+        Logger.warning(f"KVCache: impossible de mettre en cache {path.name} ({e})")
+
+
+def _merge(parser: Parser, filename: str):
+    """Fusionne une analyse dans le Builder, comme le fait BuilderBase.load_string"""
+    if filename in Builder.files:
+        Logger.warning(f"Lang: The file {filename} is loaded multiples times, "
+                       "you might have unwanted behaviors.")
+    Builder._current_filename = filename
+    try:
+        Builder.rules.extend(parser.rules)
+        Builder._clear_matchcache()
+        for name, cls, template in parser.templates:
+            Builder.templates[name] = (cls, template, filename)
+            Factory.register(name, cls=partial(Builder.template, name), is_template=True, warn=True)
+        for name, baseclasses in parser.dynamic_classes.items():
+            Factory.register(name, baseclasses=baseclasses, filename=filename, warn=True)
+        if parser.templates or parser.dynamic_classes or parser.rules:
+            Builder.files.append(filename)
+
+        if parser.root:
+            widget = Factory.get(parser.root.name)(__no_builder=True)
+            rule_children = []
+            widget.apply_class_lang_rules(root=widget, rule_children=rule_children)
+            Builder._apply_rule(widget, parser.root, parser.root, rule_children=rule_children)
+            for child in rule_children:
+                child.dispatch("on_kv_post", widget)
+            widget.dispatch("on_kv_post", widget)
+            return widget
+    finally:
+        Builder._current_filename = None
+
+
+def load_kv(filename, cache_dir=KV_CACHE_DIR):
+    """Charge un fichier KV comme Builder.load_file, sans le réanalyser s'il n'a pas changé.
+
+    Les règles analysées sont conservées dans `cache_dir`, indexées par
+    l'empreinte du contenu: toute modification du fichier invalide le cache.
+    """
+    path = Path(filename)
+    if not CACHE_SUPPORTED:
+        return Builder.load_file(str(path))
+    content = path.read_text(encoding="utf8")
+    cached = Path(cache_dir) / f"{path.stem}-{_cache_key(content)}.pickle"
+    parser = _read_cached(cached)
+    if parser is None:
+        parser = Parser(content=content, filename=str(path))
+        _write_cached(cached, parser)
+    return _merge(parser, str(path))
@@ -1,7 +1,38 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+from kivy.properties import StringProperty
+from kivymd.app import MDApp
+from kivymd.uix.boxlayout import MDBoxLayout
 from kivymd.uix.screen import MDScreen
 from kivymd.uix.menu import MDDropdownMenu
 from kivymd.uix.dialog import MDDialog
 from kivymd.uix.button import MDButton, MDButtonText
+from app.views.visibility import VisibilityController
+
+# Éléments du fichier KV dont la visibilité dépend du rôle
+ROLE_ELEMENTS = {
+    "create_report": "create_report_button",
+    "view_reports": "view_reports_button",
+    "validate_reports": "validate_reports_button",
+    "operations_card": "operations_card",
+    "personnel_card": "personnel_card",
+    "maintenance_card": "maintenance_card",
+}
+
+WIDGET_TITLES = {
+    "active_flights": "Vols en cours",
+    "maintenance_alerts": "Alertes maintenance",
+    "weather": "Météo",
+}
+
+
+class DashboardTile(MDBoxLayout):
+    """Tuile d'un widget du dashboard."""
+    title = StringProperty("")
+    value = StringProperty("...")
+    detail = StringProperty("")
+
 
 class MainScreen(MDScreen):
     """Écran principal du dashboard après connexion."""
@@ -12,28 +43,80 @@ class MainScreen(MDScreen):
         self.current_role = None
         self.role_menu = None
         self.dialog = None
+        # Travaux en base hors du thread de l'interface (une connexion SQLite réutilisée)
+        self._worker = ThreadPoolExecutor(max_workers=1)
+        self.dashboard_tiles = {}
+        self._dashboard_event = None
+        self.visibility = None
+        self.last_role_switch_ms = None
         
     def on_enter(self):
         """Appelé lorsque l'écran devient actif."""
         if not self.current_role:
             self.show_role_selection()
+        self._start_dashboard()
+        self._apply_role()
+        
+    def on_leave(self):
+        """Appelé lorsque l'écran n'est plus actif."""
+        if self._dashboard_event:
+            self._dashboard_event.cancel()
+            self._dashboard_event = None
+            
+    def _start_dashboard(self):
+        """Crée les tuiles du dashboard et démarre leur rafraîchissement."""
+        dashboard = MDApp.get_running_app().dashboard_service
+        if dashboard is None:
+            return
+        if not self.dashboard_tiles:
+            for name in dashboard.widgets:
+                tile = DashboardTile(title=WIDGET_TITLES.get(name, name))
+                self.dashboard_tiles[name] = tile
+                self.ids.dashboard.add_widget(tile)
+                self._get_visibility().register(name, tile)
+        if not self._dashboard_event:
+            self._dashboard_event = Clock.schedule_interval(self._refresh_dashboard, 0.5)
+            
+    def _refresh_dashboard(self, dt):
+        """Lance les récupérations dues et redessine uniquement les widgets modifiés ou périmés."""
+        dashboard = MDApp.get_running_app().dashboard_service
+        dashboard.poll()
+        for widget in dashboard.changed():
+            started = time.perf_counter()
+            # Données servies selon leur durée de validité: expirées, elles ne sont plus affichées
+            version = widget.version
+            data, stale = dashboard.get_state(widget.name)
+            tile = self.dashboard_tiles.get(widget.name)
+            if tile is not None:
+                tile.value, tile.detail = self._format_widget(widget.name, data, stale, widget.error)
+            dashboard.mark_rendered(widget, version, time.perf_counter() - started, stale)
+            
+    @staticmethod
+    def _format_widget(name, data, stale=False, error=None):
+        """Retourne (valeur, détail) à afficher pour les données d'un widget."""
+        if stale:
+            return "Indisponible", f"Données périmées ({error})" if error else "Données périmées"
+        if data is None:
+            return "Indisponible", ""
+        if name == "active_flights":
+            steps = data.get("by_step", {})
+            return str(data["count"]), f"Pré-vol: {steps.get('pre_flight', 0)} · Post-vol: {steps.get('post_flight', 0)}"
+        if name == "maintenance_alerts":
+            return str(data["count"]), f"{data['overdue']} en retard"
+        if name == "weather" and isinstance(data, dict):
+            return str(data.get("summary", "Indisponible")), str(data.get("details", ""))
+        return str(data), ""
     
     def show_role_selection(self, *args):
         """Affiche le menu de sélection du rôle."""
         if not self.role_menu:
+            role_service = MDApp.get_running_app().role_service
             menu_items = [
                 {
-                    "text": f"{role}",
+                    "text": role_service.get_display_name(role),
                     "on_release": lambda x=role: self.set_role(x),
                 }
-                for role in [
-                    "Commandant de bord",
-                    "Pilote",
-                    "Observateur",
-                    "Technicien maintenance",
-                    "Gestionnaire opérations",
-                    "Responsable formation"
-                ]
+                for role in role_service.roles
             ]
             
             self.role_menu = MDDropdownMenu(
@@ -46,10 +129,37 @@ class MainScreen(MDScreen):
         self.role_menu.open()
         
     def set_role(self, role_name):
-        """Définit le rôle sélectionné."""
-        self.current_role = role_name
-        self.role_menu.dismiss()
-        # TODO: Mettre à jour l'interface en fonction du rôle
+        """Définit le rôle sélectionné (clé, nom affiché ou ancien nom de rôle)."""
+        if self.role_menu:
+            self.role_menu.dismiss()
+        role = MDApp.get_running_app().role_service.resolve(role_name)
+        if role is None:
+            self.show_dialog("Rôle", f"Rôle inconnu : {role_name}")
+            return
+        self.current_role = role
+        self._apply_role()
+        
+    def _get_visibility(self):
+        """Retourne le contrôleur de visibilité, en y enregistrant les éléments du KV."""
+        if self.visibility is None:
+            self.visibility = VisibilityController()
+            for name, widget_id in ROLE_ELEMENTS.items():
+                self.visibility.register(name, self.ids[widget_id])
+        return self.visibility
+        
+    def _apply_role(self):
+        """Affiche les éléments autorisés pour le rôle courant sans reconstruire l'écran."""
+        started = time.perf_counter()
+        visible = MDApp.get_running_app().role_service.get_visible(self.current_role)
+        self._get_visibility().apply(visible)
+        self.last_role_switch_ms = (time.perf_counter() - started) * 1000
+        
+    def _is_allowed(self, element):
+        """Vérifie que le rôle courant autorise une action."""
+        if MDApp.get_running_app().role_service.is_allowed(self.current_role, element):
+            return True
+        self.show_dialog("Accès refusé", "Votre rôle ne permet pas cette action")
+        return False
         
     def toggle_nav_drawer(self):
         """Ouvre/ferme le tiroir de navigation."""
@@ -62,15 +172,44 @@ class MainScreen(MDScreen):
         
     def create_report(self):
         """Crée un nouveau rapport."""
+        if not self._is_allowed("create_report"):
+            return
         self.show_dialog("Nouveau Rapport", "Fonctionnalité en cours de développement")
         
     def view_reports(self):
         """Affiche la liste des rapports."""
-        self.show_dialog("Consulter Rapports", "Fonctionnalité en cours de développement")
+        if not self._is_allowed("view_reports"):
+            return
+        self.manager.current = "reports"
         
     def validate_reports(self):
-        """Affiche les rapports en attente de validation."""
-        self.show_dialog("Valider Rapports", "Fonctionnalité en cours de développement")
+        """Valide en lot les rapports en attente et affiche le résumé."""
+        if not self._is_allowed("validate_reports"):
+            return
+        validation_service = MDApp.get_running_app().validation_service
+        
+        def run():
+            try:
+                summary = validation_service.validate_pending()
+                Clock.schedule_once(lambda dt: self.show_validation_summary(summary))
+            except Exception as e:
+                message = f"Erreur lors de la validation : {str(e)}"
+                Clock.schedule_once(lambda dt: self.show_dialog("Valider Rapports", message))
+                
+        self._worker.submit(run)
+        
+    def show_validation_summary(self, summary, max_lines=10):
+        """Affiche le résumé d'une validation en lot."""
+        lines = [
+            f"Rapports vérifiés : {summary['checked']}",
+            f"Rapports validés : {summary['approved']}",
+            f"Rapports en échec : {len(summary['failed'])}",
+        ]
+        for report_id, reasons in list(summary['failed'].items())[:max_lines]:
+            lines.append(f"#{report_id} : {'; '.join(reasons)}")
+        if len(summary['failed']) > max_lines:
+            lines.append(f"... et {len(summary['failed']) - max_lines} autres")
+        self.show_dialog("Valider Rapports", "\n".join(lines))
         
     def show_dialog(self, title, text):
         """Affiche une boîte de dialogue."""
@@ -0,0 +1,148 @@
+from concurrent.futures import ThreadPoolExecutor
+from kivy.clock import Clock
+from kivy.metrics import dp
+from kivy.properties import StringProperty
+from kivy.uix.recycleview import RecycleView
+from kivy.uix.recycleview.views import RecycleDataViewBehavior
+from kivymd.app import MDApp
+from kivymd.uix.boxlayout import MDBoxLayout
+from kivymd.uix.menu import MDDropdownMenu
+from kivymd.uix.screen import MDScreen
+from app.services.report_service import ReportPager, REPORT_STATUSES, parse_day_range
+
+ROW_HEIGHT = dp(56)
+
+
+class ReportRow(RecycleDataViewBehavior, MDBoxLayout):
+    """Ligne de la liste des rapports (widget recyclé par la RecycleView)"""
+    title = StringProperty("")
+    role = StringProperty("")
+    status = StringProperty("")
+    created_at = StringProperty("")
+
+
+class ReportListView(RecycleView):
+    """Liste virtualisée des rapports alimentée par un ReportPager.
+
+    Les pages sont préchargées dans un thread dès que le défilement approche
+    d'un bord de la fenêtre, puis appliquées sur le thread de l'interface.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.pager = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._loading = False
+        self.bind(scroll_y=self._on_scroll)
+
+    def refresh(self):
+        """Recharge les données affichées depuis la fenêtre du pager et remonte en haut"""
+        self.data = [self._to_view(row) for row in self.pager.rows]
+        self.scroll_y = 1
+
+    def _on_scroll(self, instance, scroll_y):
+        if self.pager is None or self._loading:
+            return
+        direction = self.pager.wants(1 - scroll_y)
+        if direction is None:
+            return
+        self._loading = True
+        fetch = self.pager.fetch_next if direction == "next" else self.pager.fetch_previous
+        future = self._executor.submit(fetch)
+        future.add_done_callback(
+            lambda f: Clock.schedule_once(lambda dt: self._apply(direction, f))
+        )
+
+    def _apply(self, direction, future):
+        """Applique une page préchargée en conservant la position visible"""
+        self._loading = False
+        if future.exception() is not None:
+            return
+        offset = self._top_offset()
+        if direction == "next":
+            offset -= self.pager.apply_next(future.result()) * ROW_HEIGHT
+        else:
+            offset += self.pager.apply_previous(future.result()) * ROW_HEIGHT
+        self.data = [self._to_view(row) for row in self.pager.rows]
+        # La hauteur du contenu n'est recalculée qu'à la frame suivante
+        Clock.schedule_once(lambda dt: self._restore_offset(offset))
+
+    def _top_offset(self):
+        scrollable = max(len(self.data) * ROW_HEIGHT - self.height, 0)
+        return (1 - self.scroll_y) * scrollable
+
+    def _restore_offset(self, offset):
+        scrollable = max(len(self.data) * ROW_HEIGHT - self.height, 0)
+        self.scroll_y = 1 - min(max(offset, 0), scrollable) / scrollable if scrollable else 1
+
+    @staticmethod
+    def _to_view(row):
+        return {
+            "title": row["title"],
+            "role": row["role"],
+            "status": REPORT_STATUSES.get(row["status"], row["status"]),
+            "created_at": row["created_at"].replace("T", " ")[:16],
+        }
+
+
+class ReportsScreen(MDScreen):
+    """Écran de consultation de l'historique des rapports."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.name = "reports"
+        self.pager = None
+        self.role_filter = None
+        self.status_filter = None
+        self.menu = None
+
+    def on_enter(self):
+        """Appelé lorsque l'écran devient actif."""
+        if self.pager is None:
+            app = MDApp.get_running_app()
+            self.pager = ReportPager(app.database_service)
+            self.ids.report_list.pager = self.pager
+        self.apply_filters()
+
+    def apply_filters(self):
+        """Relance la requête avec les filtres courants (évalués par la base)."""
+        try:
+            date_from, date_to = parse_day_range(self.ids.date_from.text, self.ids.date_to.text)
+        except ValueError:
+            return
+        self.pager.set_filters(role=self.role_filter, status=self.status_filter,
+                               date_from=date_from, date_to=date_to)
+        self.ids.report_list.refresh()
+
+    def show_role_menu(self, caller):
+        """Affiche le menu de filtre par rôle."""
+        roles = MDApp.get_running_app().config_service.config.get('interface', {}).get('roles', {})
+        choices = [(None, "Tous les rôles")] + [(key, role["name"]) for key, role in roles.items()]
+        self._open_menu(caller, choices, "role_filter", self.ids.role_button_text)
+
+    def show_status_menu(self, caller):
+        """Affiche le menu de filtre par statut."""
+        choices = [(None, "Tous les statuts")] + list(REPORT_STATUSES.items())
+        self._open_menu(caller, choices, "status_filter", self.ids.status_button_text)
+
+    def _open_menu(self, caller, choices, attribute, label):
+        def select(value, text):
+            setattr(self, attribute, value)
+            label.text = text
+            self.menu.dismiss()
+            self.apply_filters()
+
+        self.menu = MDDropdownMenu(
+            caller=caller,
+            items=[
+                {"text": text, "on_release": lambda v=value, t=text: select(v, t)}
+                for value, text in choices
+            ],
+            position="bottom",
+        )
+        self.menu.open()
+
+    def go_back(self):
+        """Retourne au dashboard."""
+        self.manager.current = "main"
+
@@ -0,0 +1,45 @@
+class VisibilityController:
+    """Affiche ou masque des sous-arbres de widgets déjà construits.
+
+    Un élément masqué est détaché de son parent et conservé en mémoire; il est
+    réinséré à sa position d'origine lorsqu'il redevient visible. Aucun widget
+    n'est reconstruit lors d'un changement de rôle.
+    """
+
+    def __init__(self):
+        self._elements = {}
+        self._order = {}
+        self.visible = None
+
+    def register(self, name, widget):
+        """Enregistre un élément (le widget doit être attaché à son parent)"""
+        parent = widget.parent
+        if parent is None:
+            raise ValueError(f"L'élément '{name}' n'est attaché à aucun parent")
+        if parent not in self._order:
+            # Ordre visuel d'origine (les enfants Kivy sont stockés en ordre inverse)
+            self._order[parent] = list(reversed(parent.children))
+        elif widget not in self._order[parent]:
+            self._order[parent].append(widget)
+        self._elements[name] = (widget, parent)
+        if self.visible is not None and name not in self.visible:
+            parent.remove_widget(widget)
+
+    def apply(self, visible):
+        """Affiche exactement les éléments de `visible`. Retourne le nombre d'éléments modifiés"""
+        self.visible = frozenset(visible)
+        changed = 0
+        for name, (widget, parent) in self._elements.items():
+            shown = name in self.visible
+            if shown and widget.parent is None:
+                self._attach(widget, parent)
+                changed += 1
+            elif not shown and widget.parent is not None:
+                parent.remove_widget(widget)
+                changed += 1
+        return changed
+
+    def _attach(self, widget, parent):
+        order = self._order[parent]
+        before = sum(1 for w in order[:order.index(widget)] if w.parent is parent)
+        parent.add_widget(widget, index=len(parent.children) - before)
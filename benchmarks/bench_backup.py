@@ -0,0 +1,290 @@
+"""Benchmark de BackupService sur des jeux de données synthétiques.
+
+Génère des bases SQLite (10 Mo à 10 Go) et des arborescences de configuration
+(10 à 100k fichiers), puis mesure create, verify, list, restore et rotate:
+durée, débit et pic de mémoire (RSS). Chaque opération s'exécute dans un
+processus séparé pour que le pic mesuré soit le sien. Les résultats sont
+enregistrés en JSON et peuvent être comparés à une exécution de référence.
+
+Usage: python benchmarks/bench_backup.py [--db-sizes 10MB,100MB] [--config-files 10,1000]
+           [--runs 3] [--output results.json] [--compare baseline.json] [--threshold 0.2]
+       python benchmarks/bench_backup.py --full   (10MB..10GB x 10..100k fichiers)
+"""
+import os
+import sys
+import json
+import time
+import shutil
+import sqlite3
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+FULL_DB_SIZES = "10MB,100MB,1GB,10GB"
+FULL_CONFIG_FILES = "10,1000,100000"
+OPERATIONS = ["create", "verify", "list", "restore", "rotate"]
+ROW_SIZE = 4096
+FILES_PER_DIR = 100
+UNITS = {"KB": 1024, "MB": 1024 ** 2, "GB": 1024 ** 3}
+
+
+def parse_size(text):
+    text = text.strip().upper()
+    for unit, factor in UNITS.items():
+        if text.endswith(unit):
+            return int(float(text[:-len(unit)]) * factor)
+    return int(text)
+
+
+def peak_rss_mb():
+    """Pic de mémoire résidente du processus courant, en Mo (None si indisponible)"""
+    try:
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        # ru_maxrss est en Ko sous Linux et en octets sous macOS
+        return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+    except ImportError:
+        pass
+    try:
+        import psutil
+        return psutil.Process().memory_info().peak_wset / (1024 * 1024)
+    except (ImportError, AttributeError):
+        return None
+
+
+# ----------------------------------------------------------------------
+# Jeux de données
+# ----------------------------------------------------------------------
+
+def build_database(path: Path, size: int):
+    """Crée une base SQLite d'environ `size` octets (réutilisée si déjà générée)"""
+    if path.exists():
+        return
+    tmp = path.with_suffix(".tmp")
+    tmp.unlink(missing_ok=True)
+    conn = sqlite3.connect(str(tmp))
+    conn.execute("PRAGMA journal_mode = OFF")
+    conn.execute("PRAGMA synchronous = OFF")
+    conn.execute("CREATE TABLE blobs (id INTEGER PRIMARY KEY, data BLOB)")
+    rows = max(1, size // (ROW_SIZE + 64))
+    batch = 10_000
+    for start in range(0, rows, batch):
+        conn.execute(
+            "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < ?) "
+            "INSERT INTO blobs (data) SELECT randomblob(?) FROM n",
+            (min(batch, rows - start), ROW_SIZE)
+        )
+        conn.commit()
+    conn.close()
+    os.replace(tmp, path)
+
+
+def build_config_tree(path: Path, count: int):
+    """Crée `count` petits fichiers JSON répartis en sous-répertoires"""
+    if path.exists():
+        return
+    tmp = path.with_name(path.name + ".tmp")
+    shutil.rmtree(tmp, ignore_errors=True)
+    for i in range(count):
+        directory = tmp / f"group_{i // FILES_PER_DIR:04d}"
+        if i % FILES_PER_DIR == 0:
+            directory.mkdir(parents=True)
+        with open(directory / f"config_{i:06d}.json", "w") as f:
+            json.dump({"id": i, "name": f"Paramètre {i}", "values": list(range(i % 20))}, f)
+    tmp.rename(path)
+
+
+def prepare_dataset(workdir: Path, db_size: int, config_files: int) -> Path:
+    """Assemble un répertoire de données (liens vers les jeux générés en cache)"""
+    cache = workdir / "cache"
+    cache.mkdir(parents=True, exist_ok=True)
+    db = cache / f"db_{db_size}.db"
+    configs = cache / f"config_{config_files}"
+    build_database(db, db_size)
+    build_config_tree(configs, config_files)
+
+    data_dir = workdir / f"data_{db_size}_{config_files}"
+    shutil.rmtree(data_dir, ignore_errors=True)
+    data_dir.mkdir()
+    shutil.copyfile(db, data_dir / "database.db")
+    shutil.copytree(configs, data_dir / "config")
+    return data_dir
+
+
+# ----------------------------------------------------------------------
+# Mesures (exécutées dans un processus enfant)
+# ----------------------------------------------------------------------
+
+def run_operation(operation, data_dir, backup_dir):
+    from app.services.backup_service import BackupService
+    from app.services.logging_service import flush_logging
+
+    service = BackupService(data_dir=data_dir, backup_dir=backup_dir)
+    backups = sorted(p for p in Path(backup_dir).iterdir() if p.is_dir())
+    latest = str(backups[-1]) if backups else None
+
+    started = time.perf_counter()
+    if operation == "create":
+        result = service.create_backup()
+    elif operation == "verify":
+        result = service.verify_backup(latest)
+    elif operation == "list":
+        result = service.get_backup_list()
+    elif operation == "restore":
+        result = service.restore_backup(latest)
+    elif operation == "rotate":
+        result = service.rotate_backups(max_backups=1)
+    else:
+        raise ValueError(f"Opération inconnue: {operation}")
+    seconds = time.perf_counter() - started
+    flush_logging()
+
+    if operation in ("create", "verify", "restore") and not result:
+        raise RuntimeError(f"Échec de l'opération {operation}")
+    return {"seconds": seconds, "peak_rss_mb": peak_rss_mb()}
+
+
+def measure(operation, data_dir, backup_dir):
+    proc = subprocess.run(
+        [sys.executable, __file__, "--worker", operation, str(data_dir), str(backup_dir)],
+        capture_output=True, text=True
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"{operation}: {proc.stderr.strip()}")
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def dataset_bytes(data_dir: Path) -> int:
+    return sum(p.stat().st_size for p in data_dir.rglob("*") if p.is_file())
+
+
+def run_scenario(workdir: Path, db_size: int, config_files: int, runs: int):
+    data_dir = prepare_dataset(workdir, db_size, config_files)
+    backup_dir = workdir / "backups"
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    backup_dir.mkdir()
+    size = dataset_bytes(data_dir)
+
+    results = {}
+    for operation in OPERATIONS:
+        # La rotation ne s'exécute qu'une fois: elle supprime les sauvegardes créées
+        samples = [measure(operation, data_dir, backup_dir)
+                   for _ in range(1 if operation == "rotate" else runs)]
+        seconds = [s["seconds"] for s in samples]
+        rss = [s["peak_rss_mb"] for s in samples if s["peak_rss_mb"] is not None]
+        median = statistics.median(seconds)
+        entry = {
+            "seconds": median,
+            "min_seconds": min(seconds),
+            "max_seconds": max(seconds),
+            "peak_rss_mb": max(rss) if rss else None,
+        }
+        if operation in ("create", "verify", "restore"):
+            entry["mb_per_s"] = size / (1024 * 1024) / median if median else None
+        results[operation] = entry
+        print(f"  {operation:<8} {median * 1000:10.1f} ms"
+              + (f"  {entry['mb_per_s']:8.1f} Mo/s" if entry.get("mb_per_s") else " " * 15)
+              + (f"  RSS {entry['peak_rss_mb']:.0f} Mo" if entry["peak_rss_mb"] else ""))
+
+    shutil.rmtree(backup_dir, ignore_errors=True)
+    shutil.rmtree(data_dir, ignore_errors=True)
+    return {"dataset_bytes": size, "operations": results}
+
+
+# ----------------------------------------------------------------------
+# Comparaison
+# ----------------------------------------------------------------------
+
+def compare(current, baseline, threshold):
+    """Retourne la liste des régressions au-delà du seuil (durée ou mémoire)"""
+    regressions = []
+    for scenario, result in current["scenarios"].items():
+        reference = baseline.get("scenarios", {}).get(scenario)
+        if reference is None:
+            continue
+        for operation, entry in result["operations"].items():
+            ref = reference["operations"].get(operation)
+            if ref is None:
+                continue
+            for key in ("seconds", "peak_rss_mb"):
+                if entry.get(key) and ref.get(key):
+                    ratio = entry[key] / ref[key]
+                    if ratio > 1 + threshold:
+                        regressions.append(f"{scenario} {operation} {key}: "
+                                           f"{ref[key]:.4g} -> {entry[key]:.4g} (x{ratio:.2f})")
+    return regressions
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, cwd=Path(__file__).resolve().parent).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def main():
+    if len(sys.argv) == 5 and sys.argv[1] == "--worker":
+        print(json.dumps(run_operation(*sys.argv[2:])))
+        return 0
+
+    parser = argparse.ArgumentParser(description="Benchmark de BackupService")
+    parser.add_argument("--db-sizes", default="10MB,100MB")
+    parser.add_argument("--config-files", default="10,1000")
+    parser.add_argument("--full", action="store_true", help=f"{FULL_DB_SIZES} x {FULL_CONFIG_FILES}")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--workdir", default="benchmarks/.backup_data",
+                        help="Répertoire de travail (les jeux générés y sont conservés)")
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    parser.add_argument("--compare", help="Fichier JSON de référence")
+    parser.add_argument("--threshold", type=float, default=0.2,
+                        help="Régression tolérée (0.2 = +20%% de durée ou de mémoire)")
+    args = parser.parse_args()
+
+    db_sizes = (FULL_DB_SIZES if args.full else args.db_sizes).split(",")
+    config_counts = (FULL_CONFIG_FILES if args.full else args.config_files).split(",")
+    workdir = Path(args.workdir)
+    workdir.mkdir(parents=True, exist_ok=True)
+
+    report = {
+        "commit": git_commit(),
+        "date": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "sqlite": sqlite3.sqlite_version,
+        "runs": args.runs,
+        "scenarios": {},
+    }
+    for db_size in db_sizes:
+        for config_files in config_counts:
+            scenario = f"db={db_size.strip()},configs={int(config_files)}"
+            print(f"{scenario}")
+            report["scenarios"][scenario] = run_scenario(
+                workdir, parse_size(db_size), int(config_files), args.runs)
+
+    output = Path(args.output or f"benchmarks/results/backup_{report['commit'] or 'local'}.json")
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"Résultats enregistrés: {output}")
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            baseline = json.load(f)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print(f"\nRégressions (seuil {args.threshold:.0%}) par rapport à {args.compare}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"\nAucune régression au-delà de {args.threshold:.0%} par rapport à {args.compare}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
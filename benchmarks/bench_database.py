@@ -0,0 +1,81 @@
+"""Benchmark du carnet de vol: chargement d'un million de vols puis requêtes indexées.
+
+Usage: python benchmarks/bench_database.py [--rows 1000000] [--queries 200]
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.database_service import DatabaseService
+
+
+def generate_flights(rows, aircraft_ids, pilot_ids, start, span_hours, seed=42):
+    rng = random.Random(seed)
+    for _ in range(rows):
+        started = start + timedelta(minutes=rng.randrange(span_hours * 60))
+        yield {
+            "aircraft_id": rng.choice(aircraft_ids),
+            "pilot_id": rng.choice(pilot_ids),
+            "started_at": started.isoformat(timespec="seconds"),
+            "duration_min": rng.randint(5, 90),
+        }
+
+
+def measure(label, func, args_list):
+    timings = []
+    rows = 0
+    for args in args_list:
+        t0 = time.perf_counter()
+        rows += len(func(*args))
+        timings.append((time.perf_counter() - t0) * 1000)
+    timings.sort()
+    p95 = timings[int(len(timings) * 0.95) - 1]
+    print(f"{label:<28} p50={statistics.median(timings):7.3f} ms  p95={p95:7.3f} ms  "
+          f"lignes/requête={rows / len(args_list):.0f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du carnet de vol SQLite")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--aircraft", type=int, default=50)
+    parser.add_argument("--pilots", type=int, default=200)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(Path(tmp) / "bench.db", batch_size=50_000)
+        aircraft_ids = [db.add_aircraft(f"C-B{i:04d}") for i in range(args.aircraft)]
+        pilot_ids = [db.add_personnel(f"Pilote {i}", "pilot") for i in range(args.pilots)]
+
+        start = datetime(2022, 1, 1)
+        span_hours = 3 * 365 * 24
+        t0 = time.perf_counter()
+        db.add_flights(generate_flights(args.rows, aircraft_ids, pilot_ids, start, span_hours))
+        elapsed = time.perf_counter() - t0
+        print(f"Chargement: {args.rows} vols en {elapsed:.2f} s ({args.rows / elapsed:,.0f} lignes/s)")
+
+        rng = random.Random(7)
+
+        def window(days):
+            begin = start + timedelta(hours=rng.randrange(span_hours - days * 24))
+            return begin, begin + timedelta(days=days)
+
+        measure("par aéronef (30 jours)", db.get_flights_by_aircraft,
+                [(rng.choice(aircraft_ids), *window(30)) for _ in range(args.queries)])
+        measure("par pilote (90 jours)", db.get_flights_by_pilot,
+                [(rng.choice(pilot_ids), *window(90)) for _ in range(args.queries)])
+        measure("par intervalle (1 jour)", db.get_flights_between,
+                [window(1) for _ in range(args.queries)])
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
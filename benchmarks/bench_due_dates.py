@@ -0,0 +1,160 @@
+"""Benchmark de l'index des échéances (maintenance, certifications, validité du personnel).
+
+Charge 100 000 échéances puis compare "dû d'ici N jours" par l'index trié
+`due_items` à un parcours naïf des trois tables, mesure le coût de mise à
+jour de l'index par les déclencheurs et la précision des alertes à l'heure
+exacte de DueDateService.
+
+Usage: python benchmarks/bench_due_dates.py [--records 100000] [--queries 200] [--alerts 5]
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+import threading
+import statistics
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.database_service import DatabaseService
+from app.services.due_date_service import DueDateService
+
+HORIZONS = (7, 30, 90)
+
+
+def percentiles(timings):
+    timings = sorted(timings)
+    return statistics.median(timings), timings[max(0, int(len(timings) * 0.95) - 1)]
+
+
+def naive_due_within(db, until):
+    """Parcours de toutes les lignes, comme sans index: filtrage et tri en Python"""
+    conn = db.connect()
+    items = []
+    for row in conn.execute("SELECT id, kind, due_at, status FROM maintenance_records"):
+        if row["status"] == "open" and row["due_at"] and row["due_at"] <= until:
+            items.append((row["due_at"], "maintenance", row["id"]))
+    for row in conn.execute("SELECT id, expires_at FROM certifications"):
+        if row["expires_at"] and row["expires_at"] <= until:
+            items.append((row["expires_at"], "certification", row["id"]))
+    for row in conn.execute("SELECT id, currency_expires_at FROM personnel"):
+        if row["currency_expires_at"] and row["currency_expires_at"] <= until:
+            items.append((row["currency_expires_at"], "currency", row["id"]))
+    items.sort()
+    return items
+
+
+def load(db, records, now, rng):
+    """Répartit les échéances: 60 % maintenance, 30 % certifications, 10 % validité du personnel"""
+    aircraft = [db.add_aircraft(f"C-D{i:04d}") for i in range(200)]
+    personnel_count = records // 10
+    conn = db.connect()
+    with conn:
+        conn.executemany(
+            "INSERT INTO personnel (name, role, currency_expires_at) VALUES (?, 'pilot', ?)",
+            ((f"Pilote {i}", (now + timedelta(days=rng.uniform(-30, 730))).isoformat(timespec="seconds"))
+             for i in range(personnel_count)))
+    personnel = [row[0] for row in conn.execute("SELECT id FROM personnel")]
+    db.add_maintenance_records(
+        {"aircraft_id": rng.choice(aircraft), "kind": "Inspection",
+         "due_at": now + timedelta(days=rng.uniform(-30, 730)),
+         "status": "open" if rng.random() < 0.7 else "closed"}
+        for _ in range(records * 6 // 10))
+    db.add_certifications(
+        {"personnel_id": rng.choice(personnel), "name": "Qualification",
+         "expires_at": now + timedelta(days=rng.uniform(-30, 730))}
+        for _ in range(records * 3 // 10))
+    return aircraft
+
+
+def bench_queries(db, now, queries):
+    for days in HORIZONS:
+        until = (now + timedelta(days=days)).isoformat(timespec="seconds")
+        indexed, naive = [], []
+        for _ in range(queries):
+            t0 = time.perf_counter()
+            count = len(db.get_due_items(until, limit=-1))
+            indexed.append((time.perf_counter() - t0) * 1000)
+        for _ in range(max(1, queries // 10)):
+            t0 = time.perf_counter()
+            naive_count = len(naive_due_within(db, until))
+            naive.append((time.perf_counter() - t0) * 1000)
+        assert count == naive_count, (count, naive_count)
+        p50, p95 = percentiles(indexed)
+        naive_p50, _ = percentiles(naive)
+        print(f"Dû d'ici {days:>2} jours ({count:>6} échéances): index p50={p50:7.2f} ms p95={p95:7.2f} ms, "
+              f"parcours naïf p50={naive_p50:7.1f} ms (x{naive_p50 / p50:.0f})")
+
+
+def bench_updates(db, aircraft, now, rng, count=1000):
+    conn = db.connect()
+    inserts, closes = [], []
+    for _ in range(count):
+        t0 = time.perf_counter()
+        db.add_maintenance_records([{"aircraft_id": rng.choice(aircraft), "kind": "Hélices",
+                                     "due_at": now + timedelta(days=rng.uniform(0, 365))}])
+        inserts.append((time.perf_counter() - t0) * 1000)
+    ids = [row[0] for row in conn.execute("SELECT id FROM maintenance_records WHERE kind = 'Hélices'")]
+    for record_id in ids:
+        t0 = time.perf_counter()
+        with conn:
+            conn.execute("UPDATE maintenance_records SET status = 'closed' WHERE id = ?", (record_id,))
+        closes.append((time.perf_counter() - t0) * 1000)
+    for label, timings in (("Ajout d'une maintenance", inserts), ("Clôture d'une maintenance", closes)):
+        p50, p95 = percentiles(timings)
+        print(f"{label:<26} (index inclus): p50={p50:.3f} ms p95={p95:.3f} ms")
+
+
+def bench_alerts(db, aircraft, alerts):
+    received = []
+    done = threading.Event()
+
+    def on_alert(items, lead):
+        received.append((datetime.now(), items))
+        if sum(len(batch) for _, batch in received) >= alerts:
+            done.set()
+
+    service = DueDateService(db)
+    service.start(on_alert)
+    base = datetime.now().replace(microsecond=0) + timedelta(seconds=2)
+    db.add_maintenance_records({"aircraft_id": aircraft[0], "kind": "Alerte", "due_at": base + timedelta(seconds=i)}
+                               for i in range(alerts))
+    done.wait(alerts + 10)
+    service.stop()
+    lags = [(at - datetime.fromisoformat(items[0]["due_at"])).total_seconds() * 1000 for at, items in received]
+    if not lags:
+        print("Alertes: aucune alerte reçue")
+        return
+    print(f"Alertes à l'heure exacte ({len(lags)} reçues): retard moyen {statistics.mean(lags):.1f} ms, "
+          f"max {max(lags):.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de l'index des échéances")
+    parser.add_argument("--records", type=int, default=100_000, help="Nombre d'échéances générées")
+    parser.add_argument("--queries", type=int, default=200, help="Nombre de requêtes mesurées par horizon")
+    parser.add_argument("--alerts", type=int, default=5, help="Nombre d'alertes mesurées (une par seconde)")
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    now = datetime.now().replace(microsecond=0)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(Path(tmp) / "bench.db", batch_size=50_000)
+        t0 = time.perf_counter()
+        aircraft = load(db, args.records, now, rng)
+        indexed = db.connect().execute("SELECT COUNT(*) FROM due_items").fetchone()[0]
+        print(f"Chargement: {args.records} échéances en {time.perf_counter() - t0:.1f} s "
+              f"({indexed} indexées)")
+
+        bench_queries(db, now, args.queries)
+        bench_updates(db, aircraft, now, rng)
+        bench_alerts(db, aircraft, args.alerts)
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
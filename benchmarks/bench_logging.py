@@ -0,0 +1,60 @@
+"""Benchmark du coût par appel de journalisation.
+
+Compare l'ancienne configuration (FileHandler synchrone via basicConfig)
+au pipeline par file d'attente de logging_service.
+
+Usage: python benchmarks/bench_logging.py [--calls 50000]
+"""
+import sys
+import time
+import logging
+import argparse
+import tempfile
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.logging_service import get_logger, flush_logging
+
+
+def measure(logger, calls):
+    """Retourne la latence moyenne et le p99 d'un appel, en microsecondes"""
+    timings = []
+    clock = time.perf_counter
+    for i in range(calls):
+        t0 = clock()
+        logger.info("Sauvegarde %d créée", i, extra={"duration_ms": 1.5})
+        timings.append(clock() - t0)
+    timings.sort()
+    return sum(timings) * 1e6 / calls, timings[int(calls * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la journalisation")
+    parser.add_argument("--calls", type=int, default=50_000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        sync_logger = logging.getLogger("BenchSync")
+        sync_logger.propagate = False
+        sync_logger.setLevel(logging.INFO)
+        handler = logging.FileHandler(Path(tmp) / "sync.log", encoding="utf-8")
+        handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
+        sync_logger.addHandler(handler)
+        sync_us = measure(sync_logger, args.calls)
+        handler.close()
+
+        queued_logger = get_logger("BenchQueued", "queued.log", log_dir=tmp)
+        queued_us = measure(queued_logger, args.calls)
+        t0 = time.perf_counter()
+        flush_logging()
+        drain_ms = (time.perf_counter() - t0) * 1000
+
+        print(f"FileHandler synchrone: {sync_us[0]:.2f} µs/appel (p99 {sync_us[1]:.2f} µs)")
+        print(f"File d'attente (JSON): {queued_us[0]:.2f} µs/appel (p99 {queued_us[1]:.2f} µs), "
+              f"écriture différée vidée en {drain_ms:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
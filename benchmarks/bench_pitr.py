@@ -0,0 +1,95 @@
+"""Benchmark du coût de la capture continue (PitrService) sur les écritures.
+
+Mesure les insertions de vols unitaires (une transaction par vol, comme la
+saisie du carnet de vol) et par lots, sans puis avec les déclencheurs de
+capture, ainsi que l'expédition et le rejeu des segments produits.
+
+Usage: python benchmarks/bench_pitr.py [--single 2000] [--batch 100000]
+"""
+import sys
+import time
+import sqlite3
+import argparse
+import tempfile
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.database_service import DatabaseService
+from app.services.pitr_service import PitrService, SELECT_TIMELINE, UPDATE_TIMELINE
+
+
+def flights(aircraft_id, pilot_id, count, offset=0):
+    for i in range(offset, offset + count):
+        yield {"aircraft_id": aircraft_id, "pilot_id": pilot_id,
+               "started_at": f"2026-01-01T{(i // 3600) % 24:02d}:{(i // 60) % 60:02d}:{i % 60:02d}",
+               "duration_min": 42.5, "location": f"site_{i % 50}", "notes": "Vol d'entraînement"}
+
+
+def measure(db, aircraft_id, pilot_id, single, batch, offset):
+    """Retourne le coût moyen (µs/vol) d'une insertion unitaire et d'une insertion par lot"""
+    t0 = time.perf_counter()
+    for flight in flights(aircraft_id, pilot_id, single, offset):
+        db.add_flights([flight])
+    single_us = (time.perf_counter() - t0) * 1e6 / single
+
+    t0 = time.perf_counter()
+    db.add_flights(flights(aircraft_id, pilot_id, batch, offset + single))
+    batch_us = (time.perf_counter() - t0) * 1e6 / batch
+    return single_us, batch_us
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la capture continue des modifications")
+    parser.add_argument("--single", type=int, default=2000, help="Vols insérés un par un")
+    parser.add_argument("--batch", type=int, default=100_000, help="Vols insérés en un lot")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        results = {}
+        for mode in ("sans capture", "avec capture"):
+            db = DatabaseService(Path(tmp) / mode.replace(" ", "_") / "database.db")
+            pitr = PitrService(db.db_path)
+            if mode == "avec capture":
+                pitr.install()
+            aircraft_id = db.add_aircraft("C-BNCH", "M300")
+            pilot_id = db.add_personnel("Pilote", "pilot")
+            results[mode] = measure(db, aircraft_id, pilot_id, args.single, args.batch, 0)
+            print(f"{mode}: unitaire {results[mode][0]:.1f} µs/vol, lot {results[mode][1]:.2f} µs/vol")
+
+            if mode == "avec capture":
+                t0 = time.perf_counter()
+                segment = pitr.ship()
+                ship_ms = (time.perf_counter() - t0) * 1000
+                changes = args.single + args.batch + 2
+                print(f"Expédition: {changes} modifications en {ship_ms:.0f} ms, "
+                      f"segment de {segment.stat().st_size / 1024:.0f} Kio "
+                      f"({segment.stat().st_size / changes:.1f} octets/modification)")
+            db.close()
+
+        base, captured = results["sans capture"], results["avec capture"]
+        print(f"Surcoût de la capture: unitaire {(captured[0] / base[0] - 1) * 100:+.0f} %, "
+              f"lot {(captured[1] / base[1] - 1) * 100:+.0f} %")
+
+        # Rejeu de toutes les modifications sur une base vide de la même lignée
+        source = Path(tmp) / "avec_capture" / "database.db"
+        replica = Path(tmp) / "rejeu" / "database.db"
+        DatabaseService(replica).close()
+        pitr = PitrService(source)
+        pitr.install(replica)
+        with sqlite3.connect(str(source)) as conn:
+            timeline = conn.execute(SELECT_TIMELINE).fetchone()[0]
+        conn.close()
+        conn = sqlite3.connect(str(replica))
+        with conn:
+            conn.execute(UPDATE_TIMELINE, (timeline,))
+        conn.close()
+        t0 = time.perf_counter()
+        count = pitr.replay(replica)
+        replay_s = time.perf_counter() - t0
+        print(f"Rejeu: {count} modifications en {replay_s * 1000:.0f} ms ({count / replay_s:.0f}/s)")
+
+
+if __name__ == "__main__":
+    main()
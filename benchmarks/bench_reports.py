@@ -0,0 +1,94 @@
+"""Benchmark de la liste des rapports: défilement complet de 100k rapports.
+
+Mesure la latence de chaque page (à comparer au budget d'une frame à 60 fps,
+16,7 ms) et la mémoire maximale de la fenêtre pendant le parcours.
+
+Usage: python benchmarks/bench_reports.py [--reports 100000] [--page-size 50]
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+import tracemalloc
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.database_service import DatabaseService
+from app.services.report_service import ReportPager
+
+FRAME_BUDGET_MS = 1000 / 60
+
+
+def generate_reports(count, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2020, 1, 1)
+    for i in range(count):
+        yield {
+            "title": f"Rapport de vol {i}",
+            "role": rng.choice(["pilot", "maintenance", "training", "admin"]),
+            "status": rng.choice(["pending", "approved", "approved", "rejected"]),
+            "created_at": start + timedelta(minutes=i * 7),
+        }
+
+
+def scroll(pager, filters):
+    """Parcourt toute la liste vers le bas puis remonte de 20 pages"""
+    timings = []
+    peak_rows = 0
+    tracemalloc.start()
+    pager.set_filters(**filters)
+    baseline, _ = tracemalloc.get_traced_memory()
+    tracemalloc.reset_peak()
+    while pager.has_next:
+        t0 = time.perf_counter()
+        pager.load_next()
+        timings.append((time.perf_counter() - t0) * 1000)
+        peak_rows = max(peak_rows, len(pager))
+    for _ in range(20):
+        if not pager.has_previous:
+            break
+        t0 = time.perf_counter()
+        pager.load_previous()
+        timings.append((time.perf_counter() - t0) * 1000)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return timings, peak_rows, peak - baseline
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la liste paginée des rapports")
+    parser.add_argument("--reports", type=int, default=100_000)
+    parser.add_argument("--page-size", type=int, default=50)
+    parser.add_argument("--max-pages", type=int, default=6)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(Path(tmp) / "bench.db")
+        t0 = time.perf_counter()
+        db.add_reports(generate_reports(args.reports))
+        print(f"Chargement: {args.reports} rapports en {time.perf_counter() - t0:.2f} s")
+
+        cases = {
+            "sans filtre": {},
+            "statut=pending": {"status": "pending"},
+            "rôle+statut": {"role": "pilot", "status": "approved"},
+            "intervalle 1 an": {"date_from": datetime(2020, 6, 1), "date_to": datetime(2021, 6, 1)},
+        }
+        for label, filters in cases.items():
+            pager = ReportPager(db, page_size=args.page_size, max_pages=args.max_pages)
+            timings, peak_rows, peak_bytes = scroll(pager, filters)
+            timings.sort()
+            p95 = timings[int(len(timings) * 0.95) - 1] if timings else 0.0
+            verdict = "OK" if p95 < FRAME_BUDGET_MS else "HORS BUDGET"
+            print(f"{label:<16} pages={len(timings):5d}  p50={timings[len(timings) // 2]:6.3f} ms  "
+                  f"p95={p95:6.3f} ms  [{verdict}]  fenêtre max={peak_rows} lignes  "
+                  f"mémoire max={peak_bytes / 1024:.0f} Ko")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
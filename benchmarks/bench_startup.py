@@ -0,0 +1,157 @@
+"""Benchmark du démarrage de l'application, avant/après le chargement différé.
+
+Chaque scénario s'exécute dans un interpréteur neuf (imports à froid):
+- avant: chemin de démarrage complet tel que main.py le faisait (tous les
+  services importés et construits, pyrebase initialisé, les quatre fichiers
+  KV analysés avec Builder.load_file);
+- après: chemin jusqu'au premier écran (services de démarrage, Firebase
+  différé, KV de l'écran d'accueil via le cache), puis à part le travail
+  reporté après le premier affichage.
+
+Les widgets KivyMD ne sont pas importés: ils sont identiques dans les deux
+scénarios. `scripts/import_audit.py main` donne le détail complet des imports.
+
+Usage: python benchmarks/bench_startup.py [--runs 5] [--output startup.json]
+"""
+import os
+import sys
+import json
+import time
+import argparse
+import statistics
+import subprocess
+import tempfile
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.append(str(ROOT))
+
+KV_FILES = ["splash_screen", "login_screen", "main_screen", "reports_screen"]
+# Configuration factice: pyrebase.initialize_app n'effectue aucun appel réseau
+FIREBASE_ENV = {
+    "FIREBASE_API_KEY": "bench", "FIREBASE_AUTH_DOMAIN": "bench.firebaseapp.com",
+    "FIREBASE_DATABASE_URL": "https://bench.firebaseio.com", "FIREBASE_PROJECT_ID": "bench",
+    "FIREBASE_STORAGE_BUCKET": "bench.appspot.com", "KIVY_NO_CONSOLELOG": "1", "KIVY_NO_ARGS": "1",
+}
+
+
+def worker_before(tmp: Path):
+    timings = {}
+    t0 = time.perf_counter()
+    from kivy.lang import Builder
+    from kivy.clock import Clock
+    from app.services.config_service import ConfigService
+    from app.services.firebase_service import FirebaseService
+    from app.services.database_service import DatabaseService
+    from app.services.validation_service import ValidationService
+    from app.services.workflow_service import WorkflowService
+    from app.services.role_service import RoleService
+    from app.services.metrics_service import start_exporters
+    from app.services.dashboard_service import DashboardService
+    t1 = time.perf_counter()
+    timings["imports"] = t1 - t0
+
+    config = ConfigService()
+    RoleService(config.get_roles(), config.get_role_aliases())
+    FirebaseService().initialize_firebase()
+    database = DatabaseService(tmp / "database.db")
+    ValidationService(database, workflows=config.get_workflows(), rules=config.get_validation_rules())
+    WorkflowService(database, config.get_workflows())
+    DashboardService()
+    t2 = time.perf_counter()
+    timings["services"] = t2 - t1
+
+    for name in KV_FILES:
+        Builder.load_file(str(ROOT / "app" / "views" / "kv" / f"{name}.kv"))
+    timings["kv"] = time.perf_counter() - t2
+    timings["first_screen"] = sum(timings.values())
+    return timings
+
+
+def worker_after(tmp: Path):
+    timings = {}
+    t0 = time.perf_counter()
+    from kivy.clock import Clock
+    from app.services.config_service import ConfigService
+    from app.services.firebase_service import FirebaseService
+    from app.services.role_service import RoleService
+    from app.services.metrics_service import start_exporters
+    from app.views.kv_cache import load_kv
+    t1 = time.perf_counter()
+    timings["imports"] = t1 - t0
+
+    config = ConfigService()
+    RoleService(config.get_roles(), config.get_role_aliases())
+    FirebaseService()
+    t2 = time.perf_counter()
+    timings["services"] = t2 - t1
+
+    load_kv(ROOT / "app" / "views" / "kv" / "splash_screen.kv", cache_dir=tmp / "kv")
+    t3 = time.perf_counter()
+    timings["kv"] = t3 - t2
+    timings["first_screen"] = sum(timings.values())
+
+    # Travail reporté après le premier affichage (équivalent de _init_data_services)
+    from app.services.database_service import DatabaseService
+    from app.services.validation_service import ValidationService
+    from app.services.workflow_service import WorkflowService
+    from app.services.dashboard_service import DashboardService
+    database = DatabaseService(tmp / "database.db")
+    ValidationService(database, workflows=config.get_workflows(), rules=config.get_validation_rules())
+    WorkflowService(database, config.get_workflows())
+    DashboardService()
+    for name in KV_FILES[1:]:
+        load_kv(ROOT / "app" / "views" / "kv" / f"{name}.kv", cache_dir=tmp / "kv")
+    timings["deferred"] = time.perf_counter() - t3
+    return timings
+
+
+def run_worker(scenario: str, tmp: Path) -> dict:
+    env = {**os.environ, **FIREBASE_ENV}
+    result = subprocess.run(
+        [sys.executable, __file__, "--worker", scenario, str(tmp)],
+        cwd=str(ROOT), env=env, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Scénario {scenario} en échec:\n{result.stderr[-2000:]}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du démarrage de l'application")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--output", help="Fichier JSON des résultats")
+    parser.add_argument("--worker", nargs=2, metavar=("SCENARIO", "TMP"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        scenario, tmp = args.worker
+        worker = worker_before if scenario == "before" else worker_after
+        print(json.dumps(worker(Path(tmp))))
+        return
+
+    report = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        # Premier passage: remplit le cache KV et le cache de bytecode
+        run_worker("after", Path(tmp))
+        run_worker("before", Path(tmp))
+        runs = {"before": [], "after": []}
+        for _ in range(args.runs):
+            for scenario in runs:
+                runs[scenario].append(run_worker(scenario, Path(tmp)))
+
+    for scenario, samples in runs.items():
+        report[scenario] = {key: statistics.median(s[key] for s in samples) * 1000 for key in samples[0]}
+        line = ", ".join(f"{key} {value:.0f} ms" for key, value in report[scenario].items())
+        print(f"{'Avant' if scenario == 'before' else 'Après'}: {line}")
+    gain = report["before"]["first_screen"] / report["after"]["first_screen"]
+    print(f"Jusqu'au premier écran: {report['before']['first_screen']:.0f} ms -> "
+          f"{report['after']['first_screen']:.0f} ms (x{gain:.1f})")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
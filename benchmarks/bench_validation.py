@@ -0,0 +1,88 @@
+"""Benchmark de la validation en lot des rapports en attente.
+
+Usage: python benchmarks/bench_validation.py [--reports 10000]
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.config_service import ConfigService
+from app.services.database_service import DatabaseService
+from app.services.validation_service import ValidationService
+
+WORKFLOWS = {
+    "flight_operation": ["pre_flight", "flight", "post_flight"],
+    "maintenance": ["inspection", "service", "validation"],
+    "training": ["theory", "practice", "evaluation"],
+}
+
+
+def populate(db, reports, seed=42):
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    aircraft = [db.add_aircraft(f"C-B{i:03d}", status="grounded" if i % 25 == 0 else "serviceable")
+                for i in range(50)]
+    pilots = [db.add_personnel(f"Pilote {i}", "pilot",
+                               currency_expires_at=(start + timedelta(days=rng.randint(-30, 700))).isoformat())
+              for i in range(200)]
+    db.add_maintenance_records(
+        {"aircraft_id": rng.choice(aircraft), "kind": "inspection",
+         "due_at": (start + timedelta(days=rng.randint(0, 365))).isoformat()}
+        for _ in range(500)
+    )
+    db.add_flights(
+        {"aircraft_id": rng.choice(aircraft), "pilot_id": rng.choice(pilots),
+         "started_at": start + timedelta(minutes=i * 30)}
+        for i in range(reports)
+    )
+    workflows = list(WORKFLOWS)
+    db.add_reports(
+        {"title": f"Rapport {i}", "role": "pilot", "flight_id": i + 1,
+         "workflow": workflows[0] if i % 4 else rng.choice(workflows),
+         "created_at": start + timedelta(minutes=i * 30)}
+        for i in range(reports)
+    )
+    db.add_report_steps(
+        {"report_id": report_id, "step": step}
+        for report_id, workflow in db.connect().execute("SELECT id, workflow FROM reports")
+        for step in WORKFLOWS[workflow] if rng.random() > 0.02
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark de la validation en lot")
+    parser.add_argument("--reports", type=int, default=10_000)
+    args = parser.parse_args()
+
+    try:
+        rules = ConfigService().get_validation_rules() or None
+    except Exception:
+        rules = None
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(Path(tmp) / "bench.db")
+        populate(db, args.reports)
+        service = ValidationService(db, WORKFLOWS, rules=rules)
+
+        dry = service.validate_pending(approve=False)
+        print(f"Vérification seule: {dry['checked']} rapports, {len(dry['failed'])} en échec "
+              f"en {dry['duration'] * 1000:.1f} ms")
+
+        t0 = time.perf_counter()
+        summary = service.validate_pending()
+        elapsed = time.perf_counter() - t0
+        verdict = "OK" if elapsed < 1.0 else "TROP LENT"
+        print(f"Validation: {summary['checked']} vérifiés, {summary['approved']} approuvés, "
+              f"{len(summary['failed'])} en échec en {elapsed * 1000:.1f} ms [{verdict}]")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Benchmark du moteur de workflows: transitions par seconde sur des milliers d'instances actives.
+
+Usage: python benchmarks/bench_workflow.py [--instances 5000] [--batch 500]
+"""
+import sys
+import time
+import random
+import argparse
+import tempfile
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.database_service import DatabaseService
+from app.services.workflow_service import WorkflowService
+
+WORKFLOWS = {
+    "flight_operation": ["pre_flight", "flight", "post_flight"],
+    "maintenance": ["inspection", "service", "validation"],
+    "training": ["theory", "practice", "evaluation"],
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark du moteur de workflows")
+    parser.add_argument("--instances", type=int, default=5000)
+    parser.add_argument("--batch", type=int, default=500)
+    args = parser.parse_args()
+
+    rng = random.Random(42)
+    with tempfile.TemporaryDirectory() as tmp:
+        db = DatabaseService(Path(tmp) / "bench.db")
+        engine = WorkflowService(db, WORKFLOWS)
+
+        t0 = time.perf_counter()
+        ids = engine.start_many((rng.choice(list(WORKFLOWS)), "flight", i) for i in range(args.instances))
+        elapsed = time.perf_counter() - t0
+        print(f"Démarrage: {len(ids)} instances en {elapsed * 1000:.1f} ms")
+
+        # Transitions par lots
+        rng.shuffle(ids)
+        transitions = 0
+        t0 = time.perf_counter()
+        for start in range(0, len(ids), args.batch):
+            transitions += engine.advance(ids[start:start + args.batch])
+        elapsed = time.perf_counter() - t0
+        print(f"Par lots de {args.batch}: {transitions} transitions en {elapsed * 1000:.1f} ms "
+              f"({transitions / elapsed:,.0f} transitions/s)")
+
+        # Transitions unitaires (une transaction chacune), pour comparaison
+        sample = ids[:min(500, len(ids))]
+        t0 = time.perf_counter()
+        for instance_id in sample:
+            engine.advance([instance_id])
+        elapsed = time.perf_counter() - t0
+        print(f"Unitaires: {len(sample)} transitions en {elapsed * 1000:.1f} ms "
+              f"({len(sample) / elapsed:,.0f} transitions/s)")
+
+        # Requête « toutes les opérations à l'étape X »
+        t0 = time.perf_counter()
+        for _ in range(100):
+            engine.in_step("flight_operation", "flight")
+        elapsed = (time.perf_counter() - t0) / 100
+        count = len(engine.in_step("flight_operation", "flight"))
+        print(f"in_step(flight_operation, flight): {count} instances en {elapsed * 1000:.3f} ms")
+        print(f"Répartition: {engine.count_by_step('flight_operation')}")
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import os
+import shutil
+import tempfile
+
+# Journaux et métriques des tests écrits dans un répertoire temporaire, pas
+# dans logs/. Fixé avant la collecte: certains modules de test créent des
+# services à l'import.
+_LOG_DIR = tempfile.mkdtemp(prefix="hc_test_logs_")
+
+
+def pytest_configure(config):
+    os.environ.setdefault("HC_LOG_DIR", _LOG_DIR)
+
+
+def pytest_unconfigure(config):
+    from app.services.logging_service import shutdown_logging
+    shutdown_logging()
+    shutil.rmtree(_LOG_DIR, ignore_errors=True)
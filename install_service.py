@@ -6,60 +6,80 @@ import socket
 import sys
 import os
 from pathlib import Path
-from app.services.backup_service import BackupService
+from app.services.backup_service import BackupService, CancellationToken
 from app.services.scheduler_service import SchedulerService
-import logging
+from app.services.replication_service import ReplicationService
+from app.services.database_service import DatabaseService
+from app.services.due_date_service import DueDateService
+from app.services.config_service import ConfigService
+from app.services.logging_service import get_logger, shutdown_logging
+from app.services.metrics_service import start_exporters
 
 class BackupWindowsService(win32serviceutil.ServiceFramework):
     _svc_name_ = "HC_RPAS_BackupService"
     _svc_display_name_ = "HC RPAS Backup Service"
     _svc_description_ = "Service de sauvegarde automatique pour HC RPAS"
+    # Délai maximal d'arrêt annoncé au gestionnaire de services (secondes)
+    _stop_timeout_ = 30
 
     def __init__(self, args):
         win32serviceutil.ServiceFramework.__init__(self, args)
         self.stop_event = win32event.CreateEvent(None, 0, 0, None)
         self.scheduler = None
+        self.replication = None
+        self.cancel_token = CancellationToken()
         
         # Configuration des logs
         log_dir = Path(os.path.dirname(os.path.abspath(__file__))) / "logs"
-        log_dir.mkdir(exist_ok=True)
-        
-        logging.basicConfig(
-            level=logging.INFO,
-            format='%(asctime)s - %(levelname)s - %(message)s',
-            filename=str(log_dir / "backup_service.log"),
-            filemode="a"
-        )
-        self.logger = logging.getLogger('BackupWindowsService')
+        self.logger = get_logger('BackupWindowsService', "backup_service.log", log_dir=log_dir)
+        self.metrics_dir = log_dir / "metrics"
 
     def SvcStop(self):
-        self.ReportServiceStatus(win32service.SERVICE_STOP_PENDING)
+        self.ReportServiceStatus(win32service.SERVICE_STOP_PENDING,
+                                 waitHint=self._stop_timeout_ * 1000)
+        # Interrompt une sauvegarde en cours entre deux blocs copiés
+        self.cancel_token.cancel()
         win32event.SetEvent(self.stop_event)
         if self.scheduler:
-            self.scheduler.stop()
+            self.scheduler.stop(timeout=self._stop_timeout_)
 
     def SvcDoRun(self):
         try:
             self.logger.info('Service démarré')
+            start_exporters("windows_service", self.metrics_dir)
             backup_service = BackupService()
             self.scheduler = SchedulerService()
+            self.replication = ReplicationService.from_config(ConfigService().get_replication_targets())
+            if self.replication:
+                self.replication.start()
             
             # Première sauvegarde
-            backup_path = backup_service.create_backup()
+            backup_path = backup_service.create_backup(cancel_token=self.cancel_token)
             if backup_path:
                 self.logger.info(f'Sauvegarde initiale créée: {backup_path}')
+                if self.replication:
+                    self.replication.replicate(backup_path)
+            if self.cancel_token.cancelled:
+                return
             
             # Démarrage du planificateur
-            self.scheduler.start(backup_service)
+            self.scheduler.start(backup_service, self.replication, DueDateService(DatabaseService()))
             self.logger.info('Planificateur démarré')
             
             # Attente du signal d'arrêt
             win32event.WaitForSingleObject(self.stop_event, win32event.INFINITE)
+            # Couvre un arrêt demandé pendant le démarrage du planificateur
+            self.scheduler.stop(timeout=self._stop_timeout_)
             
         except Exception as e:
             self.logger.error(f'Erreur dans le service: {str(e)}')
             if self.scheduler:
-                self.scheduler.stop()
+                self.scheduler.stop(timeout=self._stop_timeout_)
+        finally:
+            if self.replication:
+                self.replication.stop()
+            # Écrit les derniers enregistrements avant l'arrêt du processus
+            shutdown_logging()
 
 if __name__ == '__main__':
     if len(sys.argv) == 1:
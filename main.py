@@ -1,36 +1,56 @@
-from kivy.lang import Builder
-from kivymd.uix.screen import MDScreen
+import importlib
+from kivy.clock import Clock
 from kivymd.uix.screenmanager import MDScreenManager
 from kivymd.app import MDApp
 from kivy.uix.screenmanager import SlideTransition
-from dotenv import load_dotenv
 
-# Import des services
+# Seuls les services et l'écran nécessaires au premier affichage sont importés
+# au lancement; les autres le sont à la demande (voir scripts/import_audit.py)
 from app.services.config_service import ConfigService
 from app.services.firebase_service import FirebaseService
-
-# Import des écrans
+from app.services.role_service import RoleService
+from app.services.metrics_service import start_exporters
+from app.views.kv_cache import load_kv
 from app.views.screens.splash_screen import SplashScreen
-from app.views.screens.login_screen import LoginScreen
-from app.views.screens.main_screen import MainScreen
+
+# Écrans construits à la première navigation: nom -> (module, classe, fichier KV)
+LAZY_SCREENS = {
+    "login": ("app.views.screens.login_screen", "LoginScreen", "app/views/kv/login_screen.kv"),
+    "main": ("app.views.screens.main_screen", "MainScreen", "app/views/kv/main_screen.kv"),
+    "reports": ("app.views.screens.reports_screen", "ReportsScreen", "app/views/kv/reports_screen.kv"),
+}
 
 class MainScreenManager(MDScreenManager):
     def __init__(self, **kwargs):
+        self._screen_factory = kwargs.pop("screen_factory", None)
         super().__init__(**kwargs)
         self.transition = SlideTransition()
-        # Ajouter les écrans dans l'ordre
+        # Les autres écrans sont ajoutés par get_screen à leur première ouverture
         self.add_widget(SplashScreen())
-        self.add_widget(LoginScreen())
-        self.add_widget(MainScreen())
+        
+    def get_screen(self, name):
+        """Retourne l'écran demandé en le construisant s'il n'est pas encore chargé"""
+        if self._screen_factory and name in LAZY_SCREENS and not self.has_screen(name):
+            self.add_widget(self._screen_factory(name))
+        return super().get_screen(name)
 
 class HCApp(MDApp):
     def __init__(self, **kwargs):
         super().__init__(**kwargs)
         self.config_service = None
         self.firebase_service = None
+        self.database_service = None
+        self.pitr_service = None
+        self.validation_service = None
+        self.workflow_service = None
+        self.dashboard_service = None
+        self.documentation_service = None
+        self.due_date_service = None
+        self.role_service = None
         
     def build(self):
         # Charge les variables d'environnement
+        from dotenv import load_dotenv
         load_dotenv()
         
         # Configure le thème
@@ -42,15 +62,27 @@ class HCApp(MDApp):
         # Charge les fichiers KV
         self._load_kv_files()
         
-        return MainScreenManager()
+        # Les services de données démarrent après le premier affichage
+        Clock.schedule_once(lambda dt: self._init_data_services())
+        
+        return MainScreenManager(screen_factory=self._create_screen)
         
     def _init_services(self):
-        """Initialise les services de l'application"""
+        """Initialise les services nécessaires au premier affichage"""
         try:
+            # Export des métriques de l'application (logs/metrics/app.prom)
+            start_exporters("app")
+            
             # Initialise le service de configuration
             self.config_service = ConfigService()
             
-            # Initialise Firebase
+            # Précalcule les éléments d'interface visibles par rôle
+            self.role_service = RoleService(
+                self.config_service.get_roles(),
+                self.config_service.get_role_aliases()
+            )
+            
+            # Initialise Firebase (pyrebase est chargé au premier appel)
             self.firebase_service = FirebaseService()
             
             print("Services initialisés avec succès")
@@ -58,11 +90,101 @@ class HCApp(MDApp):
             print(f"Erreur lors de l'initialisation des services: {str(e)}")
             raise
         
+    def _init_data_services(self):
+        """Initialise la base locale, les workflows et le dashboard (une seule fois)"""
+        if self.database_service is not None:
+            return
+        from app.services.database_service import DatabaseService
+        from app.services.pitr_service import PitrService
+        from app.services.validation_service import ValidationService
+        from app.services.workflow_service import WorkflowService
+        from app.services.due_date_service import DueDateService
+        try:
+            # Initialise la base opérationnelle locale
+            self.database_service = DatabaseService()
+            # Capture continue des modifications entre deux sauvegardes
+            self.pitr_service = PitrService(self.database_service.db_path)
+            self.pitr_service.start()
+            self.validation_service = ValidationService(
+                self.database_service,
+                workflows=self.config_service.get_workflows(),
+                rules=self.config_service.get_validation_rules()
+            )
+            self.workflow_service = WorkflowService(
+                self.database_service,
+                self.config_service.get_workflows(),
+                step_map=self.config_service.get_workflow_step_map(),
+                # Instances sans correspondance signalées sans empêcher le démarrage
+                strict=False
+            )
+            # Échéances de maintenance et de certifications (index trié par date)
+            self.due_date_service = DueDateService(self.database_service)
+            
+            self._init_dashboard()
+            self.due_date_service.start(self._on_due_alert)
+            
+            # Index de la documentation, mis à jour en arrière-plan
+            if "documentation" in self.config_service.get_active_modules():
+                from app.services.documentation_service import DocumentationService
+                self.documentation_service = DocumentationService()
+                self.documentation_service.start()
+            
+            print("Services de données initialisés avec succès")
+        except Exception as e:
+            print(f"Erreur lors de l'initialisation des services de données: {str(e)}")
+            raise
+        
+    def _create_screen(self, name):
+        """Importe et construit un écran à sa première ouverture"""
+        module_name, class_name, kv_file = LAZY_SCREENS[name]
+        if name != "login":
+            self._init_data_services()
+        screen_class = getattr(importlib.import_module(module_name), class_name)
+        load_kv(kv_file)
+        return screen_class()
+        
+    def on_stop(self):
+        """Arrête les services de fond et expédie les dernières modifications capturées"""
+        if self.dashboard_service:
+            self.dashboard_service.shutdown()
+        if self.pitr_service:
+            self.pitr_service.stop()
+        if self.documentation_service:
+            self.documentation_service.close()
+        if self.due_date_service:
+            self.due_date_service.stop()
+        
+    def _on_due_alert(self, items, lead):
+        """Rafraîchit les alertes de maintenance dès qu'une échéance est atteinte"""
+        if self.dashboard_service and "maintenance_alerts" in self.dashboard_service.widgets:
+            self.dashboard_service.invalidate("maintenance_alerts")
+        
+    def _init_dashboard(self):
+        """Déclare les widgets du dashboard listés dans la configuration"""
+        from app.services.dashboard_service import (
+            DashboardService, DashboardWidget,
+            active_flights_source, maintenance_alerts_source, weather_source
+        )
+        layout = self.config_service.get_ui_config().get('layouts', {}).get('dashboard', {})
+        intervals = layout.get('refresh_intervals', {})
+        sources = {
+            "active_flights": lambda: active_flights_source(self.workflow_service),
+            "maintenance_alerts": lambda: maintenance_alerts_source(self.due_date_service),
+            "weather": lambda: weather_source(self.firebase_service.get_sync_service()),
+        }
+        
+        self.dashboard_service = DashboardService()
+        for name in layout.get('default_widgets', []):
+            if name not in sources:
+                print(f"Widget de dashboard inconnu ignoré: {name}")
+                continue
+            self.dashboard_service.register(
+                DashboardWidget(name, sources[name](), refresh_interval=intervals.get(name, 30))
+            )
+        
     def _load_kv_files(self):
-        """Charge tous les fichiers KV"""
-        Builder.load_file("app/views/kv/splash_screen.kv")
-        Builder.load_file("app/views/kv/login_screen.kv")
-        Builder.load_file("app/views/kv/main_screen.kv")
+        """Charge le fichier KV de l'écran d'accueil (les autres avec leur écran)"""
+        load_kv("app/views/kv/splash_screen.kv")
 
 if __name__ == "__main__":
     HCApp().run()
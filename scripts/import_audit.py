@@ -0,0 +1,82 @@
+"""Audit du temps d'import au démarrage de l'application (python -X importtime).
+
+Importe le module demandé dans un processus neuf et affiche les imports les
+plus coûteux, en cumulé (avec leurs dépendances) et par paquet.
+
+Usage: python scripts/import_audit.py [main] [--top 25] [--json audit.json]
+"""
+import re
+import sys
+import json
+import argparse
+import subprocess
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S.*)$")
+
+
+def parse_importtime(text):
+    """Retourne les imports [(module, propre µs, cumulé µs, profondeur)] dans l'ordre de la sortie"""
+    entries = []
+    for line in text.splitlines():
+        match = LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            entries.append((name.strip(), int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return entries
+
+
+def run_audit(module="main"):
+    """Importe `module` avec -X importtime. Retourne (imports, erreur éventuelle)"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=str(ROOT), capture_output=True, text=True
+    )
+    entries = parse_importtime(result.stderr)
+    error = None
+    if result.returncode != 0:
+        others = [line for line in result.stderr.splitlines() if not line.startswith("import time:")]
+        error = others[-1] if others else f"code de retour {result.returncode}"
+    return entries, error
+
+
+def by_package(entries):
+    """Temps propre cumulé par paquet de premier niveau, en µs"""
+    totals = {}
+    for name, self_us, _, _ in entries:
+        package = name.split(".")[0]
+        totals[package] = totals.get(package, 0) + self_us
+    return sorted(totals.items(), key=lambda item: item[1], reverse=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit du temps d'import au démarrage")
+    parser.add_argument("module", nargs="?", default="main", help="Module importé (défaut: main)")
+    parser.add_argument("--top", type=int, default=25, help="Nombre d'imports affichés")
+    parser.add_argument("--json", help="Écrit le détail des imports dans ce fichier")
+    args = parser.parse_args()
+
+    entries, error = run_audit(args.module)
+    total_ms = sum(e[1] for e in entries) / 1000
+    print(f"import {args.module}: {total_ms:.0f} ms, {len(entries)} modules")
+    if error:
+        print(f"Import interrompu: {error}")
+
+    print(f"\n{'Cumulé (ms)':>12} {'Propre (ms)':>12}  Module")
+    for name, self_us, cumulative_us, depth in sorted(entries, key=lambda e: e[2], reverse=True)[:args.top]:
+        print(f"{cumulative_us / 1000:>12.1f} {self_us / 1000:>12.1f}  {'  ' * depth}{name}")
+
+    print(f"\n{'Propre (ms)':>12}  Paquet")
+    for package, self_us in by_package(entries)[:args.top]:
+        print(f"{self_us / 1000:>12.1f}  {package}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"module": args.module, "total_ms": total_ms, "error": error,
+                       "imports": [dict(zip(("module", "self_us", "cumulative_us", "depth"), e))
+                                   for e in entries]}, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
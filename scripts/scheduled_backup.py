@@ -3,7 +3,6 @@ import os
 from pathlib import Path
 import schedule
 import time
-import logging
 from datetime import datetime
 
 # Ajouter le répertoire parent au PYTHONPATH
@@ -12,18 +11,12 @@ root_dir = current_dir.parent
 sys.path.append(str(root_dir))
 
 from app.services.backup_service import BackupService
+from app.services.logging_service import get_logger
+from app.services.metrics_service import start_exporters
 
 def setup_logging():
     """Configure le système de logs"""
-    log_dir = root_dir / "logs"
-    log_dir.mkdir(exist_ok=True)
-    
-    logging.basicConfig(
-        filename=log_dir / "scheduled_backup.log",
-        level=logging.INFO,
-        format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-    )
-    return logging.getLogger("ScheduledBackup")
+    return get_logger("ScheduledBackup", "scheduled_backup.log", log_dir=root_dir / "logs")
 
 def perform_backup():
     """Exécute une sauvegarde"""
@@ -56,6 +49,7 @@ def perform_backup():
 def main():
     """Fonction principale"""
     logger = setup_logging()
+    start_exporters("scheduled_backup", root_dir / "logs" / "metrics")
     logger.info("Démarrage du service de sauvegarde programmée")
     print("\nService de sauvegarde automatique démarré")
     print("Les sauvegardes seront effectuées :")
@@ -0,0 +1,111 @@
+"""Affiche les métriques exportées par l'application et les services de sauvegarde.
+
+Usage: python scripts/stats.py [--dir logs/metrics] [--url http://127.0.0.1:9100/metrics]
+"""
+import re
+import sys
+import argparse
+import urllib.request
+from pathlib import Path
+
+# Ajouter le répertoire parent au PYTHONPATH
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+from app.services.metrics_service import METRICS_DIR
+
+SAMPLE = re.compile(r'^([a-zA-Z_:][\w:]*)(?:\{(.*)\})?\s+(\S+)$')
+LABEL = re.compile(r'(\w+)="((?:[^"\\]|\\.)*)"')
+ESCAPE = re.compile(r'\\(.)')
+
+
+def unescape(value):
+    """Inverse l'échappement des valeurs d'étiquettes (\\\\, \\" et \\n)"""
+    return ESCAPE.sub(lambda m: "\n" if m.group(1) == "n" else m.group(1), value)
+
+
+def parse(text):
+    """Retourne {métrique: (type, {labels: valeur | histogramme})} depuis le format Prometheus"""
+    types = {}
+    samples = {}
+    for line in text.splitlines():
+        if line.startswith("# TYPE"):
+            _, _, name, kind = line.split(None, 3)
+            types[name] = kind
+            samples.setdefault(name, {})
+            continue
+        match = SAMPLE.match(line)
+        if not match:
+            continue
+        name, labels, value = match.groups()
+        labels = {key: unescape(raw) for key, raw in LABEL.findall(labels or "")}
+        for suffix in ("_bucket", "_sum", "_count"):
+            base = name[:-len(suffix)]
+            if name.endswith(suffix) and types.get(base) == "histogram":
+                le = labels.pop("le", None)
+                key = tuple(sorted(labels.items()))
+                hist = samples[base].setdefault(key, {"buckets": [], "sum": 0.0, "count": 0})
+                if suffix == "_bucket":
+                    hist["buckets"].append((float(le), float(value)))
+                else:
+                    hist[suffix[1:]] = float(value)
+                break
+        else:
+            samples.setdefault(name, {})[tuple(sorted(labels.items()))] = float(value)
+    return {name: (types.get(name, "untyped"), values) for name, values in samples.items()}
+
+
+def quantile(hist, q):
+    """Borne supérieure du seau contenant le quantile q"""
+    target = q * hist["count"]
+    for bound, cumulative in hist["buckets"]:
+        if cumulative >= target:
+            return bound
+    return float("inf")
+
+
+def format_seconds(value):
+    if value == float("inf"):
+        return "+Inf"
+    return f"{value * 1000:.1f} ms" if value < 1 else f"{value:.2f} s"
+
+
+def show(title, metrics):
+    print(f"\n== {title} ==")
+    for name, (kind, values) in sorted(metrics.items()):
+        if not values:
+            continue
+        print(name)
+        for key, value in sorted(values.items()):
+            labels = ", ".join(f"{k}={v}" for k, v in key) or "-"
+            if kind == "histogram":
+                count = int(value["count"])
+                mean = value["sum"] / count if count else 0.0
+                seconds = name.endswith("_seconds")
+                fmt = format_seconds if seconds else (lambda v: f"{v:g}")
+                print(f"  {labels:<28} n={count:<6} moy={fmt(mean):<10} "
+                      f"p50≤{fmt(quantile(value, 0.5)):<10} p95≤{fmt(quantile(value, 0.95))}")
+            else:
+                print(f"  {labels:<28} {value:g}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Affiche les métriques collectées")
+    parser.add_argument("--dir", default=str(METRICS_DIR), help="Répertoire des fichiers .prom")
+    parser.add_argument("--url", help="Point d'accès HTTP des métriques d'un processus en cours")
+    args = parser.parse_args()
+
+    if args.url:
+        with urllib.request.urlopen(args.url, timeout=5) as response:
+            show(args.url, parse(response.read().decode("utf-8")))
+        return
+
+    files = sorted(Path(args.dir).glob("*.prom"))
+    if not files:
+        print(f"Aucune métrique trouvée dans {args.dir}")
+        return
+    for path in files:
+        show(path.stem, parse(path.read_text(encoding="utf-8")))
+
+
+if __name__ == "__main__":
+    main()
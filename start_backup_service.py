@@ -1,7 +1,12 @@
 from app.services.backup_service import BackupService
 from app.services.scheduler_service import SchedulerService
+from app.services.replication_service import ReplicationService
+from app.services.database_service import DatabaseService
+from app.services.due_date_service import DueDateService
+from app.services.config_service import ConfigService
+from app.services.logging_service import get_logger
+from app.services.metrics_service import start_exporters
 import time
-import logging
 from pathlib import Path
 import argparse
 
@@ -9,20 +14,13 @@ def main():
     # Parse les arguments
     parser = argparse.ArgumentParser(description='Service de sauvegarde automatique')
     parser.add_argument('--test', action='store_true', help='Effectue une seule sauvegarde et quitte')
+    parser.add_argument('--replication-timeout', type=float, default=300.0,
+                        help='Attente maximale de la réplication en mode test (secondes)')
     args = parser.parse_args()
 
     # 1. Configuration des logs
-    log_dir = Path("logs")
-    log_dir.mkdir(exist_ok=True)
-    
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.StreamHandler(),
-            logging.FileHandler(log_dir / "backup.log")
-        ]
-    )
+    logger = get_logger("BackupLauncher", "backup.log", console=True)
+    start_exporters("backup_service")
     
     # 2. Création des répertoires
     data_dir = Path("data")
@@ -31,55 +29,79 @@ def main():
     
     for d in [data_dir, backup_dir, config_dir]:
         d.mkdir(exist_ok=True)
-        logging.info(f"Répertoire créé/vérifié: {d}")
+        logger.info(f"Répertoire créé/vérifié: {d}")
     
     # 3. Initialisation des services
     try:
         backup_service = BackupService()
+        replication = ReplicationService.from_config(ConfigService().get_replication_targets())
         if not args.test:
             scheduler = SchedulerService()
-        logging.info("Services initialisés avec succès")
+            # Alertes d'échéance (maintenance, certifications) à l'heure exacte
+            due_dates = DueDateService(DatabaseService())
+        logger.info("Services initialisés avec succès")
     except Exception as e:
-        logging.error(f"Erreur d'initialisation des services: {e}")
+        logger.error(f"Erreur d'initialisation des services: {e}")
         return
     
     # 4. Sauvegarde
     try:
         backup_path = backup_service.create_backup()
         if backup_path:
-            logging.info(f"Sauvegarde créée: {backup_path}")
+            logger.info(f"Sauvegarde créée: {backup_path}")
+            if replication:
+                replication.start()
+                replication.replicate(backup_path)
         else:
-            logging.error("Échec de la sauvegarde")
+            logger.error("Échec de la sauvegarde")
             return
     except Exception as e:
-        logging.error(f"Erreur lors de la sauvegarde: {e}")
+        logger.error(f"Erreur lors de la sauvegarde: {e}")
         return
     
     # Si mode test, on s'arrête ici
     if args.test:
-        logging.info("Test terminé avec succès")
+        if replication:
+            replicated = replication.wait_idle(timeout=args.replication_timeout)
+            if not replicated:
+                for name, status in replication.get_status().items():
+                    if status["pending"]:
+                        logger.error(f"Réplication inachevée sur {name}: {', '.join(status['pending'])} "
+                                     f"(dernière erreur: {status['last_error']})")
+            replication.stop()
+            if not replicated:
+                logger.error(f"Test interrompu après {args.replication_timeout:.0f} s d'attente de la réplication")
+                return
+        logger.info("Test terminé avec succès")
         return
         
     # 5. Démarrage du planificateur
     try:
-        scheduler.start(backup_service)
-        logging.info("Planificateur démarré")
-        logging.info("Configuration des sauvegardes :")
-        logging.info("- Tous les jours à 3h du matin")
-        logging.info("- Toutes les 6 heures")
-        logging.info("Les 5 sauvegardes les plus récentes seront conservées")
-        logging.info("\nAppuyez sur Ctrl+C pour arrêter...")
+        scheduler.start(backup_service, replication, due_dates)
+        logger.info("Planificateur démarré")
+        logger.info("Configuration des sauvegardes :")
+        logger.info("- Tous les jours à 3h du matin")
+        logger.info("- Toutes les 6 heures")
+        logger.info("Les 5 sauvegardes les plus récentes seront conservées")
+        if replication:
+            logger.info(f"- Répliquées vers: {', '.join(t.name for t in replication.targets)}")
+        logger.info("Échéances de maintenance et de certifications signalées à l'heure exacte")
+        logger.info("\nAppuyez sur Ctrl+C pour arrêter...")
         
         while True:
             time.sleep(1)
             
     except KeyboardInterrupt:
-        logging.info("\nArrêt demandé...")
+        logger.info("\nArrêt demandé...")
         scheduler.stop()
-        logging.info("Service arrêté")
+        if replication:
+            replication.stop()
+        logger.info("Service arrêté")
     except Exception as e:
-        logging.error(f"Erreur inattendue: {e}")
+        logger.error(f"Erreur inattendue: {e}")
         scheduler.stop()
+        if replication:
+            replication.stop()
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,90 @@
+import json
+import shutil
+import sqlite3
+import asyncio
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from app.services.async_backup_service import AsyncBackupService, create_backups
+
+
+def make_dataset(data_dir: Path, files: int = 200, rows: int = 1000):
+    (data_dir / "config").mkdir(parents=True)
+    for i in range(files):
+        group = data_dir / "config" / f"group_{i // 50}"
+        group.mkdir(exist_ok=True)
+        with open(group / f"config_{i}.json", "w") as f:
+            json.dump({"id": i}, f)
+    conn = sqlite3.connect(str(data_dir / "database.db"))
+    conn.execute("CREATE TABLE blobs (data BLOB)")
+    conn.executemany("INSERT INTO blobs VALUES (randomblob(?))", [(4096,)] * rows)
+    conn.commit()
+    conn.close()
+
+
+class TestAsyncBackupService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix="test-io")
+
+    def tearDown(self):
+        self.executor.shutdown()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _service(self, name="data"):
+        make_dataset(self.tmp / name)
+        return AsyncBackupService(self.tmp / name, executor=self.executor)
+
+    async def test_create_verify_restore(self):
+        """Test le cycle complet sauvegarde, liste, vérification et restauration"""
+        service = self._service()
+        backup_path = await service.create()
+        self.assertIsNotNone(backup_path)
+        self.assertTrue(await service.verify(backup_path))
+
+        backups = await service.list()
+        self.assertEqual([b["path"] for b in backups], [backup_path])
+        self.assertEqual(len(backups[0]["files"]), 201)
+
+        shutil.rmtree(service.config_dir)
+        self.assertTrue(await service.restore(backup_path))
+        self.assertEqual(len(list(service.config_dir.rglob("*.json"))), 200)
+
+        corrupted = Path(backup_path) / "config" / "group_3" / "config_170.json"
+        corrupted.write_text("{}")
+        self.assertFalse(await service.verify(backup_path))
+
+    async def test_concurrent_targets_share_io_limit(self):
+        """Test la sauvegarde parallèle de plusieurs cibles sur le pool d'E/S borné"""
+        services = [self._service(f"target_{i}") for i in range(3)]
+        threads = set()
+        results = await create_backups(services, progress=lambda e: threads.add(threading.current_thread().name))
+        self.assertTrue(all(results))
+        workers = {name for name in threads if name.startswith("test-io")}
+        self.assertLessEqual(len(workers), 2)
+        self.assertTrue(workers)
+        for service, path in zip(services, results):
+            self.assertTrue(await service.verify(path))
+
+    async def test_task_cancellation_cleans_up(self):
+        """Test qu'une tâche annulée ne laisse aucun répertoire partiel"""
+        service = self._service()
+        started = asyncio.Event()
+        loop = asyncio.get_running_loop()
+
+        def on_progress(event):
+            if event.bytes_done > 0:
+                loop.call_soon_threadsafe(started.set)
+
+        task = asyncio.create_task(service.create(progress=on_progress))
+        await asyncio.wait_for(started.wait(), 5)
+        task.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await task
+        self.assertEqual(list(service.backup_dir.iterdir()), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
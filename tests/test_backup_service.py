@@ -1,8 +1,10 @@
 import unittest
 from pathlib import Path
 import shutil
+import sqlite3
+import tempfile
 import json
-from app.services.backup_service import BackupService
+from app.services.backup_service import BackupService, CancellationToken
 
 class TestBackupService(unittest.TestCase):
     def setUp(self):
@@ -41,6 +43,18 @@ class TestBackupService(unittest.TestCase):
         self.assertTrue(result)
         self.assertTrue(Path("data/config").exists())
         
+    def test_verify_backup(self):
+        """Test la détection d'un fichier manquant ou corrompu dans une sauvegarde"""
+        backup_path = Path(self.backup_service.create_backup())
+        self.assertTrue(self.backup_service.verify_backup(str(backup_path)))
+        
+        config_file = next((backup_path / "config").rglob("*.json"))
+        config_file.write_text("{}")
+        self.assertFalse(self.backup_service.verify_backup(str(backup_path)))
+        
+        config_file.unlink()
+        self.assertFalse(self.backup_service.verify_backup(str(backup_path)))
+        
     def test_rotate_backups(self):
         """Test la rotation des sauvegardes"""
         # Créer plusieurs sauvegardes
@@ -66,5 +80,153 @@ class TestBackupService(unittest.TestCase):
             self.assertIn("version", backup)
             self.assertIn("path", backup)
 
+class TestBackupProgress(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.data_dir = self.tmp / "data"
+        (self.data_dir / "config" / "roles").mkdir(parents=True)
+        for i in range(5):
+            with open(self.data_dir / "config" / "roles" / f"role_{i}.json", "w") as f:
+                json.dump({"role": i}, f)
+                
+        # Base de quelques Mo pour que la copie se fasse en plusieurs blocs
+        conn = sqlite3.connect(str(self.data_dir / "database.db"))
+        conn.execute("CREATE TABLE blobs (data BLOB)")
+        conn.executemany("INSERT INTO blobs VALUES (randomblob(?))", [(4096,)] * 1000)
+        conn.commit()
+        conn.close()
+        self.backup_service = BackupService(data_dir=self.data_dir)
+        
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        
+    def test_progress_events(self):
+        """Test les événements de progression d'une sauvegarde"""
+        events = []
+        backup_path = self.backup_service.create_backup(progress=events.append)
+        self.assertIsNotNone(backup_path)
+        
+        self.assertEqual(list(dict.fromkeys(e.phase for e in events)), ["sqlite", "configs", "manifest"])
+        done = [e.bytes_done for e in events]
+        self.assertEqual(done, sorted(done))
+        self.assertEqual(events[-1].bytes_done, events[-1].bytes_total)
+        self.assertEqual(events[-1].eta, 0)
+        self.assertGreater(sum(1 for e in events if e.phase == "sqlite"), 2)
+        
+    def test_cancelled_backup_leaves_nothing(self):
+        """Test qu'une sauvegarde annulée ne laisse aucun répertoire"""
+        token = CancellationToken()
+        
+        def cancel_midway(event):
+            if event.bytes_done > 0:
+                token.cancel()
+                
+        self.assertIsNone(self.backup_service.create_backup(progress=cancel_midway, cancel_token=token))
+        self.assertEqual(list(self.backup_service.backup_dir.iterdir()), [])
+        
+    def test_cancelled_restore_keeps_data(self):
+        """Test qu'une restauration annulée laisse les données en place"""
+        backup_path = self.backup_service.create_backup()
+        conn = sqlite3.connect(str(self.data_dir / "database.db"))
+        conn.execute("DELETE FROM blobs")
+        conn.commit()
+        conn.close()
+        shutil.rmtree(self.data_dir / "config" / "roles")
+        
+        token = CancellationToken()
+        
+        def cancel_in_sqlite(event):
+            if event.phase == "sqlite" and event.bytes_done > event.bytes_total // 2:
+                token.cancel()
+                
+        self.assertFalse(self.backup_service.restore_backup(backup_path, cancel_in_sqlite, token))
+        conn = sqlite3.connect(str(self.data_dir / "database.db"))
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM blobs").fetchone()[0], 0)
+        conn.close()
+        self.assertFalse((self.data_dir / "config" / "roles").exists())
+        self.assertFalse((self.data_dir / "config.partial").exists())
+        
+        self.assertTrue(self.backup_service.restore_backup(backup_path))
+        self.assertEqual(len(list((self.data_dir / "config" / "roles").iterdir())), 5)
+
+class TestSelectiveRestore(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.data_dir = self.tmp / "data"
+        self.roles = self.data_dir / "config" / "roles"
+        self.roles.mkdir(parents=True)
+        for i in range(5):
+            with open(self.roles / f"role_{i}.json", "w") as f:
+                json.dump({"role": i}, f)
+        self.backup_service = BackupService(data_dir=self.data_dir)
+        
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+        
+    def _backups(self):
+        """Une sauvegarde sous forme de répertoire et la même compressée"""
+        backup_path = self.backup_service.create_backup()
+        copy = Path(backup_path).with_name(Path(backup_path).name + "_copy")
+        shutil.copytree(backup_path, copy)
+        archive = self.backup_service.archive_backup(str(copy))
+        self.assertTrue(archive.endswith(".zip"))
+        self.assertFalse(copy.exists())
+        return {"répertoire": backup_path, "archive": archive}
+        
+    def test_restore_single_file(self):
+        """Test la restauration d'un seul fichier depuis un répertoire ou une archive"""
+        for kind, backup_path in self._backups().items():
+            with self.subTest(kind):
+                (self.roles / "role_1.json").write_text("modifié")
+                (self.roles / "role_2.json").write_text("modifié")
+                self.assertTrue(self.backup_service.restore_file(backup_path, "config/roles/role_1.json"))
+                self.assertEqual(json.loads((self.roles / "role_1.json").read_text()), {"role": 1})
+                self.assertEqual((self.roles / "role_2.json").read_text(), "modifié")
+                self.assertFalse(self.backup_service.restore_file(backup_path, "config/roles/absent.json"))
+                self.assertFalse(self.backup_service.restore_file(backup_path, "../config/roles/role_1.json"))
+                
+    def test_list_and_verify_archive(self):
+        """Test l'index, la vérification et la restauration complète d'une archive"""
+        archive = self._backups()["archive"]
+        index = self.backup_service.list_backup_files(archive)
+        self.assertEqual(sorted(index), [f"config/roles/role_{i}.json" for i in range(5)])
+        self.assertEqual(index["config/roles/role_0.json"]["size"], (self.roles / "role_0.json").stat().st_size)
+        self.assertTrue(self.backup_service.verify_backup(archive))
+        self.assertIn(archive, [b["path"] for b in self.backup_service.get_backup_list()])
+        
+        shutil.rmtree(self.roles)
+        self.assertTrue(self.backup_service.restore_backup(archive))
+        self.assertEqual(len(list(self.roles.iterdir())), 5)
+        self.assertFalse(Path(archive + ".partial").exists())
+        
+    def test_diff_between_backups_reads_nothing(self):
+        """Test qu'une comparaison entre sauvegardes se fait sur les index seuls"""
+        first = self.backup_service.create_backup()
+        (self.roles / "role_1.json").write_text(json.dumps({"role": 9}))
+        (self.roles / "role_2.json").unlink()
+        (self.roles / "role_5.json").write_text("{}")
+        second = self.backup_service.create_backup()
+        archive = self.backup_service.archive_backup(second)
+        
+        diff = self.backup_service.diff_backups(first, archive)
+        self.assertEqual(diff["added"], ["config/roles/role_5.json"])
+        self.assertEqual(diff["removed"], ["config/roles/role_2.json"])
+        self.assertEqual(diff["modified"], ["config/roles/role_1.json"])
+        self.assertEqual(diff["unchanged"], 3)
+        self.assertEqual(diff["bytes_read"], 0)
+        
+    def test_diff_against_live_reads_changed_files_only(self):
+        """Test que la comparaison aux données en place ne relit que les fichiers touchés"""
+        backup_path = self.backup_service.create_backup()
+        diff = self.backup_service.diff_backups(backup_path)
+        self.assertEqual((diff["modified"], diff["unchanged"], diff["bytes_read"]), ([], 5, 0))
+        
+        # Même taille, contenu différent: seule la version en place est relue
+        touched = self.roles / "role_1.json"
+        touched.write_text(json.dumps({"role": 7}))
+        diff = self.backup_service.diff_backups(backup_path)
+        self.assertEqual(diff["modified"], ["config/roles/role_1.json"])
+        self.assertEqual(diff["bytes_read"], touched.stat().st_size)
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,145 @@
+import unittest
+import threading
+from concurrent.futures import wait
+from app.services.dashboard_service import DashboardService, DashboardWidget
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestDashboardService(unittest.TestCase):
+    def setUp(self):
+        self.clock = FakeClock()
+        self.dashboard = DashboardService(clock=self.clock)
+        self.values = {"flights": {"count": 1}, "alerts": {"count": 0}}
+        self.calls = {"flights": 0, "alerts": 0}
+
+        def source(name):
+            def fetch():
+                self.calls[name] += 1
+                return self.values[name]
+            return fetch
+
+        self.dashboard.register(DashboardWidget("flights", source("flights"), refresh_interval=10))
+        self.dashboard.register(DashboardWidget("alerts", source("alerts"), refresh_interval=60))
+
+    def tearDown(self):
+        self.dashboard.shutdown()
+
+    def _poll(self):
+        wait(self.dashboard.poll())
+
+    def _render_all(self):
+        rendered = []
+        for widget in self.dashboard.changed():
+            rendered.append(widget.name)
+            self.dashboard.mark_rendered(widget, widget.version, 0.001)
+        return sorted(rendered)
+
+    def test_redraw_only_on_change(self):
+        """Test qu'un widget n'est redessiné que si ses données changent"""
+        self._poll()
+        self.assertEqual(self._render_all(), ["alerts", "flights"])
+
+        self.clock.now += 10
+        self._poll()
+        self.assertEqual(self.calls["flights"], 2)
+        self.assertEqual(self._render_all(), [])
+
+        self.values["flights"] = {"count": 2}
+        self.clock.now += 10
+        self._poll()
+        self.assertEqual(self._render_all(), ["flights"])
+        self.assertEqual(self.dashboard.widgets["flights"].version, 2)
+
+    def test_refresh_interval_and_ttl(self):
+        """Test le respect des intervalles de rafraîchissement et de la durée de validité"""
+        self._poll()
+        self.clock.now += 30
+        self._poll()
+        self.assertEqual(self.calls, {"flights": 2, "alerts": 1})
+
+        self.assertEqual(self.dashboard.get_data("alerts"), {"count": 0})
+        self.clock.now += 200
+        self.assertIsNone(self.dashboard.get_data("alerts"))
+        self.assertTrue(self.dashboard.is_stale("alerts"))
+
+    def test_concurrent_fetch(self):
+        """Test que les sources sont interrogées en parallèle, hors du thread appelant"""
+        barrier = threading.Barrier(2, timeout=5)
+        dashboard = DashboardService(max_workers=2)
+        dashboard.register(DashboardWidget("a", lambda: barrier.wait()))
+        dashboard.register(DashboardWidget("b", lambda: barrier.wait()))
+        futures = dashboard.poll()
+        wait(futures, timeout=5)
+        self.assertEqual([w.error for w in dashboard.widgets.values()], [None, None])
+        dashboard.shutdown()
+
+    def test_errors_and_timings(self):
+        """Test que les erreurs de source conservent les dernières données et que les durées sont exposées"""
+        self._poll()
+        self._render_all()
+
+        def failing():
+            raise ConnectionError("hors-ligne")
+        self.dashboard.widgets["flights"].fetch = failing
+        self.clock.now += 10
+        self._poll()
+
+        timings = self.dashboard.get_timings()
+        self.assertEqual(timings["flights"]["error"], "hors-ligne")
+        self.assertEqual(self.dashboard.get_data("flights"), {"count": 1})
+        self.assertIsNotNone(timings["alerts"]["fetch_ms"])
+        self.assertIsNotNone(timings["alerts"]["render_ms"])
+
+    def test_stale_widget_redrawn(self):
+        """Test qu'un widget est redessiné quand ses données expirent puis redeviennent valides"""
+        self._poll()
+        self._render_all()
+
+        def failing():
+            raise ConnectionError("hors-ligne")
+        source = self.dashboard.widgets["alerts"].fetch
+        self.dashboard.widgets["alerts"].fetch = failing
+        self.clock.now += 60
+        self._poll()
+        self.assertEqual(self._render_all(), [])
+
+        # Erreurs répétées: au-delà de la durée de validité, le widget est signalé périmé
+        self.clock.now += 200
+        self._poll()
+        widget = self.dashboard.changed()[0]
+        self.assertEqual(widget.name, "alerts")
+        self.assertIsNone(self.dashboard.get_data("alerts"))
+        self.assertTrue(self.dashboard.is_stale("alerts"))
+        self.dashboard.mark_rendered(widget, widget.version, 0.001, stale=True)
+        self.assertNotIn(widget, self.dashboard.changed())
+
+        # Source rétablie avec des données identiques: version inchangée, mais nouveau rendu
+        self.dashboard.widgets["alerts"].fetch = source
+        self.clock.now += 60
+        self._poll()
+        self.assertEqual(self.dashboard.widgets["alerts"].version, 1)
+        self.assertIn("alerts", self._render_all())
+        self.assertFalse(self.dashboard.is_stale("alerts"))
+
+    def test_none_data_is_not_stale(self):
+        """Test qu'une source retournant None n'est pas signalée périmée"""
+        self.values["alerts"] = None
+        self._poll()
+        self.assertEqual(self.dashboard.get_state("alerts"), (None, False))
+        self.assertFalse(self.dashboard.is_stale("alerts"))
+        self.assertEqual(self.dashboard.get_state("flights"), ({"count": 1}, False))
+
+        self.clock.now += 200
+        self.assertEqual(self.dashboard.get_state("flights"), (None, True))
+        self.assertTrue(self.dashboard.is_stale("alerts"))
+
+
+if __name__ == '__main__':
+    unittest.main()
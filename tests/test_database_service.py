@@ -0,0 +1,84 @@
+import unittest
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from app.services.database_service import DatabaseService
+
+
+class TestDatabaseService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseService(self.temp_dir / "database.db", batch_size=7)
+        self.aircraft = [self.db.add_aircraft(f"C-G{i:03d}", "M300") for i in range(2)]
+        self.pilots = [self.db.add_personnel(f"Pilote {i}", "pilot") for i in range(2)]
+
+        start = datetime(2024, 1, 1, 8, 0)
+        self.db.add_flights(
+            {
+                "aircraft_id": self.aircraft[i % 2],
+                "pilot_id": self.pilots[(i // 2) % 2],
+                "started_at": start + timedelta(hours=i),
+                "duration_min": 30,
+            }
+            for i in range(40)
+        )
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_wal_mode(self):
+        """Test que la base fonctionne en mode WAL"""
+        mode = self.db.connect().execute("PRAGMA journal_mode").fetchone()[0]
+        self.assertEqual(mode, "wal")
+
+    def test_batched_insert(self):
+        """Test l'insertion par lots"""
+        count = self.db.connect().execute("SELECT COUNT(*) FROM flights").fetchone()[0]
+        self.assertEqual(count, 40)
+
+    def test_queries(self):
+        """Test les requêtes par aéronef, pilote et intervalle de dates"""
+        flights = self.db.get_flights_by_aircraft(self.aircraft[0])
+        self.assertEqual(len(flights), 20)
+        self.assertTrue(all(f["aircraft_id"] == self.aircraft[0] for f in flights))
+
+        flights = self.db.get_flights_by_pilot(
+            self.pilots[1], datetime(2024, 1, 1, 8, 0), datetime(2024, 1, 1, 16, 0)
+        )
+        self.assertEqual([f["started_at"] for f in flights],
+                         ["2024-01-01T15:00:00", "2024-01-01T14:00:00",
+                          "2024-01-01T11:00:00", "2024-01-01T10:00:00"])
+
+        flights = self.db.get_flights_between("2024-01-02T00:00:00", "2024-01-02T03:00:00")
+        self.assertEqual(len(flights), 3)
+
+    def test_queries_use_indexes(self):
+        """Test que les requêtes principales utilisent les index composites"""
+        conn = self.db.connect()
+        cases = {
+            "idx_flights_aircraft_start": "SELECT * FROM flights WHERE aircraft_id = 1 "
+                                          "AND started_at >= '2024' ORDER BY started_at DESC",
+            "idx_flights_pilot_start": "SELECT * FROM flights WHERE pilot_id = 1 "
+                                       "AND started_at >= '2024' ORDER BY started_at DESC",
+        }
+        for index, sql in cases.items():
+            plan = " ".join(row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql))
+            self.assertIn(index, plan)
+
+    def test_maintenance_due(self):
+        """Test la recherche des interventions de maintenance échues"""
+        self.db.add_maintenance_records([
+            {"aircraft_id": self.aircraft[0], "kind": "inspection", "due_at": "2024-02-01T00:00:00"},
+            {"aircraft_id": self.aircraft[1], "kind": "inspection", "due_at": "2024-05-01T00:00:00"},
+            {"aircraft_id": self.aircraft[1], "kind": "service", "due_at": "2024-01-01T00:00:00",
+             "status": "closed"},
+        ])
+        due = self.db.get_open_maintenance_due(datetime(2024, 3, 1))
+        self.assertEqual(len(due), 1)
+        self.assertEqual(due[0]["aircraft_id"], self.aircraft[0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,92 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from app.services.documentation_service import DocumentationService, to_match_query
+
+
+class TestDocumentationService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.docs = self.tmp / "documentation"
+        (self.docs / "sop").mkdir(parents=True)
+        (self.docs / "sop" / "batterie.md").write_text(
+            "# Stockage des batteries LiPo\n\nStocker les batteries à 3,8 V par élément.\n", encoding="utf-8")
+        (self.docs / "checklist.html").write_text(
+            "<html><script>var batterie;</script><h1>Checklist prévol</h1>"
+            "<p>Vérifier les hélices et la charge de la batterie.</p></html>", encoding="utf-8")
+        (self.docs / "urgence.json").write_text(
+            json.dumps({"titre": "Perte de liaison radio", "étapes": ["Retour maison", "Aviser la tour"]}),
+            encoding="utf-8")
+        (self.docs / "image.png").write_bytes(b"\x89PNG")
+        self.service = DocumentationService(self.docs, self.tmp / "index.db", scan_interval=60)
+
+    def tearDown(self):
+        self.service.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_search_ranked_with_snippets(self):
+        """Test la recherche classée (titre prioritaire) avec extraits"""
+        self.assertEqual(self.service.index()["added"], 3)
+        results = self.service.search("batterie")
+        self.assertEqual([r["path"] for r in results], ["sop/batterie.md", "checklist.html"])
+        self.assertEqual(results[0]["title"], "Stockage des batteries LiPo")
+        self.assertIn("[batterie", results[1]["snippet"])
+        self.assertGreater(results[0]["score"], results[1]["score"])
+
+        # Accents ignorés, préfixe sur le dernier mot, texte extrait du JSON
+        self.assertEqual([r["path"] for r in self.service.search("helices prev")], ["checklist.html"])
+        self.assertEqual([r["path"] for r in self.service.search("liaison radio")], ["urgence.json"])
+        self.assertEqual(self.service.search("var"), [])
+        self.assertEqual(self.service.search('" OR ('), [])
+
+    def test_incremental_index(self):
+        """Test que seuls les fichiers modifiés sont réindexés"""
+        self.service.index()
+        counts = self.service.index()
+        self.assertEqual((counts["unchanged"], counts["added"], counts["updated"]), (3, 0, 0))
+
+        # Date modifiée, contenu identique: pas de réindexation
+        path = self.docs / "sop" / "batterie.md"
+        stat = path.stat()
+        os.utime(path, (stat.st_atime, stat.st_mtime + 10))
+        self.assertEqual(self.service.index()["touched"], 1)
+
+        path.write_text("# Stockage des hélices\n", encoding="utf-8")
+        (self.docs / "urgence.json").unlink()
+        (self.docs / "nouveau.txt").write_text("Procédure de givrage", encoding="utf-8")
+        counts = self.service.index()
+        self.assertEqual((counts["updated"], counts["removed"], counts["added"]), (1, 1, 1))
+        self.assertEqual([r["path"] for r in self.service.search("batterie")], ["checklist.html"])
+        self.assertEqual([r["path"] for r in self.service.search("givrage")], ["nouveau.txt"])
+        self.assertEqual(self.service.search("radio"), [])
+        self.assertEqual(self.service.count(), 3)
+
+    def test_background_indexing(self):
+        """Test l'indexation en arrière-plan et la mise à jour sur demande"""
+        self.service.start()
+        deadline = time.time() + 5
+        while self.service.count() < 3 and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(self.service.count(), 3)
+
+        (self.docs / "nouveau.txt").write_text("Procédure de givrage", encoding="utf-8")
+        self.service.refresh()
+        while not self.service.search("givrage") and time.time() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(len(self.service.search("givrage")), 1)
+        self.service.stop()
+        self.assertIsNone(self.service.get_stats()["last_error"])
+
+    def test_match_query(self):
+        """Test la conversion d'une saisie libre en requête FTS5"""
+        self.assertEqual(to_match_query('perte "liaison'), '"perte" "liaison"*')
+        self.assertEqual(to_match_query("perte liaison "), '"perte" "liaison"')
+        self.assertIsNone(to_match_query(" ( * "))
+
+
+if __name__ == '__main__':
+    unittest.main()
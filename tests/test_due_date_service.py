@@ -0,0 +1,140 @@
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from datetime import datetime, timedelta
+from pathlib import Path
+from app.services.database_service import DatabaseService
+from app.services.due_date_service import DueDateService
+
+
+class TestDueDateService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.db = DatabaseService(self.tmp / "database.db")
+        self.now = datetime.now().replace(microsecond=0)
+        self.aircraft = self.db.add_aircraft("C-GHCA", "M300")
+        self.pilot = self.db.add_personnel("Pilote", "pilot", currency_expires_at=self.now + timedelta(days=20))
+        self.service = DueDateService(self.db)
+
+    def tearDown(self):
+        self.service.stop()
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _maintenance(self, kind: str, due_at, status: str = "open"):
+        self.db.add_maintenance_records([{"aircraft_id": self.aircraft, "kind": kind,
+                                          "due_at": due_at, "status": status}])
+
+    def test_index_follows_records(self):
+        """Test la mise à jour de l'index des échéances à chaque modification"""
+        self._maintenance("Inspection 100 h", self.now + timedelta(days=3))
+        self._maintenance("Hélices", self.now - timedelta(days=1))
+        self._maintenance("Moteurs", self.now + timedelta(days=2), status="closed")
+        self.db.add_certifications([{"personnel_id": self.pilot, "name": "Opérations avancées",
+                                     "expires_at": self.now + timedelta(days=5)}])
+
+        labels = [item["label"] for item in self.service.due_within(7)]
+        self.assertEqual(labels, ["Hélices", "Inspection 100 h", "Opérations avancées"])
+        self.assertEqual([item["label"] for item in self.service.due_within(30, include_overdue=False)],
+                         ["Inspection 100 h", "Opérations avancées", "Pilote"])
+        self.assertEqual(self.service.summary(7, sources=("maintenance",)), {"count": 2, "overdue": 1})
+
+        conn = self.db.connect()
+        with conn:
+            conn.execute("UPDATE maintenance_records SET status = 'closed' WHERE kind = 'Hélices'")
+            conn.execute("UPDATE maintenance_records SET due_at = ? WHERE kind = 'Inspection 100 h'",
+                         ((self.now + timedelta(days=10)).isoformat(),))
+            conn.execute("DELETE FROM certifications")
+        self.assertEqual(self.service.due_within(7), [])
+        self.assertEqual([item["source"] for item in self.service.due_within(30)], ["maintenance", "currency"])
+
+    def test_existing_records_indexed_on_upgrade(self):
+        """Test le remplissage de l'index pour une base antérieure à son ajout"""
+        self._maintenance("Inspection 100 h", self.now + timedelta(days=3))
+        conn = self.db.connect()
+        for (name,) in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'").fetchall():
+            conn.execute(f"DROP TRIGGER {name}")
+        conn.execute("DROP TABLE due_items")
+        conn.commit()
+        self.db.close()
+
+        upgraded = DatabaseService(self.tmp / "database.db")
+        items = upgraded.get_due_items(self.now + timedelta(days=30))
+        self.assertEqual([item["source"] for item in items], ["maintenance", "currency"])
+        upgraded.close()
+
+    def test_alert_at_due_time(self):
+        """Test l'alerte émise à l'heure exacte d'une échéance ajoutée après le démarrage"""
+        received = []
+        fired = threading.Event()
+
+        def on_alert(items, lead):
+            received.append((datetime.now(), items, lead))
+            fired.set()
+
+        self.service = DueDateService(self.db, lead_days=(0, 20))
+        self.service.start(on_alert)
+        due_at = datetime.now().replace(microsecond=0) + timedelta(seconds=2)
+        self._maintenance("Inspection 100 h", due_at)
+
+        self.assertTrue(fired.wait(5))
+        alerted_at, items, lead = received[0]
+        self.assertEqual([item["label"] for item in items], ["Inspection 100 h"])
+        self.assertEqual(lead, timedelta(0))
+        self.assertGreaterEqual(alerted_at, due_at)
+        self.assertLess((alerted_at - due_at).total_seconds(), 0.5)
+
+        # L'échéance déjà passée à 20 jours de la validité du pilote n'est pas signalée au démarrage
+        time.sleep(0.2)
+        self.assertEqual(len(received), 1)
+
+    def test_alert_for_write_from_other_process(self):
+        """Test l'alerte pour une échéance ajoutée par une autre connexion, sans notification"""
+        received = []
+        fired = threading.Event()
+        self.service = DueDateService(self.db, poll_interval=0.2)
+        self.service.start(lambda items, lead: (received.append((datetime.now(), items)), fired.set()))
+        time.sleep(0.3)
+
+        # Autre instance sur le même fichier: équivalent de l'application écrivant hors du service
+        other = DatabaseService(self.tmp / "database.db")
+        due_at = datetime.now().replace(microsecond=0) + timedelta(seconds=2)
+        other.add_maintenance_records([{"aircraft_id": self.aircraft, "kind": "Hélices", "due_at": due_at}])
+        other.close()
+
+        self.assertTrue(fired.wait(5))
+        alerted_at, items = received[0]
+        self.assertEqual([item["label"] for item in items], ["Hélices"])
+        self.assertLess((alerted_at - due_at).total_seconds(), 0.5)
+
+    def test_summary_counts_all_items(self):
+        """Test que le résumé compte toutes les échéances, au-delà de la limite des listes"""
+        self.db.add_maintenance_records(
+            {"aircraft_id": self.aircraft, "kind": "Inspection",
+             "due_at": self.now + timedelta(minutes=i - 100)} for i in range(10_050))
+        self.assertEqual(self.service.summary(30, sources=("maintenance",)), {"count": 10_050, "overdue": 100})
+        self.assertEqual(self.service.summary(30), {"count": 10_051, "overdue": 100})
+
+    def test_lead_time_alert(self):
+        """Test l'alerte de prévenance N jours avant l'échéance"""
+        received = []
+        self.service = DueDateService(self.db, lead_days=(30,), clock=lambda: self.now)
+        self.service.start(lambda items, lead: received.append((items, lead)))
+        self.service.stop()
+
+        self.db.add_certifications([{"personnel_id": self.pilot, "name": "Opérations avancées",
+                                     "expires_at": self.now + timedelta(days=31)}])
+        self.assertEqual(self.service.next_alert_at(), self.now + timedelta(days=1))
+        self.assertEqual(self.service.fire_due(), 0)
+
+        self.service.clock = lambda: self.now + timedelta(days=1)
+        self.assertEqual(self.service.fire_due(), 1)
+        self.assertEqual(received[0][0][0]["label"], "Opérations avancées")
+        self.assertEqual(received[0][1], timedelta(days=30))
+        self.assertEqual(self.service.fire_due(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+from kivy.lang import Builder
+from app.views.kv_cache import load_kv
+
+KV = """
+<CachedLabel@Label>:
+    text: "v{}"
+    font_size: 10 + {}
+"""
+
+
+class TestKvCache(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.cache_dir = self.tmp / "cache"
+        self.kv = self.tmp / "cached.kv"
+
+    def tearDown(self):
+        Builder.unload_file(str(self.kv))
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _load(self, version: int):
+        Builder.unload_file(str(self.kv))
+        self.kv.write_text(KV.format(version, version), encoding="utf8")
+        load_kv(self.kv, cache_dir=self.cache_dir)
+        from kivy.factory import Factory
+        return Factory.CachedLabel()
+
+    def test_cached_rules_apply(self):
+        """Test que les règles relues depuis le cache donnent le même widget"""
+        first = self._load(1)
+        self.assertEqual(len(list(self.cache_dir.glob("cached-*.pickle"))), 1)
+        second = self._load(1)
+        self.assertEqual((second.text, second.font_size), (first.text, first.font_size))
+        self.assertEqual((second.text, second.font_size), ("v1", 11))
+
+    def test_cache_hit_skips_parser(self):
+        """Test qu'un fichier inchangé n'est pas réanalysé, y compris par le Builder"""
+        self._load(1)
+        with patch("app.views.kv_cache.Parser", side_effect=AssertionError), \
+                patch("kivy.lang.builder.Parser", side_effect=AssertionError):
+            label = self._load(1)
+        self.assertEqual((label.text, label.font_size), ("v1", 11))
+
+    def test_root_widget(self):
+        """Test que le widget racine est construit et retourné, avec ou sans cache"""
+        root_kv = self.tmp / "root.kv"
+        root_kv.write_text("Label:\n    text: 'racine'\n", encoding="utf8")
+        for _ in range(2):
+            self.assertEqual(load_kv(root_kv, cache_dir=self.cache_dir).text, "racine")
+
+    def test_unsupported_kivy_loads_without_cache(self):
+        """Test le chargement direct, sans cache, pour une version de Kivy non validée"""
+        with patch("app.views.kv_cache.CACHE_SUPPORTED", False):
+            label = self._load(3)
+        self.assertEqual((label.text, label.font_size), ("v3", 13))
+        self.assertFalse(self.cache_dir.exists())
+
+    def test_changed_file_invalidates_cache(self):
+        """Test qu'une modification du fichier KV remplace l'entrée en cache"""
+        self._load(1)
+        label = self._load(2)
+        self.assertEqual((label.text, label.font_size), ("v2", 12))
+        self.assertEqual(len(list(self.cache_dir.glob("cached-*.pickle"))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
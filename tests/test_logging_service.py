@@ -0,0 +1,71 @@
+import json
+import time
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from app.services.logging_service import get_logger, flush_logging
+
+
+class TestLoggingService(unittest.TestCase):
+    def setUp(self):
+        self.log_dir = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        flush_logging()
+        shutil.rmtree(self.log_dir, ignore_errors=True)
+
+    def _read(self, filename):
+        flush_logging()
+        with open(self.log_dir / filename, encoding="utf-8") as f:
+            return [json.loads(line) for line in f]
+
+    def test_json_lines_per_component(self):
+        """Test que chaque composant écrit des lignes JSON dans son propre fichier"""
+        backup = get_logger("TestBackup", "backup.log", log_dir=self.log_dir)
+        scheduler = get_logger("TestScheduler", "scheduler.log", log_dir=self.log_dir)
+
+        backup.info("Sauvegarde %s", "créée", extra={"duration_ms": 12.5})
+        scheduler.warning("Job en retard")
+        try:
+            raise ValueError("disque plein")
+        except ValueError:
+            backup.exception("Échec")
+
+        records = self._read("backup.log")
+        self.assertEqual([r["message"] for r in records], ["Sauvegarde créée", "Échec"])
+        self.assertEqual(records[0]["duration_ms"], 12.5)
+        self.assertEqual(records[0]["logger"], "TestBackup")
+        self.assertIn("ValueError: disque plein", records[1]["exception"])
+
+        records = self._read("scheduler.log")
+        self.assertEqual(len(records), 1)
+        self.assertEqual(records[0]["level"], "WARNING")
+
+    def test_size_rotation(self):
+        """Test la rotation des fichiers selon leur taille"""
+        logger = get_logger("TestRotation", "rotation.log", log_dir=self.log_dir,
+                            max_bytes=2000, backup_count=2)
+        for i in range(200):
+            logger.info("Message %d", i)
+        flush_logging()
+
+        self.assertTrue((self.log_dir / "rotation.log.1").exists())
+        self.assertTrue((self.log_dir / "rotation.log.2").exists())
+        self.assertFalse((self.log_dir / "rotation.log.3").exists())
+        self.assertEqual(self._read("rotation.log")[-1]["message"], "Message 199")
+
+    def test_call_does_not_block(self):
+        """Test qu'un appel de log ne fait qu'empiler l'enregistrement"""
+        logger = get_logger("TestOverhead", "overhead.log", log_dir=self.log_dir)
+        count = 5000
+        started = time.perf_counter()
+        for i in range(count):
+            logger.info("Message %d", i)
+        per_call_us = (time.perf_counter() - started) * 1e6 / count
+        self.assertLess(per_call_us, 200)
+        self.assertEqual(len(self._read("overhead.log")), count)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import shutil
+import tempfile
+import unittest
+import urllib.request
+from pathlib import Path
+from app.services.metrics_service import MetricsRegistry, metrics
+from app.services.backup_service import BackupService
+from scripts.stats import parse, quantile
+from tests.test_async_backup_service import make_dataset
+
+
+class TestMetricsService(unittest.TestCase):
+    def setUp(self):
+        self.registry = MetricsRegistry()
+        self.tmp = Path(tempfile.mkdtemp())
+
+    def tearDown(self):
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def test_prometheus_export(self):
+        """Test l'export texte des compteurs, jauges et histogrammes"""
+        runs = self.registry.counter("runs_total", "Exécutions")
+        size = self.registry.gauge("size_bytes", "Taille")
+        latency = self.registry.histogram("call_seconds", "Latence", buckets=(0.1, 1.0))
+        runs.inc(status="success")
+        runs.inc(2, status="success")
+        size.set(1024)
+        latency.observe(0.05, call="get")
+        latency.observe(0.5, call="get")
+        latency.observe(5, call="get")
+
+        text = self.registry.export_text()
+        self.assertIn("# TYPE runs_total counter", text)
+        self.assertIn('runs_total{status="success"} 3', text)
+        self.assertIn("size_bytes 1024", text)
+        self.assertIn('call_seconds_bucket{call="get",le="0.1"} 1', text)
+        self.assertIn('call_seconds_bucket{call="get",le="1"} 2', text)
+        self.assertIn('call_seconds_bucket{call="get",le="+Inf"} 3', text)
+        self.assertIn('call_seconds_count{call="get"} 3', text)
+
+        parsed = parse(text)
+        hist = parsed["call_seconds"][1][(("call", "get"),)]
+        self.assertEqual(hist["count"], 3)
+        self.assertEqual(quantile(hist, 0.5), 1.0)
+        self.assertEqual(parsed["runs_total"][1][(("status", "success"),)], 3)
+
+    def test_label_values_escaped(self):
+        """Test l'échappement des barres obliques inverses, guillemets et sauts de ligne"""
+        runs = self.registry.counter("runs_total", "Exécutions")
+        runs.inc(target='D:\\Sauvegardes "nuit"\nNAS')
+
+        text = self.registry.export_text()
+        self.assertIn('runs_total{target="D:\\\\Sauvegardes \\"nuit\\"\\nNAS"} 1', text)
+        self.assertEqual(len(text.splitlines()), 3)
+        self.assertEqual(parse(text)["runs_total"][1], {(("target", 'D:\\Sauvegardes "nuit"\nNAS'),): 1})
+
+    def test_disabled_is_noop(self):
+        """Test qu'un registre désactivé n'enregistre rien"""
+        registry = MetricsRegistry(enabled=False)
+        hist = registry.histogram("phase_seconds")
+        with registry.span(hist, phase="sqlite"):
+            pass
+        registry.counter("runs_total").inc()
+        self.assertNotIn("phase_seconds_count", registry.export_text())
+        self.assertFalse(registry.write_textfile(self.tmp / "m.prom"))
+
+    def test_textfile_and_http(self):
+        """Test l'export vers un fichier .prom et le point d'accès HTTP"""
+        self.registry.counter("runs_total").inc()
+        self.assertTrue(self.registry.write_textfile(self.tmp / "app.prom"))
+        self.assertIn("runs_total 1", (self.tmp / "app.prom").read_text(encoding="utf-8"))
+
+        server = self.registry.start_http_server(0)
+        try:
+            url = f"http://127.0.0.1:{server.server_address[1]}/metrics"
+            with urllib.request.urlopen(url, timeout=5) as response:
+                self.assertIn("runs_total 1", response.read().decode("utf-8"))
+        finally:
+            server.shutdown()
+            server.server_close()
+
+    def test_backup_phases(self):
+        """Test le découpage par phase et les octets écrits d'une sauvegarde"""
+        before = parse(metrics.export_text())
+        count = lambda m, phase: m["backup_phase_seconds"][1].get((("phase", phase),), {}).get("count", 0)
+        make_dataset(self.tmp / "data", files=5, rows=100)
+        self.assertIsNotNone(BackupService(self.tmp / "data").create_backup())
+
+        after = parse(metrics.export_text())
+        for phase in ("sqlite", "configs", "manifest", "total"):
+            self.assertEqual(count(after, phase), count(before, phase) + 1)
+        self.assertGreater(after["backup_bytes_written_total"][1][()],
+                           before["backup_bytes_written_total"][1].get((), 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,207 @@
+import unittest
+import json
+import shutil
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+import pyrebase
+from app.services.metrics_service import metrics
+from app.services.offline_sync_service import OfflineSyncService
+from scripts.stats import parse
+
+
+class FakeRealtimeDatabase:
+    """Faux serveur REST Realtime Database en mémoire (GET/PUT/PATCH/DELETE sur /chemin.json)"""
+
+    def __init__(self):
+        self.tree = {}
+        self.requests = []
+        self.online = True
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _handle(self, method):
+                path = urlparse(self.path).path[:-len(".json")].strip("/")
+                body = None
+                length = int(self.headers.get("Content-Length") or 0)
+                if length:
+                    body = json.loads(self.rfile.read(length))
+                fake.requests.append((method, path, body))
+                if not fake.online:
+                    self.send_response(503)
+                    self.end_headers()
+                    return
+                result = fake.apply(method, path, body)
+                payload = json.dumps(result).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_PUT(self):
+                self._handle("PUT")
+
+            def do_PATCH(self):
+                self._handle("PATCH")
+
+            def do_DELETE(self):
+                self._handle("DELETE")
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+
+    def shutdown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def apply(self, method, path, body):
+        parts = [p for p in path.split("/") if p]
+        if method == "GET":
+            node = self.tree
+            for part in parts:
+                if not isinstance(node, dict) or part not in node:
+                    return None
+                node = node[part]
+            return node
+        if method == "PUT":
+            self._write(parts, body)
+            return body
+        if method == "PATCH":
+            for key, value in body.items():
+                self._write(parts + [p for p in key.split("/") if p], value)
+            return body
+        if method == "DELETE":
+            self._write(parts, None)
+            return None
+
+    def _write(self, parts, value):
+        self.tree = OfflineSyncService._assign(self.tree, parts, value) or {}
+
+    def count(self, method):
+        return sum(1 for r in self.requests if r[0] == method)
+
+
+class TestOfflineSyncService(unittest.TestCase):
+    def setUp(self):
+        self.server = FakeRealtimeDatabase()
+        self.temp_dir = Path(tempfile.mkdtemp())
+        firebase = pyrebase.initialize_app({
+            "apiKey": "test",
+            "authDomain": "test",
+            "databaseURL": self.server.url,
+            "storageBucket": "test",
+        })
+        self.sync = OfflineSyncService(
+            firebase.database(),
+            store_path=self.temp_dir / "offline.db",
+            cache_ttl=60
+        )
+
+    def tearDown(self):
+        self.sync.stop(flush=False)
+        self.sync._conn.close()
+        self.server.shutdown()
+        shutil.rmtree(self.temp_dir)
+
+    def test_write_acknowledged_offline(self):
+        """Test qu'une écriture est acquittée localement sans réseau"""
+        self.server.online = False
+        self.sync.set("flights/f1", {"pilot": "p1"})
+        self.assertEqual(self.sync.queue_depth(), 1)
+        self.assertIsNone(self.sync.flush())
+        self.assertEqual(self.sync.queue_depth(), 1)
+        self.assertEqual(self.sync.get("flights/f1"), {"pilot": "p1"})
+
+        self.server.online = True
+        self.assertEqual(self.sync.flush(), 1)
+        self.assertEqual(self.sync.queue_depth(), 0)
+        self.assertEqual(self.server.tree, {"flights": {"f1": {"pilot": "p1"}}})
+
+    def test_call_latency_metrics(self):
+        """Test la mesure de la latence des lectures et des envois, réussis ou non"""
+        def counts():
+            parsed = parse(metrics.export_text())
+            hist = parsed.get("firebase_call_seconds", (None, {}))[1]
+            errors = parsed.get("firebase_call_errors_total", (None, {}))[1]
+            return ({call: hist.get((("call", call),), {}).get("count", 0) for call in ("get", "update")},
+                    {call: errors.get((("call", call),), 0) for call in ("get", "update")})
+
+        before_calls, before_errors = counts()
+        self.server.tree = {"weather": {"wind": 12}}
+        self.assertEqual(self.sync.get("weather"), {"wind": 12})
+        self.sync.set("flights/f1", {"pilot": "p1"})
+        self.server.online = False
+        self.assertIsNone(self.sync.flush())
+        self.server.online = True
+        self.assertEqual(self.sync.flush(), 1)
+
+        calls, errors = counts()
+        self.assertEqual(calls["get"] - before_calls["get"], 1)
+        self.assertEqual(calls["update"] - before_calls["update"], 2)
+        self.assertEqual(errors["update"] - before_errors["update"], 1)
+
+    def test_coalescing(self):
+        """Test la fusion des écritures répétées sur un même chemin"""
+        for i in range(10):
+            self.sync.set("aircraft/a1/hours", i)
+        self.sync.set("aircraft/a2", {"status": "ok"})
+        self.sync.update("aircraft/a2", {"hours": 5})
+        self.sync.set("aircraft/a3/status", "ok")
+        self.sync.remove("aircraft/a3")
+        self.assertEqual(self.sync.queue_depth(), 3)
+
+        self.sync.flush()
+        self.assertEqual(self.server.count("PATCH"), 1)
+        self.assertEqual(self.server.tree, {
+            "aircraft": {"a1": {"hours": 9}, "a2": {"status": "ok", "hours": 5}}
+        })
+
+    def test_read_cache_ttl(self):
+        """Test que les lectures sont servies depuis le cache tant qu'il est frais"""
+        self.server.tree = {"weather": {"wind": 12}}
+        self.assertEqual(self.sync.get("weather"), {"wind": 12})
+        self.assertEqual(self.sync.get("weather"), {"wind": 12})
+        self.assertEqual(self.server.count("GET"), 1)
+
+        self.server.tree = {"weather": {"wind": 20}}
+        self.assertEqual(self.sync.get("weather", max_age=0), {"wind": 20})
+        self.assertEqual(self.server.count("GET"), 2)
+
+        self.server.online = False
+        self.assertEqual(self.sync.get("weather", max_age=0), {"wind": 20})
+
+    def test_pending_writes_overlay_reads(self):
+        """Test que les lectures reflètent les écritures non encore envoyées"""
+        self.server.tree = {"reports": {"r1": {"status": "draft"}}}
+        self.sync.set("reports/r2", {"status": "pending"})
+        self.assertEqual(self.sync.get("reports"), {
+            "r1": {"status": "draft"}, "r2": {"status": "pending"}
+        })
+
+    def test_background_flush_and_stats(self):
+        """Test l'envoi en arrière-plan et les statistiques exposées"""
+        self.sync.flush_interval = 0.05
+        self.sync.start()
+        key = self.sync.push("reports", {"title": "Vol 1"})
+        self.sync.stop()
+
+        self.assertIn(key, self.server.tree["reports"])
+        stats = self.sync.get_stats()
+        self.assertEqual(stats["queue_depth"], 0)
+        self.assertEqual(stats["flushed_writes"], 1)
+        self.assertIsNotNone(stats["last_flush_latency"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import shutil
+import sqlite3
+import tempfile
+import time
+import unittest
+from datetime import datetime
+from pathlib import Path
+from app.services.backup_service import BackupService
+from app.services.database_service import DatabaseService
+from app.services.pitr_service import PitrService
+
+
+class TestPitrService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        self.db = DatabaseService(self.tmp / "database.db")
+        self.pitr = PitrService(self.db.db_path)
+        self.pitr.install()
+        self.backup_service = BackupService(self.tmp)
+        self.aircraft = self.db.add_aircraft("C-GHCA", "M300")
+        self.pilot = self.db.add_personnel("Pilote", "pilot")
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _flight(self, location: str) -> dict:
+        return {"aircraft_id": self.aircraft, "pilot_id": self.pilot,
+                "started_at": "2026-10-01T10:00:00", "location": location}
+
+    def _locations(self):
+        conn = sqlite3.connect(str(self.db.db_path))
+        try:
+            return sorted(row[0] for row in conn.execute("SELECT location FROM flights"))
+        finally:
+            conn.close()
+
+    def _mark(self) -> datetime:
+        """Instant séparant deux séries de modifications"""
+        time.sleep(0.01)
+        mark = datetime.now()
+        time.sleep(0.01)
+        return mark
+
+    def test_ship_moves_changes_to_segment(self):
+        """Test l'expédition des modifications capturées dans un segment compressé"""
+        self.db.add_flights([self._flight(f"site_{i}") for i in range(100)])
+        path = self.pitr.ship()
+        self.assertIsNotNone(path)
+
+        segment = PitrService.read_segment(path)
+        self.assertEqual(len(segment["tables"]["flights"]["rows"]), 100)
+        self.assertEqual(segment["tables"]["aircraft"]["rows"][0][2], "I")
+        conn = self.db.connect()
+        self.assertEqual(conn.execute("SELECT COUNT(*) FROM _pitr_log_flights").fetchone()[0], 0)
+        self.assertIsNone(self.pitr.ship())
+
+    def test_restore_until_timestamp(self):
+        """Test la restauration d'une sauvegarde suivie du rejeu jusqu'à un instant donné"""
+        self.db.add_flights([self._flight("snapshot")])
+        backup_path = self.backup_service.create_backup()
+
+        self.db.add_flights([self._flight("before")])
+        conn = self.db.connect()
+        with conn:
+            conn.execute("UPDATE flights SET location = 'updated' WHERE location = 'snapshot'")
+        self.db.add_reports([{"title": "Vol", "role": "pilot", "created_at": "2026-10-01T10:00:00"}])
+        self.db.add_report_steps([{"report_id": 1, "step": "preflight", "completed_at": "2026-10-01T10:00:00"}])
+        self.pitr.ship()
+        mark = self._mark()
+        # Modifications non expédiées: restore_backup les expédie avant de remplacer la base
+        with conn:
+            conn.execute("DELETE FROM flights WHERE location = 'before'")
+            conn.execute("DELETE FROM report_steps")
+        self.db.add_flights([self._flight("after")])
+        self.db.close()
+
+        self.assertTrue(self.backup_service.restore_backup(backup_path, until=mark))
+        self.assertEqual(self._locations(), ["before", "updated"])
+        steps = self.db.connect().execute("SELECT step FROM report_steps").fetchall()
+        self.assertEqual([row[0] for row in steps], ["preflight"])
+
+        # Rejeu complet depuis la même sauvegarde: les modifications abandonnées restent disponibles
+        self.db.close()
+        self.assertTrue(self.backup_service.restore_backup(backup_path, until=datetime.now()))
+        self.assertEqual(self._locations(), ["after", "updated"])
+
+    def test_restore_opens_new_timeline(self):
+        """Test qu'une restauration sépare les captures suivantes de l'historique abandonné"""
+        backup_path = self.backup_service.create_backup()
+        self.db.add_flights([self._flight("abandoned")])
+        self.pitr.ship()
+        self.db.close()
+
+        self.assertTrue(self.backup_service.restore_backup(backup_path))
+        self.db.add_flights([self._flight("new")])
+        self.pitr.ship()
+        self.db.close()
+
+        self.assertTrue(self.backup_service.restore_backup(backup_path, until=datetime.now()))
+        self.assertEqual(self._locations(), ["abandoned"])
+
+
+if __name__ == '__main__':
+    unittest.main()
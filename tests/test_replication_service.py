@@ -0,0 +1,174 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+from pathlib import Path
+from app.services.backup_service import BackupService
+from app.services.replication_service import ReplicationService, ReplicationTarget
+from tests.test_async_backup_service import make_dataset
+
+
+class _GatedReplicationService(ReplicationService):
+    """Bloque l'écriture sur une cible tant que `gate` n'est pas ouvert (simule un partage lent)"""
+
+    def __init__(self, targets, slow: str, **kwargs):
+        super().__init__(targets, **kwargs)
+        self.slow = slow
+        self.gate = threading.Event()
+
+    def _handle(self, target, message):
+        if target.name == self.slow:
+            self.gate.wait(10)
+        super()._handle(target, message)
+
+    def _replicate_direct(self, target, backup):
+        if target.name == self.slow:
+            self.gate.wait(10)
+        super()._replicate_direct(target, backup)
+
+
+class TestReplicationService(unittest.TestCase):
+    def setUp(self):
+        self.tmp = Path(tempfile.mkdtemp())
+        make_dataset(self.tmp / "data", files=200, rows=1000)
+        self.backup_service = BackupService(self.tmp / "data")
+        self.replication = None
+
+    def tearDown(self):
+        if self.replication:
+            self.replication.stop()
+        shutil.rmtree(self.tmp, ignore_errors=True)
+
+    def _targets(self, *names, **kwargs):
+        return [ReplicationTarget(name, self.tmp / name, **kwargs) for name in names]
+
+    def test_fan_out_to_all_targets(self):
+        """Test qu'une sauvegarde est répliquée intacte sur chaque cible"""
+        self.replication = ReplicationService(self._targets("disk2", "share"))
+        self.replication.start()
+        backup_path = self.backup_service.create_backup()
+        self.replication.replicate(backup_path)
+        self.assertTrue(self.replication.wait_idle(30))
+
+        for name, status in self.replication.get_status().items():
+            replica = self.tmp / name / Path(backup_path).name
+            self.assertTrue(self.backup_service.verify_backup(str(replica)))
+            self.assertEqual(status["pending"], [])
+            self.assertEqual(status["lag_seconds"], 0.0)
+            self.assertEqual(status["last_replicated"], Path(backup_path).name)
+
+    def _replicate_twice(self):
+        """Réplique une sauvegarde, modifie un fichier de config et quelques blocs de la base, puis réplique à nouveau"""
+        self.replication = ReplicationService(self._targets("disk2"))
+        self.replication.start()
+        first = self.backup_service.create_backup()
+        self.replication.replicate(first)
+        self.assertTrue(self.replication.wait_idle(30))
+        initial = dict(self.replication.get_status()["disk2"])
+
+        (self.tmp / "data" / "config" / "group_0" / "config_0.json").write_text('{"id": -1}')
+        conn = sqlite3.connect(str(self.tmp / "data" / "database.db"))
+        conn.execute("UPDATE blobs SET data = randomblob(4096) WHERE rowid = 500")
+        conn.commit()
+        conn.close()
+        time.sleep(1.1)  # Noms de sauvegarde horodatés à la seconde
+        second = self.backup_service.create_backup()
+        self.replication.replicate(second)
+        self.assertTrue(self.replication.wait_idle(30))
+
+        status = self.replication.get_status()["disk2"]
+        delta = {key: status[key] - initial[key] for key in ("files_linked", "bytes_sent", "bytes_reused")}
+        replica = self.tmp / "disk2" / Path(second).name
+        self.assertTrue(self.backup_service.verify_backup(str(replica)))
+        return Path(first), Path(second), delta
+
+    def test_only_missing_data_is_sent(self):
+        """Test que seuls les fichiers et blocs modifiés sont écrits sur une cible permettant le clonage"""
+        def clone(source, destination):
+            # Simule un clonage (Btrfs, XFS) sur un système de fichiers qui ne le permet pas
+            shutil.copyfile(source, destination)
+            return True
+
+        with patch("app.services.replication_service._reflink", side_effect=clone):
+            first, second, delta = self._replicate_twice()
+
+        db_size = (second / "database.db").stat().st_size
+        self.assertEqual(delta["files_linked"], 199)
+        self.assertLess(delta["bytes_sent"], db_size / 2)
+        self.assertEqual(delta["bytes_sent"] + delta["bytes_reused"], db_size + len('{"id": -1}'))
+
+        unchanged = Path("config") / "group_1" / "config_60.json"
+        self.assertEqual(os.stat(self.tmp / "disk2" / second.name / unchanged).st_ino,
+                         os.stat(self.tmp / "disk2" / first.name / unchanged).st_ino)
+        # Le clone modifié en place ne touche pas la réplique précédente
+        self.assertNotEqual(os.stat(self.tmp / "disk2" / second.name / "database.db").st_ino,
+                            os.stat(self.tmp / "disk2" / first.name / "database.db").st_ino)
+
+    def test_modified_file_written_whole_without_clone(self):
+        """Test qu'un fichier modifié est écrit en entier, sans relecture de la cible, faute de clonage"""
+        with patch("app.services.replication_service._reflink", return_value=False):
+            _, second, delta = self._replicate_twice()
+
+        db_size = (second / "database.db").stat().st_size
+        self.assertEqual(delta["files_linked"], 199)
+        self.assertEqual(delta["bytes_reused"], 0)
+        self.assertEqual(delta["bytes_sent"], db_size + len('{"id": -1}'))
+
+    def test_slow_target_does_not_block(self):
+        """Test qu'une cible lente ne retarde ni les autres cibles ni la sauvegarde principale"""
+        self.replication = _GatedReplicationService(
+            self._targets("fast", "slow", queue_size=2), slow="slow", stall_timeout=0.2
+        )
+        self.replication.start()
+        backup_path = self.backup_service.create_backup()
+
+        t0 = time.perf_counter()
+        self.replication.replicate(backup_path)
+        self.assertLess(time.perf_counter() - t0, 0.1)
+
+        fast = self.replication.targets[0]
+        deadline = time.monotonic() + 30
+        while not fast.stats["replicated"] and time.monotonic() < deadline:
+            time.sleep(0.02)
+        self.assertEqual(fast.pending, {})
+
+        status = self.replication.get_status()["slow"]
+        self.assertEqual(status["pending"], [Path(backup_path).name])
+        self.assertGreater(status["lag_seconds"], 0)
+        self.assertTrue(status["catching_up"])
+        self.assertIsNotNone(self.backup_service.create_backup())
+
+        self.replication.gate.set()
+        self.assertTrue(self.replication.wait_idle(30))
+        replica = self.tmp / "slow" / Path(backup_path).name
+        self.assertTrue(self.backup_service.verify_backup(str(replica)))
+        self.assertEqual(self.replication.get_status()["slow"]["lag_seconds"], 0.0)
+
+    def test_rotation_keeps_pending_sources(self):
+        """Test que la rotation ne supprime pas une sauvegarde dont la réplication n'est pas terminée"""
+        self.replication = _GatedReplicationService(self._targets("slow"), slow="slow")
+        first = self.backup_service.create_backup()
+        # Programmée mais pas encore prise en charge par le thread de diffusion
+        self.replication.replicate(first)
+        self.assertEqual(self.replication.pending_backups(), {Path(first).name})
+        self.replication.start()
+
+        time.sleep(1.1)  # Noms de sauvegarde horodatés à la seconde
+        second = self.backup_service.create_backup()
+        self.backup_service.rotate_backups(max_backups=1, keep=self.replication.pending_backups())
+        self.assertTrue(Path(first).exists())
+
+        self.replication.gate.set()
+        self.assertTrue(self.replication.wait_idle(30))
+        self.assertEqual(self.replication.pending_backups(), set())
+        self.assertTrue(self.backup_service.verify_backup(str(self.tmp / "slow" / Path(first).name)))
+        self.backup_service.rotate_backups(max_backups=1, keep=self.replication.pending_backups())
+        self.assertEqual([p.name for p in self.backup_service.backup_dir.iterdir()], [Path(second).name])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import unittest
+import shutil
+import tempfile
+from datetime import datetime, timedelta
+from pathlib import Path
+from app.services.database_service import DatabaseService
+from app.services.report_service import ReportPager, parse_day_range
+
+
+class TestReportPager(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseService(self.temp_dir / "database.db")
+        start = datetime(2024, 1, 1)
+        roles = ["pilot", "maintenance", "training"]
+        statuses = ["pending", "approved"]
+        # Plusieurs rapports partagent la même date pour tester le départage par id
+        self.db.add_reports(
+            {
+                "title": f"Rapport {i}",
+                "role": roles[i % 3],
+                "status": statuses[i % 2],
+                "created_at": start + timedelta(hours=i // 2),
+            }
+            for i in range(500)
+        )
+        self.pager = ReportPager(self.db, page_size=20, max_pages=3)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _scroll_to_end(self):
+        seen = [row["id"] for row in self.pager.set_filters(**self.filters)]
+        while self.pager.has_next:
+            before = len(self.pager)
+            evicted = self.pager.load_next()
+            seen.extend(row["id"] for row in self.pager.rows[before - evicted:])
+            self.assertLessEqual(len(self.pager), 3 * 20)
+        return seen
+
+    def test_keyset_pagination_covers_all_rows(self):
+        """Test que le parcours complet retourne chaque rapport une seule fois, dans l'ordre"""
+        self.filters = {}
+        seen = self._scroll_to_end()
+        self.assertEqual(len(seen), 500)
+        self.assertEqual(len(set(seen)), 500)
+
+        keys = [tuple(r) for r in self.db.connect().execute(
+            "SELECT created_at, id FROM reports ORDER BY created_at DESC, id DESC")]
+        ids = [key[1] for key in keys]
+        self.assertEqual(seen, ids)
+
+    def test_window_scrolls_back(self):
+        """Test que la fenêtre recharge les pages évincées en remontant"""
+        self.filters = {}
+        self._scroll_to_end()
+        self.assertTrue(self.pager.has_previous)
+        while self.pager.has_previous:
+            self.pager.load_previous()
+            self.assertLessEqual(len(self.pager), 3 * 20)
+        self.assertEqual(self.pager.rows[0]["title"], "Rapport 499")
+
+    def test_filters_run_in_database(self):
+        """Test les filtres par rôle, statut et date"""
+        self.filters = {"role": "pilot", "status": "approved",
+                        "date_from": datetime(2024, 1, 2), "date_to": datetime(2024, 1, 5)}
+        seen = self._scroll_to_end()
+        rows = self.db.connect().execute(
+            "SELECT id FROM reports WHERE role = 'pilot' AND status = 'approved' "
+            "AND created_at >= '2024-01-02T00:00:00' AND created_at < '2024-01-05T00:00:00'"
+        ).fetchall()
+        self.assertEqual(sorted(seen), sorted(r[0] for r in rows))
+
+        plan = " ".join(r[3] for r in self.db.connect().execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM reports WHERE role = 'pilot' AND status = 'approved' "
+            "AND (created_at, id) < ('2024', 10) ORDER BY created_at DESC, id DESC LIMIT 20"))
+        self.assertIn("idx_reports_role_status_created", plan)
+        self.assertNotIn("TEMP B-TREE", plan)
+
+    def test_day_range_includes_end_day(self):
+        """Test qu'un même jour en début et en fin de période retourne les rapports de ce jour"""
+        date_from, date_to = parse_day_range("2024-01-02", " 2024-01-02 ")
+        self.assertEqual((date_from, date_to), (datetime(2024, 1, 2), datetime(2024, 1, 3)))
+        rows = self.db.get_reports_page(date_from=date_from, date_to=date_to, limit=1000)
+        self.assertTrue(rows)
+        self.assertTrue(all(row["created_at"].startswith("2024-01-02") for row in rows))
+
+        self.assertEqual(parse_day_range("", ""), (None, None))
+        with self.assertRaises(ValueError):
+            parse_day_range("2024-13-01", "")
+
+    def test_stale_page_is_ignored(self):
+        """Test qu'une page préchargée avant un changement de filtres est ignorée"""
+        self.pager.set_filters()
+        fetched = self.pager.fetch_next()
+        self.pager.set_filters(role="pilot")
+        self.pager.apply_next(fetched)
+        self.assertTrue(all(row["role"] == "pilot" for row in self.pager.rows))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import os
+import unittest
+import time
+
+os.environ.setdefault("KIVY_NO_ARGS", "1")
+os.environ.setdefault("KIVY_NO_CONSOLELOG", "1")
+
+from kivy.uix.boxlayout import BoxLayout
+from kivy.uix.widget import Widget
+from app.services.config_service import ConfigService
+from app.services.role_service import RoleService
+from app.views.visibility import VisibilityController
+
+
+class TestRoleService(unittest.TestCase):
+    def setUp(self):
+        config = ConfigService()
+        self.roles = RoleService(config.get_roles(), config.get_role_aliases())
+
+    def test_resolve_roles(self):
+        """Test la correspondance entre clés, noms affichés et anciens noms de rôles"""
+        self.assertEqual(self.roles.resolve("pilot"), "pilot")
+        self.assertEqual(self.roles.resolve("Technicien Maintenance"), "maintenance")
+        self.assertEqual(self.roles.resolve("Gestionnaire opérations"), "operations_manager")
+        self.assertEqual(self.roles.resolve("Observateur"), "observer")
+        self.assertEqual(self.roles.resolve("Responsable formation"), "training")
+        self.assertIsNone(self.roles.resolve("Inconnu"))
+
+    def test_visible_elements(self):
+        """Test les éléments visibles précalculés à partir des permissions"""
+        admin = self.roles.get_visible("admin")
+        self.assertIn("validate_reports", admin)
+        self.assertIn("personnel_card", admin)
+
+        pilot = self.roles.get_visible("pilot")
+        self.assertIn("create_report", pilot)
+        self.assertIn("maintenance_alerts", pilot)
+        self.assertNotIn("validate_reports", pilot)
+        self.assertNotIn("personnel_card", pilot)
+
+        training = self.roles.get_visible("training")
+        self.assertEqual(training, frozenset({"personnel_card", "weather"}))
+        self.assertFalse(self.roles.is_allowed("training", "view_reports"))
+        self.assertEqual(self.roles.get_visible(None), frozenset())
+
+        # Rôles restreints: lecture seule et gestion sans droits d'administration
+        self.assertEqual(self.roles.get_visible("observer"),
+                         frozenset({"view_reports", "operations_card", "active_flights", "weather"}))
+        manager = self.roles.get_visible("operations_manager")
+        self.assertIn("validate_reports", manager)
+        self.assertNotIn("create_report", manager)
+        self.assertLess(manager, admin)
+
+    def test_unknown_alias(self):
+        """Test le rejet d'un alias vers un rôle inexistant"""
+        with self.assertRaises(ValueError):
+            RoleService({"admin": {"permissions": ["all"]}}, {"Chef": "chef"})
+
+
+class TestVisibilityController(unittest.TestCase):
+    def setUp(self):
+        self.parent = BoxLayout()
+        self.widgets = {name: Widget() for name in ["a", "b", "c", "d"]}
+        for widget in self.widgets.values():
+            self.parent.add_widget(widget)
+        self.controller = VisibilityController()
+        for name, widget in self.widgets.items():
+            self.controller.register(name, widget)
+
+    def _shown(self):
+        by_widget = {w: n for n, w in self.widgets.items()}
+        return [by_widget[w] for w in reversed(self.parent.children)]
+
+    def test_toggle_preserves_order(self):
+        """Test que les éléments réaffichés reprennent leur position d'origine"""
+        self.controller.apply({"b", "d"})
+        self.assertEqual(self._shown(), ["b", "d"])
+        self.controller.apply({"a", "c", "d"})
+        self.assertEqual(self._shown(), ["a", "c", "d"])
+        self.controller.apply({"a", "b", "c", "d"})
+        self.assertEqual(self._shown(), ["a", "b", "c", "d"])
+
+    def test_switch_reuses_widgets(self):
+        """Test qu'un changement de rôle réutilise les mêmes widgets et reste rapide"""
+        originals = dict(self.widgets)
+        started = time.perf_counter()
+        for _ in range(100):
+            self.controller.apply({"a"})
+            self.controller.apply({"b", "c"})
+        elapsed_ms = (time.perf_counter() - started) * 1000 / 200
+        self.assertLess(elapsed_ms, 5)
+        self.assertEqual(self.controller.apply({"b", "c"}), 0)
+        self.assertTrue(all(self.widgets[n] is originals[n] for n in originals))
+
+
+if __name__ == '__main__':
+    unittest.main()
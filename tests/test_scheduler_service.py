@@ -1,6 +1,7 @@
 import unittest
 from unittest.mock import MagicMock, patch
 import time
+import threading
 from pathlib import Path
 from app.services.scheduler_service import SchedulerService
 from app.services.backup_service import BackupService
@@ -43,7 +44,51 @@ class TestSchedulerService(unittest.TestCase):
         # Vérifie que la sauvegarde a été créée
         self.backup_service.create_backup.assert_called_once()
         # Vérifie que la rotation a été effectuée
-        self.backup_service.rotate_backups.assert_called_once_with(max_backups=5)
+        self.backup_service.rotate_backups.assert_called_once_with(max_backups=5, keep=set())
+
+    def test_backup_execution_replicates(self):
+        """Test la transmission d'une sauvegarde réussie au service de réplication"""
+        self.backup_service.create_backup.return_value = "/path/to/backup"
+        replication = MagicMock()
+        replication.pending_backups.return_value = {"backup"}
+        self.scheduler.start(self.backup_service, replication)
+
+        self.scheduler._run_backup(self.backup_service)
+        replication.replicate.assert_called_once_with("/path/to/backup")
+        # Les sources encore en cours de réplication échappent à la rotation
+        self.backup_service.rotate_backups.assert_called_once_with(max_backups=5, keep={"backup"})
+
+    def test_due_date_alerts(self):
+        """Test le démarrage et l'arrêt des alertes d'échéance avec le planificateur"""
+        due_dates = MagicMock()
+        self.scheduler.start(self.backup_service, due_dates=due_dates)
+        due_dates.start.assert_called_once_with(self.scheduler._on_due_alert)
+
+        self.scheduler.stop()
+        due_dates.stop.assert_called_once()
+
+    def test_stop_cancels_running_backup(self):
+        """Test que l'arrêt interrompt une sauvegarde en cours dans un délai borné"""
+        started = threading.Event()
+        
+        def long_backup(cancel_token=None, **kwargs):
+            started.set()
+            while not cancel_token.cancelled:
+                time.sleep(0.01)
+            return None
+            
+        self.backup_service.create_backup.side_effect = long_backup
+        self.scheduler.start(self.backup_service)
+        worker = threading.Thread(target=self.scheduler._run_backup, args=(self.backup_service,))
+        worker.start()
+        self.assertTrue(started.wait(5))
+        
+        t0 = time.perf_counter()
+        self.assertTrue(self.scheduler.stop(timeout=5))
+        worker.join(5)
+        self.assertFalse(worker.is_alive())
+        self.assertLess(time.perf_counter() - t0, 2)
+        self.backup_service.rotate_backups.assert_not_called()
 
 if __name__ == '__main__':
     unittest.main()
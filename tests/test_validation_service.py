@@ -0,0 +1,99 @@
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from app.services.database_service import DatabaseService
+from app.services.validation_service import ValidationService
+
+WORKFLOWS = {
+    "flight_operation": ["pre_flight", "flight", "post_flight"],
+    "maintenance": ["inspection", "service", "validation"],
+}
+
+
+class TestValidationService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseService(self.temp_dir / "database.db")
+        self.ok_aircraft = self.db.add_aircraft("C-GOK1")
+        self.grounded = self.db.add_aircraft("C-GKO1", status="grounded")
+        self.current_pilot = self.db.add_personnel("Pilote à jour", "pilot",
+                                                   currency_expires_at="2030-01-01T00:00:00")
+        self.expired_pilot = self.db.add_personnel("Pilote expiré", "pilot",
+                                                   currency_expires_at="2023-01-01T00:00:00")
+        self.db.add_flights([
+            {"aircraft_id": self.ok_aircraft, "pilot_id": self.current_pilot, "started_at": "2024-03-01T10:00:00"},
+            {"aircraft_id": self.ok_aircraft, "pilot_id": self.expired_pilot, "started_at": "2024-03-01T11:00:00"},
+            {"aircraft_id": self.grounded, "pilot_id": self.current_pilot, "started_at": "2024-03-01T12:00:00"},
+        ])
+        self.service = ValidationService(self.db, WORKFLOWS)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def _add_report(self, title, flight_id, steps, workflow="flight_operation", status="pending"):
+        self.db.add_reports([{"title": title, "role": "pilot", "flight_id": flight_id, "workflow": workflow,
+                              "status": status, "created_at": "2024-03-02T00:00:00"}])
+        report_id = self.db.connect().execute("SELECT MAX(id) FROM reports").fetchone()[0]
+        self.db.add_report_steps({"report_id": report_id, "step": step} for step in steps)
+        return report_id
+
+    def _status(self, report_id):
+        return self.db.connect().execute("SELECT status FROM reports WHERE id = ?", (report_id,)).fetchone()[0]
+
+    def test_validate_pending(self):
+        """Test la validation en lot avec les différentes règles"""
+        all_steps = WORKFLOWS["flight_operation"]
+        valid = self._add_report("OK", 1, all_steps)
+        missing_step = self._add_report("Étape", 1, ["pre_flight", "flight"])
+        expired = self._add_report("Pilote", 2, all_steps)
+        grounded = self._add_report("Aéronef", 3, all_steps)
+        no_flight = self._add_report("Sans vol", None, all_steps)
+        maintenance = self._add_report("Maintenance", None, WORKFLOWS["maintenance"], workflow="maintenance")
+        already_done = self._add_report("Déjà validé", 1, [], status="approved")
+
+        summary = self.service.validate_pending()
+
+        self.assertEqual(summary["checked"], 6)
+        self.assertEqual(summary["approved"], 2)
+        self.assertEqual(set(summary["failed"]), {missing_step, expired, grounded, no_flight})
+        self.assertIn("post_flight", summary["failed"][missing_step][0])
+        self.assertIn("Pilote expiré", summary["failed"][expired][0])
+        self.assertIn("C-GKO1", summary["failed"][grounded][0])
+
+        self.assertEqual(self._status(valid), "approved")
+        self.assertEqual(self._status(maintenance), "approved")
+        self.assertEqual(self._status(missing_step), "pending")
+        self.assertEqual(self._status(already_done), "approved")
+
+    def test_overdue_maintenance_blocks_approval(self):
+        """Test qu'une maintenance échue avant le vol bloque l'approbation"""
+        report = self._add_report("OK", 1, WORKFLOWS["flight_operation"])
+        self.db.add_maintenance_records([{"aircraft_id": self.ok_aircraft, "kind": "inspection",
+                                          "due_at": "2024-02-01T00:00:00"}])
+        summary = self.service.validate_pending()
+        self.assertEqual(summary["approved"], 0)
+        self.assertIn(report, summary["failed"])
+
+    def test_dry_run_and_rule_selection(self):
+        """Test la vérification sans approbation et la sélection des règles"""
+        report = self._add_report("Pilote", 2, [])
+        summary = ValidationService(self.db, WORKFLOWS, rules=["pilot_currency"]).validate_pending(approve=False)
+        self.assertEqual(len(summary["failed"][report]), 1)
+        self.assertEqual(self._status(report), "pending")
+
+        with self.assertRaises(ValueError):
+            ValidationService(self.db, WORKFLOWS, rules=["inconnue"])
+
+    def test_empty_rules_use_defaults(self):
+        """Test qu'une liste de règles vide n'approuve pas un rapport non conforme"""
+        report = self._add_report("Pilote", 2, WORKFLOWS["flight_operation"])
+        summary = ValidationService(self.db, WORKFLOWS, rules=[]).validate_pending()
+        self.assertEqual(summary["approved"], 0)
+        self.assertIn(report, summary["failed"])
+        self.assertEqual(self._status(report), "pending")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+import sqlite3
+import unittest
+import shutil
+import tempfile
+from pathlib import Path
+from app.services.database_service import DatabaseService
+from app.services.workflow_service import WorkflowService, compile_workflows
+
+WORKFLOWS = {
+    "flight_operation": ["pre_flight", "flight", "post_flight"],
+    "maintenance": ["inspection", "service", "validation"],
+}
+
+
+class TestWorkflowService(unittest.TestCase):
+    def setUp(self):
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.db = DatabaseService(self.temp_dir / "database.db")
+        self.workflows = WorkflowService(self.db, WORKFLOWS)
+
+    def tearDown(self):
+        self.db.close()
+        shutil.rmtree(self.temp_dir)
+
+    def test_compile_workflows(self):
+        """Test la compilation des définitions en table de transitions"""
+        table = compile_workflows(WORKFLOWS)
+        self.assertEqual(table["flight_operation"],
+                         {"pre_flight": "flight", "flight": "post_flight", "post_flight": None})
+        with self.assertRaises(ValueError):
+            compile_workflows({"vide": []})
+        with self.assertRaises(ValueError):
+            compile_workflows({"double": ["a", "a"]})
+
+    def test_batched_transitions(self):
+        """Test l'avancement par lot jusqu'à la complétion"""
+        ids = self.workflows.start_many([("flight_operation", "flight", i) for i in range(10)])
+        self.assertEqual(self.workflows.count_by_step("flight_operation"),
+                         {"pre_flight": 10, "flight": 0, "post_flight": 0})
+
+        self.assertEqual(self.workflows.advance(ids[:4]), 4)
+        self.assertEqual(sorted(self.workflows.in_step("flight_operation", "flight")), ids[:4])
+
+        # Un double avancement est refusé lorsque l'étape attendue est précisée
+        self.assertEqual(self.workflows.advance(ids[:4], from_step="pre_flight"), 0)
+
+        self.workflows.advance(ids[:4])
+        self.workflows.advance(ids[:4])
+        self.assertEqual(self.workflows.get(ids[0])["status"], "completed")
+        self.assertEqual(self.workflows.count_by_step("flight_operation"),
+                         {"pre_flight": 6, "flight": 0, "post_flight": 0})
+        self.assertEqual(self.workflows.advance(ids[:4]), 0)
+
+        history = self.workflows.history(ids[0])
+        self.assertEqual([(h["from_step"], h["to_step"]) for h in history],
+                         [("pre_flight", "flight"), ("flight", "post_flight"), ("post_flight", None)])
+
+    def test_advance_step(self):
+        """Test l'avancement de toutes les instances d'une étape"""
+        self.workflows.start_many([("maintenance", "aircraft", 1)] * 3)
+        self.workflows.start("flight_operation")
+        self.assertEqual(self.workflows.advance_step("maintenance", "inspection"), 3)
+        self.assertEqual(len(self.workflows.in_step("maintenance", "service")), 3)
+        self.assertEqual(len(self.workflows.in_step("flight_operation", "pre_flight")), 1)
+
+    def test_step_query_uses_index(self):
+        """Test que la recherche par étape passe par l'index des instances actives"""
+        plan = " ".join(row[3] for row in self.db.connect().execute(
+            "EXPLAIN QUERY PLAN SELECT id FROM workflow_instances "
+            "WHERE workflow = ? AND current_step = ? AND status = 'active'", ("a", "b")))
+        self.assertIn("idx_workflow_active_step", plan)
+
+    def test_removed_step_with_active_instances(self):
+        """Test qu'une étape supprimée avec des instances actives est refusée ou déplacée explicitement"""
+        ids = self.workflows.start_many([("flight_operation", None, None)] * 2)
+        self.workflows.advance(ids)
+        changed = {**WORKFLOWS, "flight_operation": ["pre_flight", "post_flight"]}
+
+        with self.assertRaises(ValueError):
+            WorkflowService(self.db, changed)
+        # Modification refusée: l'ancienne table est conservée et les instances avancent normalement
+        self.assertEqual(self.workflows.advance(ids[:1]), 1)
+        self.assertEqual(self.workflows.get(ids[0])["current_step"], "post_flight")
+
+        migrated = WorkflowService(self.db, changed, step_map={"flight_operation": {"flight": "post_flight"}})
+        self.assertEqual(migrated.get(ids[1])["current_step"], "post_flight")
+        self.assertEqual(migrated.get(ids[1])["status"], "active")
+        self.assertEqual([(h["from_step"], h["to_step"]) for h in migrated.history(ids[1])],
+                         [("pre_flight", "flight"), ("flight", "post_flight")])
+
+        with self.assertRaises(ValueError):
+            WorkflowService(self.db, changed, step_map={"flight_operation": {"flight": "landing"}})
+
+        # Une instance à une étape inconnue n'est jamais complétée par un avancement
+        conn = self.db.connect()
+        with conn:
+            conn.execute("UPDATE workflow_instances SET current_step = 'landing' WHERE id = ?", (ids[1],))
+        self.assertEqual(migrated.advance(ids[1:]), 0)
+        self.assertEqual(migrated.get(ids[1])["status"], "active")
+
+    def test_removed_workflow_with_active_instances(self):
+        """Test la clôture ou le signalement des instances d'un workflow retiré de la configuration"""
+        kept = self.workflows.start("flight_operation")
+        removed = self.workflows.start_many([("maintenance", None, None)] * 2)
+        self.workflows.advance(removed[:1])
+        changed = {"flight_operation": WORKFLOWS["flight_operation"]}
+
+        with self.assertRaises(ValueError):
+            WorkflowService(self.db, changed)
+        with self.assertRaises(ValueError):
+            WorkflowService(self.db, changed, step_map={"maintenance": {"inspection": "service"}})
+
+        # Au démarrage de l'application: signalées, sans bloquer
+        lenient = WorkflowService(self.db, changed, strict=False)
+        self.assertEqual(lenient.get(removed[1])["status"], "active")
+        self.assertEqual(lenient.advance(removed), 0)
+
+        closed = WorkflowService(self.db, changed, step_map={"maintenance": {"inspection": None, "service": None}})
+        for instance_id, step in zip(removed, ("service", "inspection")):
+            self.assertEqual(closed.get(instance_id)["status"], "cancelled")
+            self.assertEqual(closed.history(instance_id)[-1]["from_step"], step)
+            self.assertIsNone(closed.history(instance_id)[-1]["to_step"])
+        self.assertEqual(closed.get(kept)["status"], "active")
+
+    def test_deleted_ids_not_reused(self):
+        """Test qu'un identifiant d'instance supprimée n'est pas réattribué"""
+        ids = self.workflows.start_many([("flight_operation", None, None)] * 3)
+        self.workflows.advance(ids)
+        conn = self.db.connect()
+        with conn:
+            conn.execute("DELETE FROM workflow_history WHERE instance_id = ?", (ids[-1],))
+            conn.execute("DELETE FROM workflow_instances WHERE id = ?", (ids[-1],))
+        new_ids = self.workflows.start_many([("maintenance", None, None)] * 2)
+        self.assertEqual(new_ids, [ids[-1] + 1, ids[-1] + 2])
+        self.assertIsNone(self.workflows.get(ids[-1]))
+        self.assertEqual(self.workflows.start("maintenance"), ids[-1] + 3)
+        self.assertEqual(self.workflows.get(new_ids[1])["workflow"], "maintenance")
+
+    def test_legacy_table_migrated(self):
+        """Test le passage en AUTOINCREMENT d'une base antérieure, historique des instances supprimées compris"""
+        path = self.temp_dir / "legacy.db"
+        conn = sqlite3.connect(str(path))
+        conn.executescript("""
+            CREATE TABLE workflow_instances (
+                id INTEGER PRIMARY KEY, workflow TEXT NOT NULL, current_step TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'active', entity_type TEXT, entity_id INTEGER,
+                started_at TEXT NOT NULL, updated_at TEXT NOT NULL);
+            CREATE TABLE workflow_history (
+                instance_id INTEGER NOT NULL REFERENCES workflow_instances(id),
+                from_step TEXT NOT NULL, to_step TEXT, changed_at TEXT NOT NULL);
+            INSERT INTO workflow_instances VALUES (1, 'maintenance', 'service', 'active', NULL, NULL, 'x', 'x');
+            INSERT INTO workflow_history VALUES (1, 'inspection', 'service', 'x');
+            INSERT INTO workflow_history VALUES (2, 'inspection', 'service', 'x');
+        """)
+        conn.close()
+
+        legacy = DatabaseService(path)
+        workflows = WorkflowService(legacy, WORKFLOWS)
+        self.assertEqual(workflows.get(1)["current_step"], "service")
+        self.assertEqual(workflows.start("flight_operation"), 3)
+        self.assertIn("idx_workflow_active_step", " ".join(
+            row[0] for row in legacy.connect().execute("SELECT name FROM sqlite_master WHERE type = 'index'")))
+        legacy.close()
+
+    def test_unknown_workflow(self):
+        """Test le rejet des workflows et étapes inconnus"""
+        with self.assertRaises(ValueError):
+            self.workflows.start("inconnu")
+        with self.assertRaises(ValueError):
+            self.workflows.in_step("flight_operation", "landing")
+
+
+if __name__ == '__main__':
+    unittest.main()